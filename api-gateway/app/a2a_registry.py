@@ -0,0 +1,198 @@
+"""In-memory A2A agent registry with background card polling.
+
+Agent cards are fetched concurrently by a background task instead of on
+every ``/a2a/discovery`` call. A card is revalidated once it is older than
+``card_ttl_seconds``, with ``If-None-Match``/``If-Modified-Since`` so an
+unchanged card costs a 304. Discovery is served from a prebuilt snapshot.
+
+Agents come from ``config/config.yaml`` → ``a2a.agents`` (static) or register
+themselves with ``POST /a2a/registry``. Self-registrations are leases: they
+expire after ``registration_ttl_seconds`` unless the agent registers again.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+from pydantic import BaseModel, Field
+
+from app.config import get_a2a_config
+from app.metrics import A2A_AGENT_HEALTH, A2A_AGENT_TRANSITIONS
+import logging
+
+logger = logging.getLogger(__name__)
+
+CARD_PATH = "/a2a/.well-known/agent-card.json"
+
+AVAILABLE = "available"
+UNAVAILABLE = "unavailable"
+
+
+class AgentRegistration(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    base_url: str = Field(..., pattern=r"^https?://")
+
+
+@dataclass
+class AgentEntry:
+    name: str
+    base_url: str
+    static: bool = True
+    card: Optional[Dict] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    status: Optional[str] = None
+    error: Optional[str] = None
+    fetched_at: float = 0.0
+    lease_expires_at: Optional[float] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    @property
+    def card_url(self) -> str:
+        return f"{self.base_url.rstrip('/')}{CARD_PATH}"
+
+
+class A2ARegistry:
+    def __init__(self, cfg: Dict):
+        self.refresh_interval = float(cfg.get("refresh_interval_seconds", 10))
+        self.card_ttl = float(cfg.get("card_ttl_seconds", 60))
+        self.fetch_timeout = float(cfg.get("fetch_timeout_seconds", 5))
+        self.registration_ttl = float(cfg.get("registration_ttl_seconds", 300))
+        self.registration_token = cfg.get("registration_token") or ""
+        self.agents: Dict[str, AgentEntry] = {
+            a["name"]: AgentEntry(name=a["name"], base_url=a["base_url"])
+            for a in cfg.get("agents") or []
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot: Dict = self._build_snapshot()
+
+    # --- ciclo de vida ---
+
+    async def start(self) -> None:
+        self._client = httpx.AsyncClient(timeout=self.fetch_timeout)
+        self._task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _poll_loop(self) -> None:
+        # A primeira rodada roda já, sem segurar o startup do gateway.
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("Erro ao atualizar registry A2A: %s", e)
+            await asyncio.sleep(self.refresh_interval)
+
+    # --- polling ---
+
+    def _expire_leases(self) -> None:
+        now = time.monotonic()
+        for name, entry in list(self.agents.items()):
+            if entry.lease_expires_at is not None and entry.lease_expires_at <= now:
+                logger.info("Registro A2A expirado: %s", name)
+                del self.agents[name]
+                A2A_AGENT_HEALTH.remove(name)
+
+    async def refresh(self, force: bool = False) -> None:
+        """Revalidate every card older than the TTL (or not available), concurrently."""
+        self._expire_leases()
+        now = time.monotonic()
+        due = [
+            entry
+            for entry in self.agents.values()
+            if force or entry.status != AVAILABLE or now - entry.fetched_at >= self.card_ttl
+        ]
+        if due:
+            await asyncio.gather(*(self._fetch(entry) for entry in due))
+        self._snapshot = self._build_snapshot()
+
+    def _set_status(self, entry: AgentEntry, status: str, error: Optional[str] = None) -> None:
+        if entry.status != status:
+            A2A_AGENT_TRANSITIONS.labels(agent=entry.name, status=status).inc()
+            if entry.status is not None:
+                logger.info("Agente A2A %s: %s -> %s", entry.name, entry.status, status)
+        entry.status = status
+        entry.error = error
+        A2A_AGENT_HEALTH.labels(agent=entry.name).set(1 if status == AVAILABLE else 0)
+
+    async def _fetch(self, entry: AgentEntry) -> None:
+        async with entry.lock:
+            headers = {}
+            if entry.card is not None:
+                if entry.etag:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    headers["If-Modified-Since"] = entry.last_modified
+            client = self._client or httpx.AsyncClient(timeout=self.fetch_timeout)
+            try:
+                resp = await client.get(entry.card_url, headers=headers)
+                if resp.status_code == 304 and entry.card is not None:
+                    entry.fetched_at = time.monotonic()
+                    self._set_status(entry, AVAILABLE)
+                elif resp.status_code == 200:
+                    entry.card = resp.json()
+                    entry.etag = resp.headers.get("etag")
+                    entry.last_modified = resp.headers.get("last-modified")
+                    entry.fetched_at = time.monotonic()
+                    self._set_status(entry, AVAILABLE)
+                else:
+                    self._set_status(entry, UNAVAILABLE, f"HTTP {resp.status_code}")
+            except Exception as e:
+                self._set_status(entry, UNAVAILABLE, str(e) or type(e).__name__)
+            finally:
+                if client is not self._client:
+                    await client.aclose()
+
+    # --- leitura ---
+
+    def _build_snapshot(self) -> Dict:
+        agents: List[Dict] = []
+        for entry in self.agents.values():
+            if entry.status == AVAILABLE and entry.card is not None:
+                agents.append(entry.card)
+            else:
+                agents.append({
+                    "name": entry.name,
+                    "status": UNAVAILABLE,
+                    "error": entry.error or "not fetched yet",
+                })
+        return {
+            "registry": "Orqestra A2A Agent Registry",
+            "protocol_version": "1.0",
+            "agents_count": len([a for a in agents if "status" not in a]),
+            "agents": agents,
+        }
+
+    def discovery(self) -> Dict:
+        return self._snapshot
+
+    # --- auto-registro ---
+
+    async def register(self, name: str, base_url: str) -> AgentEntry:
+        """Add or renew a self-registered agent and fetch its card right away."""
+        entry = self.agents.get(name)
+        if entry is None or entry.base_url != base_url:
+            static = entry.static if entry else False
+            entry = AgentEntry(name=name, base_url=base_url, static=static)
+            self.agents[name] = entry
+        if not entry.static:
+            entry.lease_expires_at = time.monotonic() + self.registration_ttl
+        await self._fetch(entry)
+        self._snapshot = self._build_snapshot()
+        return entry
+
+
+a2a_registry = A2ARegistry(get_a2a_config())
@@ -0,0 +1,227 @@
+"""Cost-weighted concurrency quotas for the AI endpoints.
+
+Analysis and enhancement calls fan out into MCP, A2A and LLM calls and cost
+far more than CRUD, so they are limited by *in-flight cost* rather than by
+requests per minute. Each route (and, for piece analysis, each channel) has
+a weight; a request holds ``weight`` units until its response finishes.
+
+Two budgets apply at once: a global one for the gateway worker and a
+per-user one, so a single user's bulk run cannot take the whole budget.
+Requests that do not fit wait in a bounded FIFO queue for at most
+``max_wait_seconds``; when the queue is full, or the wait runs out, the
+caller gets a 429 with ``Retry-After`` straight away.
+"""
+
+import asyncio
+import json
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from app.config import get_ai_quota_config
+from app.metrics import AI_QUOTA_IN_FLIGHT, AI_QUOTA_QUEUE_DEPTH, AI_QUOTA_REJECTIONS, AI_QUOTA_WAIT
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RouteCost:
+    path: str
+    weight: int
+    channel_weights: Dict[str, int]
+
+    def weight_for(self, body: Optional[bytes]) -> int:
+        """Route weight, refined by the ``channel`` field of a JSON body."""
+        if not self.channel_weights or not body:
+            return self.weight
+        try:
+            channel = json.loads(body).get("channel")
+        except (ValueError, AttributeError):
+            return self.weight
+        return self.channel_weights.get(str(channel).upper(), self.weight)
+
+
+class _Waiter:
+    __slots__ = ("user", "weight", "future")
+
+    def __init__(self, user: str, weight: int, future: asyncio.Future):
+        self.user = user
+        self.weight = weight
+        self.future = future
+
+
+class QuotaLease:
+    """Units held by one request. ``release`` is idempotent."""
+
+    def __init__(self, quota: "WeightedQuota", user: str, weight: int, route: str):
+        self._quota = quota
+        self.user = user
+        self.weight = weight
+        self.route = route
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._quota._release(self.user, self.weight)
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(reason)
+
+
+class WeightedQuota:
+    """Global + per-user weighted semaphore with a bounded FIFO wait queue.
+
+    Waiters are served in arrival order. A waiter blocked only by its own
+    per-user budget is skipped, so other users are not held behind it; a
+    waiter blocked by the global budget stops the scan, so heavy requests
+    are not starved by a stream of light ones.
+    """
+
+    def __init__(
+        self,
+        global_capacity: int,
+        per_user_capacity: int,
+        max_queue: int,
+        per_user_max_queue: int,
+        max_wait: float,
+    ):
+        self.global_capacity = global_capacity
+        self.per_user_capacity = per_user_capacity
+        self.max_queue = max_queue
+        self.per_user_max_queue = per_user_max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.user_in_flight: Dict[str, int] = defaultdict(int)
+        self.user_queued: Dict[str, int] = defaultdict(int)
+        self._waiters: Deque[_Waiter] = deque()
+
+    def _clamp(self, weight: int) -> int:
+        # Um peso maior que o orçamento nunca caberia.
+        return max(1, min(weight, self.per_user_capacity, self.global_capacity))
+
+    def _grant(self, user: str, weight: int) -> None:
+        self.in_flight += weight
+        self.user_in_flight[user] += weight
+        AI_QUOTA_IN_FLIGHT.set(self.in_flight)
+
+    def _release(self, user: str, weight: int) -> None:
+        self.in_flight -= weight
+        self.user_in_flight[user] -= weight
+        if self.user_in_flight[user] <= 0:
+            del self.user_in_flight[user]
+        AI_QUOTA_IN_FLIGHT.set(self.in_flight)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        for waiter in list(self._waiters):
+            if waiter.future.done():
+                continue
+            if self.in_flight + waiter.weight > self.global_capacity:
+                break
+            if self.user_in_flight[waiter.user] + waiter.weight > self.per_user_capacity:
+                continue
+            self._dequeue(waiter)
+            self._grant(waiter.user, waiter.weight)
+            waiter.future.set_result(True)
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            return
+        self.user_queued[waiter.user] -= 1
+        if self.user_queued[waiter.user] <= 0:
+            del self.user_queued[waiter.user]
+        AI_QUOTA_QUEUE_DEPTH.set(len(self._waiters))
+
+    async def acquire(self, user: str, weight: int, route: str = "") -> QuotaLease:
+        weight = self._clamp(weight)
+        if len(self._waiters) >= self.max_queue:
+            raise QuotaExceeded("queue_full")
+        if self.user_queued[user] >= self.per_user_max_queue:
+            raise QuotaExceeded("user_queue_full")
+
+        waiter = _Waiter(user, weight, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self.user_queued[user] += 1
+        AI_QUOTA_QUEUE_DEPTH.set(len(self._waiters))
+        self._dispatch()
+
+        if not waiter.future.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait)
+            except BaseException as e:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    # Concedido no mesmo instante do timeout/cancelamento.
+                    self._release(user, weight)
+                else:
+                    waiter.future.cancel()
+                    self._dequeue(waiter)
+                if isinstance(e, asyncio.TimeoutError):
+                    raise QuotaExceeded("timeout") from None
+                raise
+        return QuotaLease(self, user, weight, route)
+
+
+class AIQuota:
+    """Resolves route weights and turns quota rejections into 429s."""
+
+    def __init__(self, cfg: Dict):
+        self.enabled = bool(cfg.get("enabled", True))
+        self.retry_after = int(cfg.get("retry_after_seconds", 5))
+        self.routes: List[RouteCost] = sorted(
+            (
+                RouteCost(
+                    path=r["path"],
+                    weight=int(r.get("weight", 1)),
+                    channel_weights={
+                        str(k).upper(): int(v) for k, v in (r.get("channel_weights") or {}).items()
+                    },
+                )
+                for r in cfg.get("routes") or []
+            ),
+            key=lambda r: len(r.path),
+            reverse=True,
+        )
+        self.quota = WeightedQuota(
+            global_capacity=int(cfg.get("global_capacity", 40)),
+            per_user_capacity=int(cfg.get("per_user_capacity", 8)),
+            max_queue=int(cfg.get("max_queue", 100)),
+            per_user_max_queue=int(cfg.get("per_user_max_queue", 10)),
+            max_wait=float(cfg.get("max_wait_seconds", 10)),
+        )
+
+    def route_for(self, path: str, method: str) -> Optional[RouteCost]:
+        if not self.enabled or method != "POST":
+            return None
+        for route in self.routes:
+            if path == route.path:
+                return route
+        return None
+
+    async def acquire(self, route: RouteCost, user: str, body: Optional[bytes]) -> QuotaLease:
+        weight = route.weight_for(body)
+        start = time.perf_counter()
+        try:
+            lease = await self.quota.acquire(user, weight, route.path)
+        except QuotaExceeded as e:
+            AI_QUOTA_REJECTIONS.labels(route=route.path, reason=e.reason).inc()
+            logger.warning("AI quota saturada route=%s user=%s reason=%s", route.path, user, e.reason)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="AI capacity saturated, retry later",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        AI_QUOTA_WAIT.labels(route=route.path).observe(time.perf_counter() - start)
+        return lease
+
+
+ai_quota = AIQuota(get_ai_quota_config())
@@ -1,12 +1,26 @@
 from typing import Optional, Dict
 from fastapi import Request, HTTPException, status
 from jose import JWTError, jwt
-from app.config import SECRET_KEY, ALGORITHM, AUTH_SERVICE_URL
+from app.config import SECRET_KEY, ALGORITHM, AUTH_SERVICE_URL, JWKS_URL, JWKS_REFRESH_SECONDS
+from app.http_clients import get_client
+from app.jwks import JWKSVerifier
+from app.user_cache import user_cache
 import httpx
 import logging
 
 logger = logging.getLogger(__name__)
 
+# None em HS256 (segredo compartilhado); em RS256 valida com o JWKS em cache.
+jwks_verifier = (
+    None if ALGORITHM.startswith("HS")
+    else JWKSVerifier(
+        JWKS_URL,
+        algorithms=[ALGORITHM],
+        refresh_seconds=JWKS_REFRESH_SECONDS,
+        get_client=lambda: get_client("auth"),
+    )
+)
+
 
 def get_token_from_request(request: Request) -> Optional[str]:
     """Extract JWT token from cookie or Authorization header."""
@@ -24,7 +38,10 @@ def get_token_from_request(request: Request) -> Optional[str]:
 def decode_jwt_token(token: str) -> Optional[Dict]:
     """Decode and validate JWT token."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if jwks_verifier is not None:
+            payload = jwks_verifier.decode(token)
+        else:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         if payload.get("type") != "access":
             return None
         return payload
@@ -37,43 +54,81 @@ def decode_jwt_token(token: str) -> Optional[Dict]:
         return None
 
 
+def get_verified_payload(request: Request) -> Optional[Dict]:
+    """Decoded access-token claims for this request, decoded at most once.
+
+    Shared by the rate limiter (per-user keys) and authentication.
+    """
+    if hasattr(request.state, "jwt_payload"):
+        return request.state.jwt_payload
+    token = get_token_from_request(request)
+    payload = decode_jwt_token(token) if token else None
+    request.state.jwt_payload = payload
+    return payload
+
+
+async def _fetch_user(token: str) -> tuple[Optional[Dict], bool]:
+    """Call auth-service /me. Returns (user, definitive).
+
+    ``definitive`` is False for transport errors and 5xx, which must not be
+    negatively cached.
+    """
+    client = get_client("auth")
+    try:
+        response = await client.get(
+            f"{AUTH_SERVICE_URL}/api/auth/me",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        if response.status_code == 200:
+            return response.json(), True
+        return None, response.status_code < 500
+    except httpx.TimeoutException:
+        logger.error("Timeout calling auth-service")
+        return None, False
+    except httpx.ConnectError:
+        logger.error("Could not connect to auth-service")
+        return None, False
+    except Exception as e:
+        logger.error(f"Error calling auth-service: {type(e).__name__}: {e}")
+        return None, False
+
+
 async def get_user_from_auth_service(token: str) -> Optional[Dict]:
     """Fetch user information from auth-service."""
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        try:
-            response = await client.get(
-                f"{AUTH_SERVICE_URL}/api/auth/me",
-                headers={"Authorization": f"Bearer {token}"}
-            )
-            if response.status_code == 200:
-                return response.json()
-            return None
-        except httpx.TimeoutException:
-            logger.error("Timeout calling auth-service")
-            return None
-        except httpx.ConnectError:
-            logger.error("Could not connect to auth-service")
-            return None
-        except Exception as e:
-            logger.error(f"Error calling auth-service: {type(e).__name__}: {e}")
-            return None
+    user, _ = await _fetch_user(token)
+    return user
 
 
 async def validate_and_extract_user(request: Request) -> Optional[Dict]:
-    """Validate JWT and extract user context from auth-service."""
+    """Validate JWT locally and resolve the user context (cached by sub + exp)."""
     token = get_token_from_request(request)
     if not token:
         return None
+
+    if user_cache.is_negative(token):
+        return None
     
-    payload = decode_jwt_token(token)
+    payload = get_verified_payload(request)
     if not payload:
+        user_cache.set_negative(token)
         return None
     
     email = payload.get("sub")
     if not email:
+        user_cache.set_negative(token)
         return None
-    
-    user = await get_user_from_auth_service(token)
+    exp = payload.get("exp")
+
+    async def load() -> Optional[Dict]:
+        user, definitive = await _fetch_user(token)
+        if user and user.get("is_active", False):
+            await user_cache.set(email, exp, user)
+            return user
+        if definitive:
+            user_cache.set_negative(token)
+        return None
+
+    user = await user_cache.get_or_load(email, exp, load)
     if not user:
         return None
     
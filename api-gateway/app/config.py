@@ -28,19 +28,132 @@ SERVICE_NAME = os.getenv("SERVICE_NAME") or _get("service", {}).get("name", "api
 SERVICE_VERSION = os.getenv("SERVICE_VERSION") or _get("service", {}).get("version", "1.0.0")
 ENVIRONMENT = os.getenv("ENVIRONMENT") or _get("service", {}).get("environment", "development")
 
+ALGORITHM = os.getenv("ALGORITHM") or _get("auth", {}).get("algorithm", "HS256")
 SECRET_KEY = os.getenv("SECRET_KEY") or _get("auth", {}).get("secret_key")
-if not SECRET_KEY:
+if not SECRET_KEY and ALGORITHM.startswith("HS"):
     raise RuntimeError(
         "SECRET_KEY não definido. Defina via variável de ambiente SECRET_KEY "
         "ou em config/config.yaml → auth.secret_key"
     )
-ALGORITHM = os.getenv("ALGORITHM") or _get("auth", {}).get("algorithm", "HS256")
 
 AUTH_SERVICE_URL = _service_url("auth")
+
+# RS256: chaves públicas do auth-service, verificadas localmente
+JWKS_URL = os.getenv("JWKS_URL") or _get("auth", {}).get("jwks_url") or f"{AUTH_SERVICE_URL}/.well-known/jwks.json"
+JWKS_REFRESH_SECONDS = float(_get("auth", {}).get("jwks_refresh_seconds", 300))
 CAMPAIGNS_SERVICE_URL = _service_url("campaigns")
 BRIEFING_ENHANCER_SERVICE_URL = _service_url("briefing-enhancer")
 CONTENT_VALIDATION_SERVICE_URL = _service_url("content-validation")
 
+UPSTREAM_SERVICES = ["auth", "campaigns", "briefing-enhancer", "content-validation"]
+
+_HTTP_CLIENT_DEFAULTS = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+    "http2": False,
+    "connect_timeout": 5.0,
+    "pool_timeout": 10.0,
+    "timeout": 120.0,
+    "stream_timeout": 180.0,
+}
+
+def get_http_client_config(name: str) -> dict:
+    """Pool/timeout settings for one upstream: defaults < http_client < services.<name>."""
+    cfg = dict(_HTTP_CLIENT_DEFAULTS)
+    cfg.update(_get("http_client", {}) or {})
+    service_cfg = _get("services", {}).get(name, {}) or {}
+    cfg.update({k: v for k, v in service_cfg.items() if k in _HTTP_CLIENT_DEFAULTS})
+    return cfg
+
+REDIS_URL = os.getenv("REDIS_URL") or _get("redis", {}).get("url", "")
+
+def get_user_cache_config() -> dict:
+    cfg = {
+        "enabled": True,
+        "ttl_seconds": 60,
+        "max_entries": 10000,
+        "negative_ttl_seconds": 30,
+        "redis_url": REDIS_URL,
+    }
+    cfg.update(_get("user_cache", {}) or {})
+    return cfg
+
+def get_response_cache_config() -> dict:
+    cfg = {
+        "enabled": False,
+        "max_entries": 5000,
+        "routes": [],
+        "redis_url": REDIS_URL,
+    }
+    cfg.update(_get("response_cache", {}) or {})
+    return cfg
+
+def get_views_config() -> dict:
+    cfg = {"section_timeout_seconds": 10}
+    cfg.update(_get("views", {}) or {})
+    return cfg
+
+def get_streaming_config() -> dict:
+    cfg = {
+        "enabled": True,
+        "max_body_bytes": 20 * 1024 * 1024,
+        "paths": [],
+    }
+    cfg.update(_get("streaming", {}) or {})
+    return cfg
+
+_RESILIENCE_DEFAULTS = {
+    "enabled": True,
+    "window_seconds": 30,
+    "min_requests": 20,
+    "failure_rate_threshold": 0.5,
+    "open_seconds": 15,
+    "half_open_max_calls": 3,
+    "slow_call_seconds": 10,
+    "initial_limit": 50,
+    "min_limit": 5,
+    "max_limit": 200,
+    "backoff_ratio": 0.9,
+}
+
+def get_resilience_config(name: str) -> dict:
+    """Breaker/limit settings for one upstream: defaults < resilience < services.<name>.resilience."""
+    cfg = dict(_RESILIENCE_DEFAULTS)
+    cfg.update(_get("resilience", {}) or {})
+    cfg.update((_get("services", {}).get(name, {}) or {}).get("resilience", {}) or {})
+    return cfg
+
+def get_ai_quota_config() -> dict:
+    cfg = {
+        "enabled": True,
+        "global_capacity": 40,
+        "per_user_capacity": 8,
+        "max_queue": 100,
+        "per_user_max_queue": 10,
+        "max_wait_seconds": 10,
+        "retry_after_seconds": 5,
+        "routes": [],
+    }
+    cfg.update(_get("ai_quota", {}) or {})
+    return cfg
+
+def get_a2a_config() -> dict:
+    cfg = {
+        "refresh_interval_seconds": 10,
+        "card_ttl_seconds": 60,
+        "fetch_timeout_seconds": 5,
+        "registration_ttl_seconds": 300,
+        "registration_token": "",
+        "agents": [
+            {"name": "content-validation", "base_url": CONTENT_VALIDATION_SERVICE_URL},
+            {"name": "legal", "base_url": os.getenv("LEGAL_SERVICE_URL", "http://legal-service:8005")},
+        ],
+    }
+    cfg.update(_get("a2a", {}) or {})
+    cfg["registration_token"] = os.getenv("A2A_REGISTRATION_TOKEN") or cfg["registration_token"]
+    return cfg
+
 def get_cors_origins() -> List[str]:
     cors_env = os.getenv("CORS_ORIGINS")
     if cors_env:
@@ -1,16 +1,49 @@
+import base64
+import fnmatch
+import re
 import time
 
 import httpx
 from fastapi import Request, HTTPException, status
 from fastapi.responses import StreamingResponse
-from typing import Optional
-from app.config import AUTH_SERVICE_URL, CAMPAIGNS_SERVICE_URL, BRIEFING_ENHANCER_SERVICE_URL, CONTENT_VALIDATION_SERVICE_URL
+from starlette.background import BackgroundTask
+from typing import AsyncIterator, Callable, Optional
+from app.config import AUTH_SERVICE_URL, CAMPAIGNS_SERVICE_URL, BRIEFING_ENHANCER_SERVICE_URL, CONTENT_VALIDATION_SERVICE_URL, get_streaming_config
 from app.auth import validate_and_extract_user, should_skip_auth
 from app.metrics import PROXY_REQUESTS, PROXY_DURATION, UPSTREAM_ERRORS
+from app.http_clients import get_client, get_stream_timeout
+from app.resilience import get_guard
 import logging
 
 logger = logging.getLogger(__name__)
 
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade",
+}
+
+
+def _to_ascii_safe(value: str) -> str:
+    """Encode non-ASCII header values as base64."""
+    if not value:
+        return ""
+    try:
+        value.encode("ascii")
+        return value
+    except UnicodeEncodeError:
+        encoded = base64.b64encode(value.encode("utf-8")).decode("ascii")
+        return f"base64:{encoded}"
+
+
+def _user_context_headers(user_context: dict) -> dict[str, str]:
+    """X-User-* headers consumed by downstream services."""
+    return {
+        "X-User-Id": _to_ascii_safe(str(user_context.get("id", ""))),
+        "X-User-Email": _to_ascii_safe(str(user_context.get("email", ""))),
+        "X-User-Role": _to_ascii_safe(str(user_context.get("role", ""))),
+        "X-User-Is-Active": str(user_context.get("is_active", False)),
+    }
+
 
 async def proxy_request(
     request: Request,
@@ -29,28 +62,7 @@ async def proxy_request(
         proxy_headers.update(headers)
     
     if user_context:
-        import base64
-        
-        def to_ascii_safe(value: str) -> str:
-            """Encode non-ASCII header values as base64."""
-            if not value:
-                return ""
-            try:
-                value.encode('ascii')
-                return value
-            except UnicodeEncodeError:
-                encoded = base64.b64encode(value.encode('utf-8')).decode('ascii')
-                return f"base64:{encoded}"
-        
-        user_id = user_context.get("id", "")
-        user_email = user_context.get("email", "")
-        user_role = user_context.get("role", "")
-        user_is_active = str(user_context.get("is_active", False))
-        
-        proxy_headers["X-User-Id"] = to_ascii_safe(str(user_id))
-        proxy_headers["X-User-Email"] = to_ascii_safe(str(user_email))
-        proxy_headers["X-User-Role"] = to_ascii_safe(str(user_role))
-        proxy_headers["X-User-Is-Active"] = user_is_active
+        proxy_headers.update(_user_context_headers(user_context))
     
     auth_header = request.headers.get("authorization")
     if auth_header:
@@ -67,52 +79,54 @@ async def proxy_request(
     target_service = _resolve_target_name(service_url)
     start = time.perf_counter()
 
+    if method not in ("GET", "POST", "PUT", "PATCH", "DELETE"):
+        raise HTTPException(status_code=status.HTTP_405_METHOD_NOT_ALLOWED, detail="Method not allowed")
+
+    permit = get_guard(target_service).acquire()
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            if method == "GET":
-                response = await client.get(url, headers=proxy_headers, params=request.query_params)
-            elif method == "POST":
-                response = await client.post(url, headers=proxy_headers, content=body, params=request.query_params)
-            elif method == "PUT":
-                response = await client.put(url, headers=proxy_headers, content=body, params=request.query_params)
-            elif method == "PATCH":
-                response = await client.patch(url, headers=proxy_headers, content=body, params=request.query_params)
-            elif method == "DELETE":
-                response = await client.delete(url, headers=proxy_headers, params=request.query_params)
-            else:
-                raise HTTPException(status_code=status.HTTP_405_METHOD_NOT_ALLOWED, detail="Method not allowed")
-            
-            elapsed = time.perf_counter() - start
-            PROXY_DURATION.labels(target_service=target_service, method=method).observe(elapsed)
-            PROXY_REQUESTS.labels(target_service=target_service, method=method, status_code=str(response.status_code)).inc()
-
-            response_body = response.content
-            response_headers = dict(response.headers)
-            hop_by_hop = ["connection", "keep-alive", "transfer-encoding", "upgrade"]
-            for header in hop_by_hop:
-                response_headers.pop(header, None)
-            
-            set_cookie_headers_raw = response.headers.get_list("set-cookie")
-            if not set_cookie_headers_raw:
-                set_cookie_headers = [
-                    value for name, value in response.headers.items()
-                    if name.lower() == "set-cookie"
-                ]
-            else:
-                set_cookie_headers = set_cookie_headers_raw
-            
-            if set_cookie_headers:
-                response_headers["_set_cookie"] = set_cookie_headers
-            
-            return response_body, response.status_code, response_headers
-            
+        client = get_client(target_service)
+        response = await client.request(
+            method,
+            url,
+            headers=proxy_headers,
+            content=body if method in ("POST", "PUT", "PATCH") else None,
+            params=request.query_params,
+        )
+        permit.record(response.status_code < 500)
+
+        elapsed = time.perf_counter() - start
+        PROXY_DURATION.labels(target_service=target_service, method=method).observe(elapsed)
+        PROXY_REQUESTS.labels(target_service=target_service, method=method, status_code=str(response.status_code)).inc()
+
+        response_body = response.content
+        response_headers = dict(response.headers)
+        hop_by_hop = ["connection", "keep-alive", "transfer-encoding", "upgrade"]
+        for header in hop_by_hop:
+            response_headers.pop(header, None)
+        
+        set_cookie_headers_raw = response.headers.get_list("set-cookie")
+        if not set_cookie_headers_raw:
+            set_cookie_headers = [
+                value for name, value in response.headers.items()
+                if name.lower() == "set-cookie"
+            ]
+        else:
+            set_cookie_headers = set_cookie_headers_raw
+        
+        if set_cookie_headers:
+            response_headers["_set_cookie"] = set_cookie_headers
+        
+        return response_body, response.status_code, response_headers
+        
     except httpx.TimeoutException:
+        permit.record(False)
         UPSTREAM_ERRORS.labels(target_service=target_service, error_type="timeout").inc()
         raise HTTPException(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             detail="Service timeout"
         )
     except httpx.ConnectError:
+        permit.record(False)
         UPSTREAM_ERRORS.labels(target_service=target_service, error_type="connection").inc()
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -121,11 +135,14 @@ async def proxy_request(
     except HTTPException:
         raise
     except Exception as e:
+        permit.record(False)
         UPSTREAM_ERRORS.labels(target_service=target_service, error_type="other").inc()
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Gateway error: {str(e)}"
         )
+    finally:
+        permit.release()
 
 
 async def proxy_request_stream(
@@ -134,28 +151,18 @@ async def proxy_request_stream(
     path: str,
     body: Optional[bytes] = None,
     user_context: Optional[dict] = None,
+    on_close: Optional[Callable[[], None]] = None,
 ) -> StreamingResponse:
-    """Proxy SSE streaming request to downstream service."""
+    """Proxy SSE streaming request to downstream service.
+
+    ``on_close`` runs once the response is finished or the client is gone,
+    together with the release of the upstream permit.
+    """
     url = f"{service_url}{path}"
 
     proxy_headers: dict[str, str] = {}
     if user_context:
-        import base64
-
-        def to_ascii_safe(value: str) -> str:
-            if not value:
-                return ""
-            try:
-                value.encode("ascii")
-                return value
-            except UnicodeEncodeError:
-                encoded = base64.b64encode(value.encode("utf-8")).decode("ascii")
-                return f"base64:{encoded}"
-
-        proxy_headers["X-User-Id"] = to_ascii_safe(str(user_context.get("id", "")))
-        proxy_headers["X-User-Email"] = to_ascii_safe(str(user_context.get("email", "")))
-        proxy_headers["X-User-Role"] = to_ascii_safe(str(user_context.get("role", "")))
-        proxy_headers["X-User-Is-Active"] = str(user_context.get("is_active", False))
+        proxy_headers.update(_user_context_headers(user_context))
 
     auth_header = request.headers.get("authorization")
     if auth_header:
@@ -163,35 +170,176 @@ async def proxy_request_stream(
     proxy_headers["content-type"] = "application/json"
 
     target_service = _resolve_target_name(service_url)
+    permit = get_guard(target_service).acquire()
 
     async def stream_generator():
         try:
-            async with httpx.AsyncClient(timeout=180.0) as client:
-                async with client.stream(
-                    "POST", url, headers=proxy_headers, content=body
-                ) as response:
-                    PROXY_REQUESTS.labels(
-                        target_service=target_service,
-                        method="POST",
-                        status_code=str(response.status_code),
-                    ).inc()
-                    async for chunk in response.aiter_bytes():
-                        yield chunk
+            client = get_client(target_service)
+            async with client.stream(
+                "POST",
+                url,
+                headers=proxy_headers,
+                content=body,
+                timeout=get_stream_timeout(target_service),
+            ) as response:
+                permit.record(response.status_code < 500)
+                PROXY_REQUESTS.labels(
+                    target_service=target_service,
+                    method="POST",
+                    status_code=str(response.status_code),
+                ).inc()
+                async for chunk in response.aiter_bytes():
+                    yield chunk
         except httpx.TimeoutException:
+            permit.record(False)
             UPSTREAM_ERRORS.labels(target_service=target_service, error_type="timeout").inc()
             yield b"event: error\ndata: {\"error\": \"Service timeout\"}\n\n"
         except httpx.ConnectError:
+            permit.record(False)
             UPSTREAM_ERRORS.labels(target_service=target_service, error_type="connection").inc()
             yield b"event: error\ndata: {\"error\": \"Service unavailable\"}\n\n"
         except Exception as e:
+            permit.record(False)
             UPSTREAM_ERRORS.labels(target_service=target_service, error_type="other").inc()
             yield f"event: error\ndata: {{\"error\": \"{e}\"}}\n\n".encode()
+        finally:
+            permit.release()
+
+    def close() -> None:
+        permit.release()
+        if on_close:
+            on_close()
 
     return StreamingResponse(
         stream_generator(),
         media_type="text/event-stream",
         headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # libera a vaga mesmo se o cliente desconectar antes do primeiro chunk
+        background=BackgroundTask(close),
+    )
+
+
+_streaming_config = get_streaming_config()
+MAX_BODY_BYTES = int(_streaming_config["max_body_bytes"])
+_STREAMING_PATTERNS = [fnmatch.translate(p) for p in _streaming_config["paths"]]
+_STREAMING_RE = re.compile("|".join(_STREAMING_PATTERNS)) if _STREAMING_PATTERNS else None
+
+
+class BodyTooLarge(Exception):
+    """Raised while streaming a request body that exceeds MAX_BODY_BYTES."""
+
+
+def is_streaming_path(path: str) -> bool:
+    """True if request/response bodies for ``path`` should be streamed end-to-end."""
+    if not _streaming_config["enabled"] or _STREAMING_RE is None:
+        return False
+    return _STREAMING_RE.match(path) is not None
+
+
+def check_declared_body_size(request: Request) -> None:
+    """Reject early (413) when Content-Length already exceeds the limit."""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_BODY_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body exceeds {MAX_BODY_BYTES} bytes",
+        )
+
+
+async def _limited_body(request: Request) -> AsyncIterator[bytes]:
+    """Yield the client body chunk by chunk, enforcing MAX_BODY_BYTES."""
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_BODY_BYTES:
+            raise BodyTooLarge()
+        if chunk:
+            yield chunk
+
+
+async def _close_upstream(response: httpx.Response, permit) -> None:
+    try:
+        await response.aclose()
+    finally:
+        permit.release()
+
+
+async def proxy_request_streaming(
+    request: Request,
+    service_url: str,
+    path: str,
+    user_context: Optional[dict] = None,
+) -> StreamingResponse:
+    """Proxy a request without buffering either body.
+
+    The client body is piped to the upstream as it arrives and the upstream
+    response is relayed with ``aiter_raw`` (still content-encoded), so the
+    gateway holds at most one chunk per direction in memory.
+    """
+    check_declared_body_size(request)
+
+    url = f"{service_url}{path}"
+    method = request.method
+    target_service = _resolve_target_name(service_url)
+
+    proxy_headers: dict[str, str] = {}
+    for name in ("authorization", "content-type", "content-length", "cookie", "accept", "accept-encoding", "if-none-match", "last-event-id"):
+        value = request.headers.get(name)
+        if value:
+            proxy_headers[name] = value
+    if user_context:
+        proxy_headers.update(_user_context_headers(user_context))
+
+    content = _limited_body(request) if method in ("POST", "PUT", "PATCH") else None
+
+    client = get_client(target_service)
+    upstream_request = client.build_request(
+        method, url, headers=proxy_headers, params=request.query_params, content=content
+    )
+    permit = get_guard(target_service).acquire()
+    start = time.perf_counter()
+    try:
+        response = await client.send(upstream_request, stream=True)
+    except BodyTooLarge:
+        permit.release()
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body exceeds {MAX_BODY_BYTES} bytes",
+        )
+    except BaseException as e:
+        permit.record(False)
+        permit.release()
+        if isinstance(e, httpx.TimeoutException):
+            UPSTREAM_ERRORS.labels(target_service=target_service, error_type="timeout").inc()
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Service timeout")
+        if isinstance(e, httpx.ConnectError):
+            UPSTREAM_ERRORS.labels(target_service=target_service, error_type="connection").inc()
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Service unavailable")
+        if isinstance(e, Exception):
+            UPSTREAM_ERRORS.labels(target_service=target_service, error_type="other").inc()
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Gateway error: {str(e)}")
+        raise
+    permit.record(response.status_code < 500)
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        # assinatura SSE é longa e quase ociosa: não ocupa vaga do limite adaptativo
+        permit.release()
+
+    PROXY_DURATION.labels(target_service=target_service, method=method).observe(time.perf_counter() - start)
+    PROXY_REQUESTS.labels(target_service=target_service, method=method, status_code=str(response.status_code)).inc()
+
+    streaming_response = StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        background=BackgroundTask(_close_upstream, response, permit),
     )
+    # raw headers keep repeated fields (set-cookie) and the upstream
+    # content-length/content-encoding, which match the raw byte stream
+    streaming_response.raw_headers = [
+        (name, value)
+        for name, value in response.headers.raw
+        if name.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS
+    ]
+    return streaming_response
 
 
 _SERVICE_URL_NAMES = {
@@ -0,0 +1,164 @@
+"""Long-lived, pooled HTTP clients for the gateway's upstream services.
+
+One ``httpx.AsyncClient`` per upstream is created in the app lifespan and
+reused by every proxied request, so connections are kept alive between
+requests instead of paying a TCP handshake per call.
+"""
+
+import inspect
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import UPSTREAM_SERVICES, get_http_client_config
+from app.metrics import UPSTREAM_POOL_IN_USE, UPSTREAM_POOL_SATURATION, UPSTREAM_POOL_WAIT
+import logging
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response stream that releases the in-use slot when it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """Transport that exports pool occupancy and connection wait time.
+
+    Wait time is measured from the moment the request enters the pool until
+    httpcore emits its first trace event, which happens right after a
+    connection has been acquired (reused or about to connect).
+    """
+
+    def __init__(self, target_service: str, max_connections: int, **kwargs):
+        super().__init__(**kwargs)
+        self.target_service = target_service
+        self.max_connections = max_connections
+        self.in_use = 0
+
+    def _set_in_use(self, delta: int) -> None:
+        self.in_use += delta
+        UPSTREAM_POOL_IN_USE.labels(target_service=self.target_service).set(self.in_use)
+        if self.max_connections:
+            UPSTREAM_POOL_SATURATION.labels(target_service=self.target_service).set(
+                self.in_use / self.max_connections
+            )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        acquired = False
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict) -> None:
+            nonlocal acquired
+            if not acquired:
+                acquired = True
+                UPSTREAM_POOL_WAIT.labels(target_service=self.target_service).observe(
+                    time.perf_counter() - start
+                )
+            if parent_trace is not None:
+                ret = parent_trace(event_name, info)
+                if inspect.isawaitable(ret):
+                    await ret
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        self._set_in_use(1)
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._set_in_use(-1)
+
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TrackedStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+
+def build_client(name: str) -> httpx.AsyncClient:
+    """Build the pooled client for one upstream from ``config/config.yaml``."""
+    cfg = get_http_client_config(name)
+    limits = httpx.Limits(
+        max_connections=int(cfg["max_connections"]),
+        max_keepalive_connections=int(cfg["max_keepalive_connections"]),
+        keepalive_expiry=float(cfg["keepalive_expiry"]),
+    )
+    timeout = httpx.Timeout(
+        float(cfg["timeout"]),
+        connect=float(cfg["connect_timeout"]),
+        pool=float(cfg["pool_timeout"]),
+    )
+    transport = InstrumentedTransport(
+        target_service=name,
+        max_connections=limits.max_connections,
+        limits=limits,
+        http2=bool(cfg["http2"]),
+    )
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+def get_stream_timeout(name: str) -> httpx.Timeout:
+    """Timeout used for long-lived streaming calls to an upstream."""
+    cfg = get_http_client_config(name)
+    return httpx.Timeout(
+        float(cfg["stream_timeout"]),
+        connect=float(cfg["connect_timeout"]),
+        pool=float(cfg["pool_timeout"]),
+    )
+
+
+async def init_clients() -> None:
+    """Create one pooled client per upstream. Called from the app lifespan."""
+    for name in UPSTREAM_SERVICES:
+        if name not in _clients:
+            _clients[name] = build_client(name)
+    logger.info("Upstream HTTP pools ready: %s", ", ".join(_clients))
+
+
+async def close_clients() -> None:
+    """Close every pooled client, draining keep-alive connections."""
+    for name, client in list(_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning("Error closing HTTP client for %s: %s", name, e)
+    _clients.clear()
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """Return the pooled client for ``name``, creating it lazily if needed.
+
+    Lazy creation keeps scripts and tests that do not run the lifespan working.
+    """
+    client: Optional[httpx.AsyncClient] = _clients.get(name)
+    if client is None or client.is_closed:
+        client = build_client(name)
+        _clients[name] = client
+    return client
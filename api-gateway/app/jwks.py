@@ -0,0 +1,112 @@
+"""Offline verification of RS256 access tokens against auth-service's JWKS.
+
+The key set is fetched from ``auth.jwks_url`` at startup and refreshed in
+the background every ``auth.jwks_refresh_seconds`` (conditional GET with the
+last ``ETag``). Verification itself never leaves the process: the token's
+``kid`` selects a cached key. An unknown ``kid`` (a key rotated in after the
+last refresh) schedules an early refresh, rate-limited so a flood of forged
+tokens cannot hammer auth-service.
+
+Self-contained on purpose (httpx + python-jose only) so other services can
+reuse it as is. Pass ``get_client`` to fetch through a pooled, long-lived
+client; without it each refresh opens a short-lived one.
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, Optional
+
+import httpx
+from jose import JWTError, jwt
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Intervalo mínimo entre dois refreshes disparados por kid desconhecido.
+_MIN_FORCED_REFRESH_SECONDS = 30
+
+
+class JWKSVerifier:
+    def __init__(
+        self,
+        jwks_url: str,
+        algorithms: list,
+        refresh_seconds: float = 300,
+        timeout: float = 5,
+        get_client: Optional[Callable[[], httpx.AsyncClient]] = None,
+    ):
+        self.jwks_url = jwks_url
+        self.algorithms = algorithms
+        self.refresh_seconds = refresh_seconds
+        self.timeout = timeout
+        self._get_client = get_client
+        self.keys: Dict[str, Dict] = {}
+        self._etag: Optional[str] = None
+        self._last_forced = float("-inf")
+        self._task: Optional[asyncio.Task] = None
+        self._forced: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await self.refresh()
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._forced):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._task = None
+        self._forced = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await self.refresh()
+
+    async def refresh(self) -> bool:
+        """Fetch the key set; keeps the previous keys on any failure."""
+        headers = {"If-None-Match": self._etag} if self._etag else {}
+        try:
+            if self._get_client is not None:
+                resp = await self._get_client().get(self.jwks_url, headers=headers, timeout=self.timeout)
+            else:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    resp = await client.get(self.jwks_url, headers=headers)
+            if resp.status_code == 304:
+                return True
+            resp.raise_for_status()
+            keys = {k["kid"]: k for k in resp.json().get("keys", []) if k.get("kid")}
+        except Exception as e:
+            logger.error("Erro ao buscar JWKS em %s: %s", self.jwks_url, e)
+            return False
+        if set(keys) != set(self.keys):
+            logger.info("JWKS atualizado: kids=%s", sorted(keys))
+        self.keys = keys
+        self._etag = resp.headers.get("etag")
+        return True
+
+    def _schedule_refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._last_forced < _MIN_FORCED_REFRESH_SECONDS:
+            return
+        if self._forced and not self._forced.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._last_forced = now
+        self._forced = loop.create_task(self.refresh())
+
+    def decode(self, token: str) -> Dict:
+        """Verify signature and expiry locally. Raises ``JWTError``."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keys.get(kid or "")
+        if key is None:
+            self._schedule_refresh()
+            raise JWTError(f"Unknown signing key: {kid}")
+        return jwt.decode(token, key, algorithms=self.algorithms)
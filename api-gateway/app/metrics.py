@@ -1,6 +1,6 @@
 """Prometheus custom metrics for the API Gateway."""
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 # --- Proxy ---
 PROXY_REQUESTS = Counter(
@@ -16,6 +16,57 @@ PROXY_DURATION = Histogram(
     buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
 )
 
+# --- Pool de conexões upstream ---
+UPSTREAM_POOL_IN_USE = Gauge(
+    "gateway_upstream_pool_in_use",
+    "Requisições ocupando uma conexão do pool por serviço downstream",
+    ["target_service"],
+)
+
+UPSTREAM_POOL_SATURATION = Gauge(
+    "gateway_upstream_pool_saturation_ratio",
+    "Fração do pool em uso (in_use / max_connections)",
+    ["target_service"],
+)
+
+UPSTREAM_POOL_WAIT = Histogram(
+    "gateway_upstream_pool_wait_seconds",
+    "Tempo até a requisição obter uma conexão do pool",
+    ["target_service"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 10),
+)
+
+# --- Circuit breaker / limite adaptativo ---
+UPSTREAM_BREAKER_STATE = Gauge(
+    "gateway_upstream_breaker_state",
+    "Estado do circuit breaker por serviço (0=closed, 1=half_open, 2=open)",
+    ["target_service"],
+)
+
+UPSTREAM_BREAKER_TRANSITIONS = Counter(
+    "gateway_upstream_breaker_transitions_total",
+    "Transições do circuit breaker por estado de destino",
+    ["target_service", "state"],
+)
+
+UPSTREAM_CONCURRENCY_LIMIT = Gauge(
+    "gateway_upstream_concurrency_limit",
+    "Limite adaptativo (AIMD) de chamadas em voo por serviço",
+    ["target_service"],
+)
+
+UPSTREAM_IN_FLIGHT = Gauge(
+    "gateway_upstream_in_flight",
+    "Chamadas em voo por serviço downstream",
+    ["target_service"],
+)
+
+UPSTREAM_SHED = Counter(
+    "gateway_upstream_shed_total",
+    "Requests rejeitadas com 503 antes de chegar ao serviço",
+    ["target_service", "reason"],  # breaker_open | concurrency_limit
+)
+
 # --- Auth ---
 AUTH_VALIDATIONS = Counter(
     "gateway_auth_validations_total",
@@ -23,6 +74,70 @@ AUTH_VALIDATIONS = Counter(
     ["result"],  # success | failure | skipped
 )
 
+USER_CACHE_LOOKUPS = Counter(
+    "gateway_user_cache_lookups_total",
+    "Consultas ao cache de contexto de usuário",
+    ["tier", "result"],  # tier: local | redis | negative | all; result: hit | miss
+)
+
+# --- Rate limit ---
+RATE_LIMIT_DECISIONS = Counter(
+    "gateway_rate_limit_decisions_total",
+    "Decisões do rate limiter por regra",
+    ["rule", "result"],  # result: allowed | limited
+)
+
+# --- Cache de respostas ---
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "gateway_response_cache_lookups_total",
+    "Consultas ao cache de respostas GET por rota",
+    ["route", "result"],  # hit | miss | coalesced | not_modified | bypass
+)
+
+# --- Views agregadas ---
+VIEW_SECTION_RESULTS = Counter(
+    "gateway_view_sections_total",
+    "Seções das views agregadas por resultado",
+    ["view", "section", "result"],  # ok | error
+)
+
+# --- Quota de IA ---
+AI_QUOTA_IN_FLIGHT = Gauge(
+    "gateway_ai_quota_in_flight_units",
+    "Unidades de custo em uso nas rotas de IA",
+)
+
+AI_QUOTA_QUEUE_DEPTH = Gauge(
+    "gateway_ai_quota_queue_depth",
+    "Requests de IA aguardando quota",
+)
+
+AI_QUOTA_WAIT = Histogram(
+    "gateway_ai_quota_wait_seconds",
+    "Tempo de espera na fila da quota de IA",
+    ["route"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+AI_QUOTA_REJECTIONS = Counter(
+    "gateway_ai_quota_rejections_total",
+    "Requests de IA rejeitadas com 429",
+    ["route", "reason"],  # queue_full | user_queue_full | timeout
+)
+
+# --- Registry A2A ---
+A2A_AGENT_HEALTH = Gauge(
+    "gateway_a2a_agent_available",
+    "Disponibilidade do agent card no registry A2A (1=disponível)",
+    ["agent"],
+)
+
+A2A_AGENT_TRANSITIONS = Counter(
+    "gateway_a2a_agent_transitions_total",
+    "Transições de disponibilidade dos agentes A2A",
+    ["agent", "status"],  # available | unavailable
+)
+
 # --- Erros upstream ---
 UPSTREAM_ERRORS = Counter(
     "gateway_upstream_errors_total",
@@ -1,17 +1,56 @@
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from fastapi import Request
-import yaml
+"""Distributed rate limiting for the gateway.
+
+Limits come from ``config/rate_limits.yaml`` and are compiled once into a
+path-segment trie, so resolving the limit for a request costs one walk over
+the path instead of a chain of ``startswith`` checks.
+
+Enforcement is a token bucket. With ``REDIS_URL`` configured the bucket
+lives in Redis and is updated atomically by a Lua script, so every uvicorn
+worker and replica shares the same budget. Without Redis (or if Redis fails)
+each worker falls back to an in-process bucket.
+
+Buckets are keyed per rule and per caller: ``user:<sub>`` when the request
+carries a valid access token, ``ip:<address>`` otherwise.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from app.auth import get_verified_payload
+from app.config import REDIS_URL
+from app.metrics import RATE_LIMIT_DECISIONS
+import logging
+
+logger = logging.getLogger(__name__)
 
 _rate_limit_config = None
 
+# Prefixos padrão de cada serviço em rate_limits.yaml → services.
+# Podem ser sobrescritos com services.<nome>.prefixes.
+_SERVICE_PREFIXES = {
+    "auth": ["/api/auth"],
+    "campaigns": ["/api/campaigns"],
+    "briefing-enhancer": ["/api/enhance-objective", "/api/ai-interactions"],
+    "content": ["/api/ai/analyze-piece", "/api/ai/generate-text"],
+}
+
+
 def get_client_ip(request: Request) -> str:
     forwarded_for = request.headers.get("X-Forwarded-For")
     if forwarded_for:
         return forwarded_for.split(",")[0].strip()
-    return get_remote_address(request)
+    if request.client:
+        return request.client.host
+    return "127.0.0.1"
+
 
 def load_rate_limit_config():
     global _rate_limit_config
@@ -24,39 +63,229 @@ def load_rate_limit_config():
             _rate_limit_config = {"enabled": False}
     return _rate_limit_config
 
-config = load_rate_limit_config()
-limiter = Limiter(key_func=get_client_ip, enabled=config.get("enabled", True))
-rate_limit_handler = _rate_limit_exceeded_handler
-
-def get_rate_limit_for_path(path: str) -> str:
-    config = load_rate_limit_config()
-    if not config.get("enabled", False):
-        return "1000/minute"
-    
-    normalized_path = path if path.startswith("/api") else f"/api{path}"
-    
-    paths = config.get("paths", {})
-    if normalized_path in paths:
-        limit = paths[normalized_path]
-        if "requests_per_minute" in limit:
-            return f"{limit['requests_per_minute']}/minute"
-        if "requests_per_hour" in limit:
-            return f"{limit['requests_per_hour']}/hour"
-    
-    services = config.get("services", {})
-    if normalized_path.startswith("/api/auth"):
-        service_limit = services.get("auth", {}).get("requests_per_minute", 60)
-        return f"{service_limit}/minute"
-    elif normalized_path.startswith("/api/campaigns"):
-        service_limit = services.get("campaigns", {}).get("requests_per_minute", 80)
-        return f"{service_limit}/minute"
-    elif normalized_path.startswith("/api/enhance-objective") or normalized_path.startswith("/api/ai-interactions"):
-        service_limit = services.get("briefing-enhancer", {}).get("requests_per_minute", 30)
-        return f"{service_limit}/minute"
-    elif normalized_path.startswith("/api/ai/analyze-piece") or normalized_path.startswith("/api/ai/generate-text"):
-        service_limit = services.get("content", {}).get("requests_per_minute", 30)
-        return f"{service_limit}/minute"
-    
-    default = config.get("default", {}).get("requests_per_minute", 100)
-    return f"{default}/minute"
 
+@dataclass(frozen=True)
+class Rule:
+    """A compiled limit: ``limit`` requests per ``period`` seconds."""
+
+    name: str
+    limit: int
+    period: int
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.period
+
+    def __str__(self) -> str:
+        unit = {60: "minute", 3600: "hour"}.get(self.period, f"{self.period}s")
+        return f"{self.limit}/{unit}"
+
+
+def _parse_rule(name: str, spec: Dict, default_per_minute: int) -> Rule:
+    if "requests_per_minute" in spec:
+        return Rule(name, int(spec["requests_per_minute"]), 60)
+    if "requests_per_hour" in spec:
+        return Rule(name, int(spec["requests_per_hour"]), 3600)
+    return Rule(name, default_per_minute, 60)
+
+
+def _segments(path: str) -> List[str]:
+    return [s for s in path.split("/") if s]
+
+
+class _Node:
+    __slots__ = ("children", "prefix_rule", "exact_rule")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.prefix_rule: Optional[Rule] = None
+        self.exact_rule: Optional[Rule] = None
+
+
+class RouteLimitTable:
+    """Path-segment trie mapping a request path to its rate-limit rule.
+
+    ``paths`` entries match exactly; ``services`` prefixes match the prefix
+    and everything below it. An exact match wins, then the longest prefix,
+    then ``default``.
+    """
+
+    def __init__(self, default: Rule):
+        self.root = _Node()
+        self.default = default
+
+    def _node(self, path: str) -> _Node:
+        node = self.root
+        for segment in _segments(path):
+            node = node.children.setdefault(segment, _Node())
+        return node
+
+    def add_prefix(self, prefix: str, rule: Rule) -> None:
+        self._node(prefix).prefix_rule = rule
+
+    def add_exact(self, path: str, rule: Rule) -> None:
+        self._node(path).exact_rule = rule
+
+    def lookup(self, path: str) -> Rule:
+        node = self.root
+        best = node.prefix_rule or self.default
+        for segment in _segments(path):
+            node = node.children.get(segment)
+            if node is None:
+                return best
+            if node.prefix_rule is not None:
+                best = node.prefix_rule
+        return node.exact_rule or best
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "RouteLimitTable":
+        default_per_minute = int((config.get("default") or {}).get("requests_per_minute", 100))
+        table = cls(Rule("default", default_per_minute, 60))
+        for service, spec in (config.get("services") or {}).items():
+            spec = spec or {}
+            rule = _parse_rule(f"service:{service}", spec, default_per_minute)
+            for prefix in spec.get("prefixes") or _SERVICE_PREFIXES.get(service, []):
+                table.add_prefix(prefix, rule)
+        for path, spec in (config.get("paths") or {}).items():
+            table.add_exact(path, _parse_rule(path, spec or {}, default_per_minute))
+        return table
+
+
+# Token bucket atômico. Usa o relógio do Redis para que todos os workers
+# compartilhem a mesma referência de tempo.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+class LocalTokenBuckets:
+    """In-process token buckets; used when Redis is not available.
+
+    Buckets are kept in least-recently-used order (every ``take`` moves its
+    key to the end), so the oldest bucket is always first and eviction is O(1).
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, rule: Rule, cost: float = 1) -> Tuple[bool, float, float]:
+        now = time.monotonic()
+        tokens, ts = self._buckets.get(key, (float(rule.limit), now))
+        tokens = min(rule.limit, tokens + max(0.0, now - ts) * rule.rate)
+        if tokens >= cost:
+            tokens -= cost
+            allowed, retry_after = True, 0.0
+        else:
+            allowed, retry_after = False, (cost - tokens) / rule.rate
+        if key not in self._buckets and len(self._buckets) >= self.max_keys:
+            self._buckets.popitem(last=False)
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        return allowed, tokens, retry_after
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, rule: Rule, retry_after: float):
+        self.rule = rule
+        self.retry_after = retry_after
+        super().__init__(str(rule))
+
+
+class RateLimiter:
+    """Token-bucket limiter shared across workers through Redis."""
+
+    PREFIX = "gateway:rl"
+
+    def __init__(self, config: Dict, redis_url: Optional[str] = None):
+        self.enabled = bool(config.get("enabled", False))
+        self.table = RouteLimitTable.from_config(config)
+        self.redis_url = redis_url
+        self.redis_client = None
+        self._script = None
+        self.local = LocalTokenBuckets()
+
+    async def connect(self) -> None:
+        if not self.enabled or not self.redis_url:
+            return
+        try:
+            import redis.asyncio as redis
+
+            self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
+            await self.redis_client.ping()
+            self._script = self.redis_client.register_script(_TOKEN_BUCKET_LUA)
+            logger.info("Rate limit Redis conectado: %s", self.redis_url)
+        except Exception as e:
+            logger.warning("Erro ao conectar ao Redis: %s. Rate limit por worker.", e)
+            self.redis_client = None
+            self._script = None
+
+    async def close(self) -> None:
+        if self.redis_client:
+            await self.redis_client.aclose()
+            self.redis_client = None
+            self._script = None
+
+    def get_rule(self, path: str) -> Rule:
+        normalized_path = path if path.startswith("/api") else f"/api{path}"
+        return self.table.lookup(normalized_path)
+
+    @staticmethod
+    def identity(request: Request) -> str:
+        payload = get_verified_payload(request)
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+        return f"ip:{get_client_ip(request)}"
+
+    async def _take(self, key: str, rule: Rule) -> Tuple[bool, float]:
+        if self._script is not None:
+            try:
+                allowed, _, retry_after = await self._script(
+                    keys=[key], args=[rule.limit, rule.rate, 1]
+                )
+                return bool(int(allowed)), float(retry_after)
+            except Exception as e:
+                logger.error("Erro no rate limit via Redis, usando bucket local: %s", e)
+        allowed, _, retry_after = self.local.take(key, rule)
+        return allowed, retry_after
+
+    async def check(self, request: Request, path: str) -> None:
+        """Consume one token for this request; raise ``RateLimitExceeded`` if empty."""
+        if not self.enabled:
+            return
+        rule = self.get_rule(path)
+        key = f"{self.PREFIX}:{rule.name}:{self.identity(request)}"
+        allowed, retry_after = await self._take(key, rule)
+        RATE_LIMIT_DECISIONS.labels(rule=rule.name, result="allowed" if allowed else "limited").inc()
+        if not allowed:
+            raise RateLimitExceeded(rule, retry_after)
+
+
+async def rate_limit_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"error": f"Rate limit exceeded: {exc.rule}"},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+limiter = RateLimiter(load_rate_limit_config(), redis_url=REDIS_URL or None)
@@ -0,0 +1,288 @@
+"""Per-upstream circuit breakers and adaptive concurrency limits.
+
+Every proxied call takes a permit from the upstream's ``UpstreamGuard``:
+
+* the **circuit breaker** watches failures (transport errors, 5xx and calls
+  slower than ``slow_call_seconds``) over a rolling window. Above
+  ``failure_rate_threshold`` it opens and the gateway answers 503 at once for
+  ``open_seconds``; then a few probe calls are let through (half-open) and
+  the breaker closes again only if they all succeed;
+* the **AIMD limit** caps calls in flight to the upstream. It grows by one
+  per ``limit`` successful fast calls and is cut by ``backoff_ratio`` on a
+  failure or slow call, so a brownout shrinks the limit and excess requests
+  are shed with 503 instead of piling up on the long upstream timeouts.
+
+State is per gateway worker and exported on ``/metrics``.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List
+
+from fastapi import HTTPException, status
+
+from app.config import UPSTREAM_SERVICES, get_resilience_config
+from app.metrics import (
+    UPSTREAM_BREAKER_STATE,
+    UPSTREAM_BREAKER_TRANSITIONS,
+    UPSTREAM_CONCURRENCY_LIMIT,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_SHED,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Intervalo mínimo entre duas reduções do limite: uma rajada de falhas
+# simultâneas conta como um único sinal de congestionamento.
+_DECREASE_COOLDOWN = 1.0
+
+
+class CircuitBreaker:
+    """Failure-rate breaker over a rolling window of one-second buckets."""
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: int = 30,
+        min_requests: int = 20,
+        failure_rate_threshold: float = 0.5,
+        open_seconds: float = 15,
+        half_open_max_calls: int = 3,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.failure_rate_threshold = failure_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._buckets: Deque[List[int]] = deque()  # [segundo, total, falhas]
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        UPSTREAM_BREAKER_STATE.labels(target_service=name).set(_STATE_VALUES[CLOSED])
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning("Circuit breaker %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+        UPSTREAM_BREAKER_STATE.labels(target_service=self.name).set(_STATE_VALUES[state])
+        UPSTREAM_BREAKER_TRANSITIONS.labels(target_service=self.name, state=state).inc()
+        if state == OPEN:
+            self.opened_at = self._clock()
+        elif state == HALF_OPEN:
+            self._probes_started = 0
+            self._probes_succeeded = 0
+        else:
+            self._buckets.clear()
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.open_seconds - self._clock())
+
+    def allow(self) -> bool:
+        if self.state == OPEN:
+            if self.retry_after() > 0:
+                return False
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes_started >= self.half_open_max_calls:
+                return False
+            self._probes_started += 1
+        return True
+
+    def cancel_probe(self) -> None:
+        """Return a half-open probe slot that ended without an outcome."""
+        if self.state == HALF_OPEN and self._probes_started > 0:
+            self._probes_started -= 1
+
+    def _window_counts(self, now: float) -> tuple[int, int]:
+        horizon = int(now) - self.window_seconds
+        while self._buckets and self._buckets[0][0] <= horizon:
+            self._buckets.popleft()
+        total = sum(b[1] for b in self._buckets)
+        failures = sum(b[2] for b in self._buckets)
+        return total, failures
+
+    def record(self, failed: bool) -> None:
+        if self.state == HALF_OPEN:
+            if failed:
+                self._transition(OPEN)
+            else:
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_max_calls:
+                    self._transition(CLOSED)
+            return
+        if self.state == OPEN:
+            return
+
+        now = self._clock()
+        second = int(now)
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        self._buckets[-1][1] += 1
+        if failed:
+            self._buckets[-1][2] += 1
+            total, failures = self._window_counts(now)
+            if total >= self.min_requests and failures / total >= self.failure_rate_threshold:
+                self._transition(OPEN)
+
+
+class AIMDLimit:
+    """Additive-increase / multiplicative-decrease cap on calls in flight."""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 50,
+        min_limit: int = 5,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.9,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self._clock = clock
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        self._export()
+
+    def _export(self) -> None:
+        UPSTREAM_CONCURRENCY_LIMIT.labels(target_service=self.name).set(int(self.limit))
+        UPSTREAM_IN_FLIGHT.labels(target_service=self.name).set(self.in_flight)
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        self._export()
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._export()
+
+    def on_sample(self, congested: bool) -> None:
+        if congested:
+            now = self._clock()
+            if now - self._last_decrease < _DECREASE_COOLDOWN:
+                return
+            self._last_decrease = now
+            self.limit = max(self.min_limit, math.floor(self.limit * self.backoff_ratio))
+        else:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        self._export()
+
+
+class Permit:
+    """One admitted call. Record its outcome once, release it once."""
+
+    def __init__(self, guard: "UpstreamGuard"):
+        self._guard = guard
+        self._start = time.perf_counter()
+        self._recorded = False
+        self._released = False
+
+    def record(self, ok: bool) -> None:
+        """Outcome of the call; ``ok=False`` for transport errors and 5xx."""
+        if self._recorded:
+            return
+        self._recorded = True
+        elapsed = time.perf_counter() - self._start
+        self._guard._record(ok, elapsed)
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            if not self._recorded:
+                self._guard.breaker.cancel_probe()
+            self._guard.limit.release()
+
+
+class _NoopPermit:
+    def record(self, ok: bool) -> None:
+        pass
+
+    def release(self) -> None:
+        pass
+
+
+_NOOP_PERMIT = _NoopPermit()
+
+
+class UpstreamGuard:
+    """Breaker + adaptive limit for one upstream service."""
+
+    def __init__(self, name: str, cfg: Dict):
+        self.name = name
+        self.enabled = bool(cfg.get("enabled", True))
+        self.slow_call_seconds = float(cfg.get("slow_call_seconds", 10))
+        self.breaker = CircuitBreaker(
+            name,
+            window_seconds=int(cfg.get("window_seconds", 30)),
+            min_requests=int(cfg.get("min_requests", 20)),
+            failure_rate_threshold=float(cfg.get("failure_rate_threshold", 0.5)),
+            open_seconds=float(cfg.get("open_seconds", 15)),
+            half_open_max_calls=int(cfg.get("half_open_max_calls", 3)),
+        )
+        self.limit = AIMDLimit(
+            name,
+            initial_limit=int(cfg.get("initial_limit", 50)),
+            min_limit=int(cfg.get("min_limit", 5)),
+            max_limit=int(cfg.get("max_limit", 200)),
+            backoff_ratio=float(cfg.get("backoff_ratio", 0.9)),
+        )
+
+    def acquire(self) -> Permit:
+        """Admit a call or raise 503."""
+        if not self.enabled:
+            return _NOOP_PERMIT
+        if not self.breaker.allow():
+            UPSTREAM_SHED.labels(target_service=self.name, reason="breaker_open").inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Service unavailable",
+                headers={"Retry-After": str(max(1, math.ceil(self.breaker.retry_after())))},
+            )
+        if not self.limit.try_acquire():
+            self.breaker.cancel_probe()
+            UPSTREAM_SHED.labels(target_service=self.name, reason="concurrency_limit").inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Service overloaded",
+                headers={"Retry-After": "1"},
+            )
+        return Permit(self)
+
+    def _record(self, ok: bool, elapsed: float) -> None:
+        slow = elapsed > self.slow_call_seconds
+        self.breaker.record(failed=not ok or slow)
+        self.limit.on_sample(congested=not ok or slow)
+
+
+_guards: Dict[str, UpstreamGuard] = {}
+
+
+def get_guard(name: str) -> UpstreamGuard:
+    guard = _guards.get(name)
+    if guard is None:
+        guard = UpstreamGuard(name, get_resilience_config(name))
+        _guards[name] = guard
+    return guard
+
+
+def init_guards() -> None:
+    for name in UPSTREAM_SERVICES:
+        get_guard(name)
@@ -0,0 +1,265 @@
+"""Short-TTL response cache for idempotent GETs (opt-in).
+
+Only routes listed in ``config/config.yaml`` → ``response_cache.routes`` are
+cached. Entries are keyed by the caller (user id, or role for routes whose
+response only depends on it), path and query string, and live for the
+route's ``ttl_seconds``.
+
+* Concurrent identical misses are coalesced: one upstream call, shared result.
+* Every cached response carries an ``ETag``; a matching ``If-None-Match``
+  gets a 304 without a body.
+* A successful POST/PUT/PATCH/DELETE drops the entries of the resource it
+  touched (``/api/<service>/<id>`` and below) plus every ``collection``
+  route of that service, for all callers. With Redis configured the
+  invalidation is broadcast to the other workers.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.config import get_response_cache_config
+from app.metrics import RESPONSE_CACHE_LOOKUPS
+from app.user_cache import TTLCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "gateway:resp_cache:invalidate"
+
+# Cabeçalhos que não fazem sentido reaproveitar de uma resposta cacheada.
+_DROP_HEADERS = {"content-length", "content-encoding", "date", "server", "_set_cookie"}
+
+Fetch = Callable[[], Awaitable[Tuple[bytes, int, dict]]]
+
+
+@dataclass(frozen=True)
+class CacheRoute:
+    pattern: str
+    regex: "re.Pattern[str]"
+    ttl: float
+    vary: str  # user | role
+    collection: bool
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    status_code: int
+    headers: Dict[str, str]
+    etag: str
+    cacheable: bool
+
+
+def _compile(pattern: str) -> "re.Pattern[str]":
+    # "*" casa exatamente um segmento do caminho
+    return re.compile("^" + re.escape(pattern).replace(r"\*", "[^/]+") + "$")
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    bare = etag.removeprefix("W/")
+    return "*" in candidates or any(c.removeprefix("W/") == bare for c in candidates)
+
+
+def _resource_scope(path: str) -> Tuple[str, str]:
+    """``/api/campaigns/abc/pieces`` → (``/api/campaigns``, ``/api/campaigns/abc``)."""
+    segments = [s for s in path.split("/") if s]
+    service = "/" + "/".join(segments[:2])
+    scope = "/" + "/".join(segments[:3])
+    return service, scope
+
+
+class ResponseCache:
+    def __init__(self, cfg: Dict, redis_url: Optional[str] = None):
+        self.enabled = bool(cfg.get("enabled", False))
+        self.routes: List[CacheRoute] = [
+            CacheRoute(
+                pattern=r["pattern"],
+                regex=_compile(r["pattern"]),
+                ttl=float(r.get("ttl_seconds", 5)),
+                vary=r.get("vary", "user"),
+                collection=bool(r.get("collection", False)),
+            )
+            for r in cfg.get("routes") or []
+        ]
+        max_ttl = max((r.ttl for r in self.routes), default=5)
+        self.local = TTLCache(int(cfg.get("max_entries", 5000)), max_ttl)
+        self.redis_url = redis_url
+        self.redis_client = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        """Start listening for invalidations broadcast by other workers."""
+        if not self.enabled or not self.redis_url:
+            return
+        try:
+            import redis.asyncio as redis
+
+            self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
+            await self.redis_client.ping()
+            self._listener = asyncio.create_task(self._listen_invalidations())
+            logger.info("Response cache Redis conectado: %s", self.redis_url)
+        except Exception as e:
+            logger.warning("Erro ao conectar ao Redis: %s. Invalidação apenas local.", e)
+            self.redis_client = None
+
+    async def close(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        if self.redis_client:
+            await self.redis_client.aclose()
+            self.redis_client = None
+
+    def route_for(self, path: str, method: str) -> Optional[CacheRoute]:
+        if not self.enabled or method != "GET":
+            return None
+        for route in self.routes:
+            if route.regex.match(path):
+                return route
+        return None
+
+    @staticmethod
+    def _key(route: CacheRoute, request: Request, path: str, user_context: Optional[dict]) -> tuple:
+        user_context = user_context or {}
+        if route.vary == "role":
+            who = f"role:{user_context.get('role', '')}"
+        else:
+            who = f"user:{user_context.get('id', '')}"
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        return (who, path, query, route.collection)
+
+    async def _load(self, key: tuple, route: CacheRoute, fetch: Fetch) -> Tuple[CachedResponse, str]:
+        """Fetch once for all concurrent callers with the same key."""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending), "coalesced"
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            body, status_code, headers = await fetch()
+            cacheable = status_code == 200 and not headers.get("_set_cookie")
+            entry = CachedResponse(
+                body=body,
+                status_code=status_code,
+                headers={k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS},
+                etag=headers.get("etag") or _etag(body),
+                cacheable=cacheable,
+            )
+            if cacheable:
+                self.local.set(key, entry, route.ttl)
+            future.set_result(entry)
+            return entry, "miss"
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # marca como observada se ninguém aguardar
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def serve(
+        self,
+        request: Request,
+        route: CacheRoute,
+        path: str,
+        user_context: Optional[dict],
+        fetch: Fetch,
+    ) -> Response:
+        key = self._key(route, request, path, user_context)
+        entry = self.local.get(key)
+        result = "hit"
+        if entry is None:
+            entry, result = await self._load(key, route, fetch)
+
+        if not entry.cacheable:
+            RESPONSE_CACHE_LOOKUPS.labels(route=route.pattern, result="bypass").inc()
+            return Response(
+                content=entry.body,
+                status_code=entry.status_code,
+                headers=entry.headers,
+                media_type=entry.headers.get("content-type", "application/json"),
+            )
+
+        headers = dict(entry.headers)
+        headers["etag"] = entry.etag
+        headers.setdefault("cache-control", "private, no-cache")
+        headers["x-cache"] = "HIT" if result != "miss" else "MISS"
+
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            RESPONSE_CACHE_LOOKUPS.labels(route=route.pattern, result="not_modified").inc()
+            return Response(
+                status_code=304,
+                headers={k: headers[k] for k in ("etag", "cache-control", "x-cache")},
+            )
+
+        RESPONSE_CACHE_LOOKUPS.labels(route=route.pattern, result=result).inc()
+        return Response(
+            content=entry.body,
+            status_code=entry.status_code,
+            headers=headers,
+            media_type=headers.get("content-type", "application/json"),
+        )
+
+    def invalidate_local(self, path: str) -> int:
+        service, scope = _resource_scope(path)
+
+        def affected(key) -> bool:
+            _, cached_path, _, collection = key
+            if collection and cached_path.startswith(service):
+                return True
+            return cached_path == scope or cached_path.startswith(scope + "/")
+
+        return self.local.pop_where(affected)
+
+    async def invalidate(self, path: str) -> None:
+        """Drop entries affected by a successful mutation on ``path``."""
+        if not self.enabled:
+            return
+        self.invalidate_local(path)
+        if self.redis_client:
+            try:
+                await self.redis_client.publish(INVALIDATION_CHANNEL, json.dumps({"path": path}))
+            except Exception as e:
+                logger.error("Erro ao publicar invalidação do response cache: %s", e)
+
+    async def _listen_invalidations(self) -> None:
+        pubsub = self.redis_client.pubsub()
+        await pubsub.subscribe(INVALIDATION_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    path = json.loads(message["data"]).get("path")
+                except (ValueError, AttributeError):
+                    continue
+                if path:
+                    self.invalidate_local(path)
+        finally:
+            await pubsub.aclose()
+
+
+def _build_response_cache() -> ResponseCache:
+    cfg = get_response_cache_config()
+    return ResponseCache(cfg, redis_url=cfg["redis_url"] or None)
+
+
+response_cache = _build_response_cache()
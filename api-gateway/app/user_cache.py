@@ -0,0 +1,267 @@
+"""User-context cache for the gateway's JWT validation path.
+
+Entries are keyed by the token's ``sub`` and ``exp`` so a refreshed token
+always triggers a fresh lookup, and no entry outlives the token it was
+resolved for. Two tiers:
+
+* an in-process TTL LRU (always on);
+* an optional Redis tier shared by every gateway worker/replica.
+
+Tokens that fail validation are negatively cached (by token digest) for a
+short TTL so a client retrying with a bad token does not reach auth-service.
+
+Staleness: auth-service has no endpoint that changes a user's role or
+active flag, so nothing pushes invalidations; a cached context is at most
+``ttl`` seconds old (and never outlives the token). After an out-of-band
+change (SQL), an operator can publish ``{"sub": "<email>"}`` on the Redis
+channel ``gateway:user_ctx:invalidate``: every worker drops its local
+entries and the Redis entry is deleted.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.config import get_user_cache_config
+from app.metrics import USER_CACHE_LOOKUPS
+import logging
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "gateway:user_ctx:invalidate"
+
+
+class TTLCache:
+    """Bounded LRU where each entry also carries an absolute expiry."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def pop_where(self, predicate) -> int:
+        keys = [k for k in self._data if predicate(k)]
+        for k in keys:
+            del self._data[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class UserContextCache:
+    """Two-tier (local + optional Redis) cache of auth-service user contexts."""
+
+    PREFIX = "gateway:user_ctx"
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttl: float = 60,
+        max_entries: int = 10000,
+        negative_ttl: float = 30,
+        redis_url: Optional[str] = None,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.redis_url = redis_url
+        self.local = TTLCache(max_entries, ttl)
+        self.negative = TTLCache(max_entries, negative_ttl)
+        self.redis_client = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        """Connect the Redis tier and start the invalidation listener."""
+        if not self.enabled or not self.redis_url:
+            return
+        try:
+            import redis.asyncio as redis
+
+            self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
+            await self.redis_client.ping()
+            self._listener = asyncio.create_task(self._listen_invalidations())
+            logger.info("User-context cache Redis conectado: %s", self.redis_url)
+        except Exception as e:
+            logger.warning("Erro ao conectar ao Redis: %s. Usando apenas cache local.", e)
+            self.redis_client = None
+
+    async def close(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        if self.redis_client:
+            await self.redis_client.aclose()
+            self.redis_client = None
+
+    def _ttl_for(self, exp: Optional[int]) -> float:
+        if exp is None:
+            return self.ttl
+        return min(self.ttl, exp - time.time())
+
+    def _redis_key(self, sub: str) -> str:
+        return f"{self.PREFIX}:{sub}"
+
+    # --- negative cache ---
+
+    def is_negative(self, token: str) -> bool:
+        if not self.enabled:
+            return False
+        hit = self.negative.get(token_digest(token)) is not None
+        if hit:
+            USER_CACHE_LOOKUPS.labels(tier="negative", result="hit").inc()
+        return hit
+
+    def set_negative(self, token: str) -> None:
+        if self.enabled:
+            self.negative.set(token_digest(token), True)
+
+    # --- positive cache ---
+
+    async def get(self, sub: str, exp: Optional[int]) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        key = (sub, exp)
+        user = self.local.get(key)
+        if user is not None:
+            USER_CACHE_LOOKUPS.labels(tier="local", result="hit").inc()
+            return user
+
+        if self.redis_client:
+            try:
+                raw = await self.redis_client.hget(self._redis_key(sub), str(exp))
+                if raw:
+                    user = json.loads(raw)
+                    self.local.set(key, user, self._ttl_for(exp))
+                    USER_CACHE_LOOKUPS.labels(tier="redis", result="hit").inc()
+                    return user
+            except Exception as e:
+                logger.error("Erro ao buscar user context no Redis: %s", e)
+
+        USER_CACHE_LOOKUPS.labels(tier="all", result="miss").inc()
+        return None
+
+    async def set(self, sub: str, exp: Optional[int], user: Dict) -> None:
+        if not self.enabled:
+            return
+        ttl = self._ttl_for(exp)
+        if ttl <= 0:
+            return
+        self.local.set((sub, exp), user, ttl)
+        if self.redis_client:
+            try:
+                redis_key = self._redis_key(sub)
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.hset(redis_key, str(exp), json.dumps(user))
+                    pipe.expire(redis_key, int(self.ttl) + 1)
+                    await pipe.execute()
+            except Exception as e:
+                logger.error("Erro ao armazenar user context no Redis: %s", e)
+
+    async def get_or_load(self, sub: str, exp: Optional[int], loader) -> Optional[Dict]:
+        """Cached lookup with single-flight: concurrent misses share one load."""
+        user = await self.get(sub, exp)
+        if user is not None:
+            return user
+
+        key = (sub, exp)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            user = await loader()
+            future.set_result(user)
+            return user
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # marca como observada se ninguém aguardar
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    # --- invalidation ---
+
+    def invalidate_local(self, sub: str) -> int:
+        return self.local.pop_where(lambda k: k[0] == sub)
+
+    async def _apply_invalidation(self, sub: str) -> int:
+        dropped = self.invalidate_local(sub)
+        # senão os workers recarregariam o contexto antigo do tier Redis
+        if self.redis_client:
+            try:
+                await self.redis_client.delete(self._redis_key(sub))
+            except Exception as e:
+                logger.error("Erro ao invalidar user context no Redis: %s", e)
+        return dropped
+
+    async def _listen_invalidations(self) -> None:
+        pubsub = self.redis_client.pubsub()
+        await pubsub.subscribe(INVALIDATION_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    sub = json.loads(message["data"]).get("sub")
+                except (ValueError, AttributeError):
+                    continue
+                if sub:
+                    dropped = await self._apply_invalidation(sub)
+                    logger.info("User context invalidado sub=%s entries=%d", sub, dropped)
+        finally:
+            await pubsub.aclose()
+
+
+def _build_user_cache() -> UserContextCache:
+    cfg = get_user_cache_config()
+    return UserContextCache(
+        enabled=bool(cfg["enabled"]),
+        ttl=float(cfg["ttl_seconds"]),
+        max_entries=int(cfg["max_entries"]),
+        negative_ttl=float(cfg["negative_ttl_seconds"]),
+        redis_url=cfg["redis_url"] or None,
+    )
+
+
+user_cache = _build_user_cache()
@@ -0,0 +1,113 @@
+"""Backend-for-frontend views that aggregate several upstream calls.
+
+``GET /api/views/campaign/{id}`` replaces the campaign page's waterfall
+(detail, piece-review history, status history) with one request. The
+sections are fetched concurrently over the pooled clients, through the same
+``proxy_request`` path as any proxied call (breakers, metrics, user headers).
+
+A failing section does not fail the view: its value is ``null`` and the
+reason goes to ``errors[<section>]``, with ``partial`` set. Only the
+campaign detail is required — if it fails, its status is returned as is.
+"""
+
+import asyncio
+import json
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from app.config import CAMPAIGNS_SERVICE_URL, get_views_config
+from app.gateway import proxy_request
+from app.metrics import VIEW_SECTION_RESULTS
+import logging
+
+logger = logging.getLogger(__name__)
+
+_views_config = get_views_config()
+SECTION_TIMEOUT = float(_views_config["section_timeout_seconds"])
+
+CAMPAIGN_SECTIONS = {
+    "campaign": "/api/campaigns/{id}",
+    "pieceReviewHistory": "/api/campaigns/{id}/piece-review-history",
+    "statusHistory": "/api/campaigns/{id}/status-history",
+}
+
+
+async def _fetch_section(
+    request: Request, path: str, user_context: Optional[dict]
+) -> Tuple[int, object]:
+    body, status_code, _ = await asyncio.wait_for(
+        proxy_request(
+            request=request,
+            service_url=CAMPAIGNS_SERVICE_URL,
+            path=path,
+            method="GET",
+            user_context=user_context,
+        ),
+        SECTION_TIMEOUT,
+    )
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        data = None
+    return status_code, data
+
+
+def _error_marker(status_code: int, data: object) -> Dict:
+    detail = data.get("detail") if isinstance(data, dict) else None
+    return {"status": status_code, "detail": detail or "Upstream error"}
+
+
+def _latest_validations(campaign: Dict) -> list:
+    """Latest IA verdict per creative piece, as persisted by campaigns-service."""
+    return [
+        {
+            "pieceId": piece.get("id"),
+            "pieceType": piece.get("pieceType"),
+            "iaVerdict": piece.get("iaVerdict"),
+            "iaAnalysisText": piece.get("iaAnalysisText"),
+            "updatedAt": piece.get("updatedAt"),
+        }
+        for piece in campaign.get("creativePieces") or []
+        if piece.get("iaVerdict")
+    ]
+
+
+async def campaign_view(request: Request, campaign_id: str, user_context: Optional[dict]) -> JSONResponse:
+    names = list(CAMPAIGN_SECTIONS)
+    results = await asyncio.gather(
+        *(
+            _fetch_section(request, CAMPAIGN_SECTIONS[name].format(id=campaign_id), user_context)
+            for name in names
+        ),
+        return_exceptions=True,
+    )
+
+    view: Dict[str, object] = {}
+    errors: Dict[str, Dict] = {}
+    for name, result in zip(names, results):
+        if isinstance(result, asyncio.TimeoutError):
+            errors[name] = {"status": 504, "detail": "Section timeout"}
+        elif isinstance(result, HTTPException):
+            errors[name] = {"status": result.status_code, "detail": result.detail}
+        elif isinstance(result, BaseException):
+            logger.error("Erro na seção %s da view de campanha: %s", name, result)
+            errors[name] = {"status": 502, "detail": "Gateway error"}
+        elif result[0] >= 400:
+            errors[name] = _error_marker(*result)
+        else:
+            view[name] = result[1]
+            VIEW_SECTION_RESULTS.labels(view="campaign", section=name, result="ok").inc()
+            continue
+        view[name] = None
+        VIEW_SECTION_RESULTS.labels(view="campaign", section=name, result="error").inc()
+
+    if "campaign" in errors:
+        error = errors["campaign"]
+        return JSONResponse(status_code=error["status"], content={"detail": error["detail"]})
+
+    view["validations"] = _latest_validations(view["campaign"] or {})
+    view["errors"] = errors
+    view["partial"] = bool(errors)
+    return JSONResponse(content=view)
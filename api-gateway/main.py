@@ -1,27 +1,64 @@
-import os
+import contextlib
+import secrets
+from typing import Optional
 from fastapi import FastAPI, Request, Response, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.errors import RateLimitExceeded
 from app.config import SERVICE_VERSION, SERVICE_NAME, get_cors_origins, AUTH_SERVICE_URL, CAMPAIGNS_SERVICE_URL, BRIEFING_ENHANCER_SERVICE_URL, CONTENT_VALIDATION_SERVICE_URL, ENVIRONMENT
-from app.gateway import proxy_request, proxy_request_stream, get_service_url
-from app.rate_limit import limiter, rate_limit_handler, get_rate_limit_for_path
-from app.auth import validate_and_extract_user, should_skip_auth
+from app.gateway import (
+    proxy_request,
+    proxy_request_stream,
+    proxy_request_streaming,
+    get_service_url,
+    is_streaming_path,
+    check_declared_body_size,
+    MAX_BODY_BYTES,
+)
+from app.rate_limit import limiter, rate_limit_handler, RateLimitExceeded
+from app.auth import validate_and_extract_user, should_skip_auth, jwks_verifier
 from app.metrics import AUTH_VALIDATIONS
+from app.http_clients import init_clients, close_clients
+from app.user_cache import user_cache
+from app.ai_quota import ai_quota
+from app.resilience import init_guards
+from app.response_cache import response_cache
+from app.views import campaign_view
+from app.a2a_registry import a2a_registry, AgentRegistration
 from prometheus_fastapi_instrumentator import Instrumentator
 import logging
-import httpx
 
 logger = logging.getLogger(__name__)
 
+MUTATING_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_clients()
+    init_guards()
+    if jwks_verifier is not None:
+        await jwks_verifier.start()
+    await user_cache.connect()
+    await limiter.connect()
+    await response_cache.connect()
+    await a2a_registry.start()
+    yield
+    logger.info("Shutting down api-gateway...")
+    await a2a_registry.stop()
+    if jwks_verifier is not None:
+        await jwks_verifier.stop()
+    await response_cache.close()
+    await limiter.close()
+    await user_cache.close()
+    await close_clients()
+
+
 app = FastAPI(
     title="Orqestra API Gateway",
     version=SERVICE_VERSION,
+    lifespan=lifespan,
 )
 
-app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
-app.add_middleware(SlowAPIMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -39,42 +76,111 @@ Instrumentator(
 ).instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
 
 
+async def authenticate(request: Request, full_path: str) -> Optional[dict]:
+    """Resolve the user context for ``full_path``; 401 if auth is required and fails."""
+    if should_skip_auth(full_path):
+        AUTH_VALIDATIONS.labels(result="skipped").inc()
+        return None
+    user_context = await validate_and_extract_user(request)
+    if not user_context:
+        AUTH_VALIDATIONS.labels(result="failure").inc()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    AUTH_VALIDATIONS.labels(result="success").inc()
+    return user_context
+
+
+@app.get(
+    "/api/views/campaign/{campaign_id}",
+    summary="Campaign page view",
+    description="Agrega detalhe, históricos e últimos pareceres de IA da campanha numa única resposta.",
+    tags=["views"],
+)
+async def campaign_page_view(request: Request, campaign_id: str):
+    full_path = f"/api/views/campaign/{campaign_id}"
+    await limiter.check(request, full_path)
+    user_context = await authenticate(request, full_path)
+    return await campaign_view(request, campaign_id, user_context)
+
+
 @app.api_route("/api/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"])
-@limiter.limit(lambda request: get_rate_limit_for_path(request.url.path))
 async def gateway(request: Request, path: str):
     if request.method == "OPTIONS":
         return Response(status_code=200)
     
     full_path = f"/api/{path}"
-
-    user_context = None
-    if not should_skip_auth(full_path):
-        user_context = await validate_and_extract_user(request)
-        if not user_context:
-            AUTH_VALIDATIONS.labels(result="failure").inc()
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        AUTH_VALIDATIONS.labels(result="success").inc()
-    else:
-        AUTH_VALIDATIONS.labels(result="skipped").inc()
+    await limiter.check(request, full_path)
+    user_context = await authenticate(request, full_path)
     
     service_url = get_service_url(full_path)
-    
-    body = None
-    if request.method in ["POST", "PUT", "PATCH"]:
-        body = await request.body()
 
-    if full_path == "/api/ai/analyze-piece/stream" and request.method == "POST":
-        return await proxy_request_stream(
+    if is_streaming_path(full_path):
+        streaming_response = await proxy_request_streaming(
             request=request,
             service_url=service_url,
             path=full_path,
-            body=body,
             user_context=user_context,
         )
+        if request.method in MUTATING_METHODS and streaming_response.status_code < 400:
+            await response_cache.invalidate(full_path)
+        return streaming_response
+
+    cache_route = response_cache.route_for(full_path, request.method)
+    if cache_route:
+        return await response_cache.serve(
+            request,
+            cache_route,
+            full_path,
+            user_context,
+            lambda: proxy_request(
+                request=request,
+                service_url=service_url,
+                path=full_path,
+                method="GET",
+                user_context=user_context,
+            ),
+        )
+    
+    body = None
+    if request.method in ["POST", "PUT", "PATCH"]:
+        check_declared_body_size(request)
+        body = await request.body()
+        if len(body) > MAX_BODY_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Request body exceeds {MAX_BODY_BYTES} bytes",
+            )
+
+    lease = None
+    ai_route = ai_quota.route_for(full_path, request.method)
+    if ai_route:
+        user_id = str((user_context or {}).get("id", "anonymous"))
+        lease = await ai_quota.acquire(ai_route, user_id, body)
+
+    if full_path == "/api/ai/analyze-piece/stream" and request.method == "POST":
+        try:
+            stream_response = await proxy_request_stream(
+                request=request,
+                service_url=service_url,
+                path=full_path,
+                body=body,
+                user_context=user_context,
+                # a quota fica ocupada até o fim do stream
+                on_close=lease.release if lease else None,
+            )
+        except BaseException:
+            if lease:
+                lease.release()
+            raise
+        return stream_response
+
+    # GETs fora do cache repassam If-None-Match: o serviço pode responder 304
+    conditional = None
+    if request.method == "GET" and request.headers.get("if-none-match"):
+        conditional = {"if-none-match": request.headers["if-none-match"]}
 
     try:
         response_body, status_code, response_headers = await proxy_request(
@@ -83,9 +189,13 @@ async def gateway(request: Request, path: str):
             path=full_path,
             method=request.method,
             body=body,
+            headers=conditional,
             user_context=user_context
         )
         
+        if request.method in MUTATING_METHODS and status_code < 400:
+            await response_cache.invalidate(full_path)
+
         set_cookie_headers = response_headers.pop("_set_cookie", [])
         
         response = Response(
@@ -97,6 +207,9 @@ async def gateway(request: Request, path: str):
     except Exception as e:
         logger.error(f"Error processing response: {type(e).__name__}: {e}", exc_info=True)
         raise
+    finally:
+        if lease:
+            lease.release()
     
     if set_cookie_headers:
         for cookie_str in set_cookie_headers:
@@ -165,12 +278,6 @@ async def root():
 
 
 # A2A Agent Discovery Registry 
-_A2A_AGENTS = [
-    {"name": "content-validation", "base_url": CONTENT_VALIDATION_SERVICE_URL},
-    {"name": "legal", "base_url": os.getenv("LEGAL_SERVICE_URL", "http://legal-service:8005")},
-]
-
-
 @app.get(
     "/a2a/discovery",
     summary="A2A Agent Discovery Registry",
@@ -178,31 +285,24 @@ _A2A_AGENTS = [
     tags=["a2a"],
 )
 async def a2a_discovery():
-    agents = []
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        for agent in _A2A_AGENTS:
-            card_url = f"{agent['base_url']}/a2a/.well-known/agent-card.json"
-            try:
-                resp = await client.get(card_url)
-                if resp.status_code == 200:
-                    agents.append(resp.json())
-                else:
-                    agents.append({
-                        "name": agent["name"],
-                        "status": "unavailable",
-                        "error": f"HTTP {resp.status_code}",
-                    })
-            except Exception as e:
-                agents.append({
-                    "name": agent["name"],
-                    "status": "unavailable",
-                    "error": str(e),
-                })
+    return a2a_registry.discovery()
+
 
+@app.post(
+    "/a2a/registry",
+    status_code=status.HTTP_201_CREATED,
+    summary="A2A agent self-registration",
+    description="Registra (ou renova) um agente A2A. Exige o header X-Registry-Token.",
+    tags=["a2a"],
+)
+async def a2a_register(registration: AgentRegistration, request: Request):
+    token = a2a_registry.registration_token
+    if not token or not secrets.compare_digest(request.headers.get("x-registry-token", ""), token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Registration not allowed")
+    entry = await a2a_registry.register(registration.name, registration.base_url)
     return {
-        "registry": "Orqestra A2A Agent Registry",
-        "protocol_version": "1.0",
-        "agents_count": len([a for a in agents if "status" not in a]),
-        "agents": agents,
+        "name": entry.name,
+        "status": entry.status,
+        "error": entry.error,
+        "lease_seconds": None if entry.static else a2a_registry.registration_ttl,
     }
-
@@ -0,0 +1,641 @@
+import asyncio
+
+
+# ── Pool de clientes upstream ─────────────────────────────────────────────
+
+async def _keepalive_server(body: bytes = b"ok"):
+    """Servidor HTTP/1.1 mínimo com keep-alive, para exercitar o pool real."""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        while True:
+            try:
+                await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, port, connections
+
+
+def test_http_client_config_merges_service_overrides():
+    from app.config import get_http_client_config
+    cfg = get_http_client_config("content-validation")
+    assert cfg["stream_timeout"] == 180
+    assert cfg["max_connections"] == 100
+    assert get_http_client_config("auth")["timeout"] == 30
+
+
+def test_pooled_client_reuses_connection_and_tracks_usage():
+    from app.http_clients import build_client
+
+    async def run():
+        server, port, connections = await _keepalive_server()
+        client = build_client("campaigns")
+        try:
+            for _ in range(3):
+                resp = await client.get(f"http://127.0.0.1:{port}/")
+                assert resp.status_code == 200
+                assert resp.content == b"ok"
+            transport = client._transport
+            assert transport.in_use == 0
+            assert len(connections) == 1  # keep-alive: uma única conexão TCP
+        finally:
+            await client.aclose()
+            server.close()
+
+    asyncio.run(run())
+
+
+# ── Cache de contexto de usuário ──────────────────────────────────────────
+
+def _request_with_token(token: str):
+    from starlette.requests import Request
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def _access_token(sub: str = "ana@email.com", minutes: int = 30) -> str:
+    from datetime import datetime, timedelta
+    from jose import jwt
+    from app.config import SECRET_KEY, ALGORITHM
+    exp = datetime.utcnow() + timedelta(minutes=minutes)
+    return jwt.encode({"sub": sub, "exp": exp, "type": "access"}, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def test_ttl_cache_evicts_lru_and_expired():
+    from app.user_cache import TTLCache
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None  # menos recentemente usado
+    assert cache.get("a") == 1
+    cache.set("d", 4, ttl=-1)
+    assert cache.get("d") is None
+
+
+def test_validate_user_hits_auth_service_once(monkeypatch):
+    from app import auth
+    from app.user_cache import UserContextCache
+    monkeypatch.setattr(auth, "user_cache", UserContextCache())
+    calls = []
+
+    async def fake_fetch(token):
+        calls.append(token)
+        await asyncio.sleep(0.01)
+        return {"id": "u1", "email": "ana@email.com", "role": "Analista de negócios", "is_active": True}, True
+
+    monkeypatch.setattr(auth, "_fetch_user", fake_fetch)
+    token = _access_token()
+
+    async def run():
+        return await asyncio.gather(
+            *(auth.validate_and_extract_user(_request_with_token(token)) for _ in range(5))
+        )
+
+    users = asyncio.run(run())
+    assert all(u["id"] == "u1" for u in users)
+    assert len(calls) == 1
+    asyncio.run(auth.validate_and_extract_user(_request_with_token(token)))
+    assert len(calls) == 1
+
+
+def test_invalid_token_is_negatively_cached(monkeypatch):
+    from app import auth
+    from app.user_cache import UserContextCache
+    monkeypatch.setattr(auth, "user_cache", UserContextCache())
+    decodes = []
+    original = auth.decode_jwt_token
+    monkeypatch.setattr(auth, "decode_jwt_token", lambda t: decodes.append(t) or original(t))
+
+    token = _access_token(minutes=-1)
+    for _ in range(3):
+        assert asyncio.run(auth.validate_and_extract_user(_request_with_token(token))) is None
+    assert len(decodes) == 1
+
+
+def test_transient_auth_failure_is_not_negatively_cached(monkeypatch):
+    from app import auth
+    from app.user_cache import UserContextCache
+    monkeypatch.setattr(auth, "user_cache", UserContextCache())
+
+    async def unavailable(token):
+        return None, False
+
+    monkeypatch.setattr(auth, "_fetch_user", unavailable)
+    token = _access_token()
+    assert asyncio.run(auth.validate_and_extract_user(_request_with_token(token))) is None
+    assert not auth.user_cache.is_negative(token)
+
+
+def test_invalidation_message_drops_local_entries():
+    from app.user_cache import UserContextCache
+    cache = UserContextCache()
+
+    async def run():
+        await cache.set("ana@email.com", None, {"id": "u1"})
+        assert await cache.get("ana@email.com", None) == {"id": "u1"}
+        assert await cache._apply_invalidation("ana@email.com") == 1
+        return await cache.get("ana@email.com", None)
+
+    assert asyncio.run(run()) is None
+
+
+# ── Proxy em streaming ────────────────────────────────────────────────────
+
+def _streaming_gateway(monkeypatch, max_body: int = 1024):
+    import httpx
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import Response
+    from starlette.routing import Route
+    from starlette.testclient import TestClient
+    from app import gateway
+    from app.config import CAMPAIGNS_SERVICE_URL
+
+    async def upstream(request: Request):
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+        response = Response(f"received={received}", media_type="text/plain")
+        response.headers.append("set-cookie", "a=1; Path=/")
+        response.headers.append("set-cookie", "b=2; Path=/")
+        return response
+
+    upstream_app = Starlette(routes=[Route("/{path:path}", upstream, methods=["GET", "POST"])])
+    monkeypatch.setattr(
+        gateway, "get_client",
+        lambda name: httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream_app)),
+    )
+    monkeypatch.setattr(gateway, "MAX_BODY_BYTES", max_body)
+
+    async def proxied(request: Request):
+        return await gateway.proxy_request_streaming(request, CAMPAIGNS_SERVICE_URL, request.url.path)
+
+    outer = Starlette(routes=[Route("/{path:path}", proxied, methods=["GET", "POST"])])
+    return TestClient(outer, raise_server_exceptions=False)
+
+
+def test_streaming_paths_from_config():
+    from app.gateway import is_streaming_path
+    assert is_streaming_path("/api/campaigns/c1/creative-pieces/upload-app")
+    assert is_streaming_path("/api/campaigns/c1/creative-pieces/p1/content")
+    assert is_streaming_path("/api/campaigns/events/stream")
+    assert not is_streaming_path("/api/campaigns/c1")
+
+
+def test_streaming_proxy_pipes_body_and_keeps_repeated_headers(monkeypatch):
+    client = _streaming_gateway(monkeypatch)
+    resp = client.post("/api/campaigns/c1/creative-pieces/upload-app", content=b"x" * 1000)
+    assert resp.status_code == 200
+    assert resp.text == "received=1000"
+    assert resp.headers.get_list("set-cookie") == ["a=1; Path=/", "b=2; Path=/"]
+
+
+def test_streaming_proxy_releases_permit_for_event_streams(monkeypatch):
+    import httpx
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import StreamingResponse
+    from starlette.routing import Route
+    from starlette.testclient import TestClient
+    from app import gateway
+    from app.config import CAMPAIGNS_SERVICE_URL
+
+    released = []
+
+    class Permit:
+        def record(self, ok):
+            pass
+
+        def release(self):
+            released.append(True)
+
+    async def upstream(request: Request):
+        async def body():
+            yield f"id: {request.headers.get('last-event-id')}\n\n".encode()
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    upstream_app = Starlette(routes=[Route("/{path:path}", upstream)])
+    monkeypatch.setattr(
+        gateway, "get_client",
+        lambda name: httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream_app)),
+    )
+    monkeypatch.setattr(gateway, "get_guard", lambda name: type("G", (), {"acquire": lambda self: Permit()})())
+
+    async def proxied(request: Request):
+        response = await gateway.proxy_request_streaming(request, CAMPAIGNS_SERVICE_URL, request.url.path)
+        # liberada já nos cabeçalhos, antes do corpo do stream
+        assert released
+        return response
+
+    client = TestClient(Starlette(routes=[Route("/{path:path}", proxied)]))
+    resp = client.get("/api/campaigns/events/stream", headers={"Last-Event-ID": "41"})
+    assert resp.status_code == 200
+    assert resp.text == "id: 41\n\n"
+
+
+def test_sse_proxy_releases_permit_and_lease_when_client_leaves_before_first_chunk(monkeypatch):
+    from starlette.requests import Request
+    from app import gateway
+    from app.config import CONTENT_VALIDATION_SERVICE_URL
+    from app.resilience import UpstreamGuard
+
+    guard = UpstreamGuard("content-validation", {})
+    monkeypatch.setattr(gateway, "get_guard", lambda name: guard)
+    closed = []
+
+    async def disconnected():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    async def run():
+        request = Request({"type": "http", "method": "POST", "path": "/", "headers": []})
+        response = await gateway.proxy_request_stream(
+            request, CONTENT_VALIDATION_SERVICE_URL, "/api/ai/analyze-piece/stream",
+            body=b"{}", on_close=lambda: closed.append(True),
+        )
+        assert guard.limit.in_flight == 1
+        await response({"type": "http"}, disconnected, send)
+
+    asyncio.run(run())
+    assert guard.limit.in_flight == 0
+    assert closed == [True]
+
+
+def test_streaming_proxy_rejects_oversized_body(monkeypatch):
+    client = _streaming_gateway(monkeypatch, max_body=100)
+    resp = client.post("/api/campaigns/c1/creative-pieces/upload-app", content=b"x" * 101)
+    assert resp.status_code == 413
+
+    def chunks():
+        for _ in range(5):
+            yield b"x" * 50
+
+    resp = client.post("/api/campaigns/c1/creative-pieces/upload-app", content=chunks())
+    assert resp.status_code == 413
+
+
+# ── Rate limiting ─────────────────────────────────────────────────────────
+
+def test_route_limit_table_prefers_exact_then_longest_prefix():
+    from app.rate_limit import RouteLimitTable, load_rate_limit_config
+    table = RouteLimitTable.from_config(load_rate_limit_config())
+    assert str(table.lookup("/api/auth/login")) == "10/minute"
+    assert str(table.lookup("/api/auth/register")) == "5/hour"
+    assert table.lookup("/api/auth/me").name == "service:auth"
+    assert table.lookup("/api/ai/generate-text/x").name == "service:content"
+    assert table.lookup("/api/ai/other").name == "default"
+    assert table.lookup("/api/authx").name == "default"
+
+
+def test_local_buckets_evict_least_recently_used_key():
+    from app.rate_limit import LocalTokenBuckets, Rule
+    rule = Rule("test", limit=2, period=60)
+    buckets = LocalTokenBuckets(max_keys=2)
+    buckets.take("a", rule)
+    buckets.take("b", rule)
+    buckets.take("a", rule)  # "a" passa a ser o mais recente
+    buckets.take("c", rule)
+    assert list(buckets._buckets) == ["a", "c"]
+    # "a" manteve o consumo: segunda chamada esgota o bucket
+    allowed, _, _ = buckets.take("a", rule)
+    assert not allowed
+
+
+def test_rate_limiter_keys_by_jwt_sub_and_returns_429(monkeypatch):
+    from app.auth import get_verified_payload
+    from app.rate_limit import RateLimiter, RateLimitExceeded
+
+    limiter = RateLimiter({"enabled": True, "default": {"requests_per_minute": 2}})
+    token = _access_token("ana@email.com")
+    assert get_verified_payload(_request_with_token(token))["sub"] == "ana@email.com"
+
+    async def run():
+        for _ in range(2):
+            await limiter.check(_request_with_token(token), "/api/campaigns")
+        try:
+            await limiter.check(_request_with_token(token), "/api/campaigns")
+            raise AssertionError("esperava 429")
+        except RateLimitExceeded as exc:
+            assert exc.retry_after > 0
+        # Outro usuário atrás do mesmo IP tem seu próprio bucket.
+        await limiter.check(_request_with_token(_access_token("bia@email.com")), "/api/campaigns")
+
+    asyncio.run(run())
+
+
+# ── Quota de IA ───────────────────────────────────────────────────────────
+
+def test_ai_route_weight_follows_channel():
+    from app.ai_quota import ai_quota
+    route = ai_quota.route_for("/api/ai/analyze-piece", "POST")
+    assert route.weight_for(b'{"channel": "EMAIL"}') > route.weight_for(b'{"channel": "SMS"}')
+    assert ai_quota.route_for("/api/ai/analyze-piece", "GET") is None
+    assert ai_quota.route_for("/api/campaigns", "POST") is None
+
+
+def test_weighted_quota_isolates_users_and_bounds_queue():
+    from app.ai_quota import WeightedQuota, QuotaExceeded
+
+    async def run():
+        quota = WeightedQuota(
+            global_capacity=10, per_user_capacity=4, max_queue=2, per_user_max_queue=1, max_wait=0.05
+        )
+        heavy = await quota.acquire("ana", 4)
+        # ana está no limite próprio; bia ainda passa na hora
+        light = await quota.acquire("bia", 1)
+
+        waiting = asyncio.ensure_future(quota.acquire("ana", 1))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        try:
+            await quota.acquire("ana", 1)  # fila de ana cheia → 429 imediato
+            raise AssertionError("esperava QuotaExceeded")
+        except QuotaExceeded as e:
+            assert e.reason == "user_queue_full"
+
+        heavy.release()
+        second = await waiting
+        assert quota.in_flight == 2
+
+        try:
+            await quota.acquire("ana", 4)  # não cabe e expira na fila
+            raise AssertionError("esperava QuotaExceeded")
+        except QuotaExceeded as e:
+            assert e.reason == "timeout"
+        assert quota.in_flight == 2 and not quota._waiters
+
+        light.release()
+        second.release()
+        second.release()  # idempotente
+        assert quota.in_flight == 0
+
+    asyncio.run(run())
+
+
+# ── Circuit breaker / limite adaptativo ───────────────────────────────────
+
+def test_circuit_breaker_opens_then_probes_and_closes():
+    from app.resilience import CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+
+    now = [1000.0]
+    breaker = CircuitBreaker(
+        "test", min_requests=4, failure_rate_threshold=0.5, open_seconds=10,
+        half_open_max_calls=2, clock=lambda: now[0],
+    )
+    for failed in (False, False, True, True):
+        assert breaker.allow()
+        breaker.record(failed)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    now[0] += 10
+    assert breaker.allow() and breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # só half_open_max_calls sondas
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.state == CLOSED
+
+
+def test_aimd_limit_sheds_and_recovers():
+    from fastapi import HTTPException
+    from app.resilience import UpstreamGuard
+
+    guard = UpstreamGuard("test", {"initial_limit": 10, "min_limit": 2, "backoff_ratio": 0.5, "min_requests": 1000})
+    permits = [guard.acquire() for _ in range(10)]
+    try:
+        guard.acquire()
+        raise AssertionError("esperava 503")
+    except HTTPException as e:
+        assert e.status_code == 503
+
+    permits[0].record(False)  # falha → limite cai pela metade
+    for p in permits:
+        p.release()
+    assert int(guard.limit.limit) == 5
+    for _ in range(50):
+        p = guard.acquire()
+        p.record(True)
+        p.release()
+    assert int(guard.limit.limit) > 5
+
+
+# ── Cache de respostas GET ────────────────────────────────────────────────
+
+def _get_request(path: str, headers=None, query: bytes = b""):
+    from starlette.requests import Request
+    raw = [(k.encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": path, "headers": raw, "query_string": query})
+
+
+def test_response_cache_coalesces_serves_304_and_invalidates():
+    from app.response_cache import ResponseCache
+
+    cache = ResponseCache({
+        "enabled": True,
+        "routes": [
+            {"pattern": "/api/campaigns", "ttl_seconds": 30, "collection": True},
+            {"pattern": "/api/campaigns/*/status-history", "ttl_seconds": 30},
+        ],
+    })
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b'{"campaigns": []}', 200, {"content-type": "application/json"}
+
+    user = {"id": "u1", "role": "Analista de negócios"}
+
+    async def get(path, headers=None):
+        route = cache.route_for(path, "GET")
+        return await cache.serve(_get_request(path, headers), route, path, user, fetch)
+
+    async def run():
+        first = await asyncio.gather(*(get("/api/campaigns") for _ in range(5)))
+        assert len(calls) == 1
+        etag = first[0].headers["etag"]
+
+        not_modified = await get("/api/campaigns", {"if-none-match": etag})
+        assert not_modified.status_code == 304 and not_modified.body == b""
+        await get("/api/campaigns/c1/status-history")
+        await get("/api/campaigns/c2/status-history")
+        assert len(calls) == 3
+
+        # escrita em c1 derruba a lista e o histórico de c1, não o de c2
+        await cache.invalidate("/api/campaigns/c1/status")
+        await get("/api/campaigns")
+        await get("/api/campaigns/c1/status-history")
+        await get("/api/campaigns/c2/status-history")
+        assert len(calls) == 5
+
+    asyncio.run(run())
+    assert cache.route_for("/api/campaigns/c1/pieces/x", "GET") is None
+    assert cache.route_for("/api/campaigns", "POST") is None
+
+
+# ── View agregada de campanha ─────────────────────────────────────────────
+
+def test_campaign_view_fans_out_concurrently_with_partial_results(monkeypatch):
+    import json
+    import time
+    from fastapi import HTTPException
+    from app import views
+
+    async def fake_proxy(request, service_url, path, method, user_context):
+        await asyncio.sleep(0.05)
+        if path.endswith("/status-history"):
+            raise HTTPException(status_code=504, detail="Service timeout")
+        if path.endswith("/piece-review-history"):
+            return b'{"history": []}', 200, {}
+        pieces = [{"id": "p1", "pieceType": "SMS", "iaVerdict": "approved"}, {"id": "p2", "pieceType": "Push"}]
+        return json.dumps({"id": "c1", "creativePieces": pieces}).encode(), 200, {}
+
+    monkeypatch.setattr(views, "proxy_request", fake_proxy)
+
+    start = time.perf_counter()
+    response = asyncio.run(views.campaign_view(_get_request("/api/views/campaign/c1"), "c1", {"id": "u1"}))
+    assert time.perf_counter() - start < 0.12  # em paralelo, não em cascata
+
+    body = json.loads(response.body)
+    assert body["campaign"]["id"] == "c1"
+    assert body["pieceReviewHistory"] == {"history": []}
+    assert body["statusHistory"] is None
+    assert body["errors"] == {"statusHistory": {"status": 504, "detail": "Service timeout"}}
+    assert body["partial"] is True
+    assert [v["pieceId"] for v in body["validations"]] == ["p1"]
+
+
+# ── Registry A2A ──────────────────────────────────────────────────────────
+
+def test_a2a_registry_polls_concurrently_and_revalidates_with_etag():
+    import httpx
+    from app.a2a_registry import A2ARegistry
+
+    requests_seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append((request.url.host, request.headers.get("if-none-match")))
+        if request.url.host == "down":
+            return httpx.Response(503)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"name": request.url.host}, headers={"etag": '"v1"'})
+
+    registry = A2ARegistry({
+        "card_ttl_seconds": 0,
+        "registration_ttl_seconds": 60,
+        "agents": [{"name": "cv", "base_url": "http://cv"}, {"name": "legal", "base_url": "http://down"}],
+    })
+    registry._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run():
+        await registry.refresh()
+        snapshot = registry.discovery()
+        assert snapshot["agents_count"] == 1
+        assert {"name": "legal", "status": "unavailable", "error": "HTTP 503"} in snapshot["agents"]
+
+        await registry.refresh()
+        assert ("cv", '"v1"') in requests_seen  # revalidação condicional
+        assert registry.agents["cv"].card == {"name": "cv"}
+
+        entry = await registry.register("branding", "http://branding")
+        assert entry.status == "available" and entry.lease_expires_at is not None
+        assert registry.discovery()["agents_count"] == 2
+        await registry._client.aclose()
+
+    asyncio.run(run())
+
+
+# ── Verificação RS256 via JWKS ────────────────────────────────────────────
+
+def test_jwks_verifier_validates_offline_and_refreshes_on_unknown_kid(monkeypatch):
+    import base64
+    import httpx
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jose import JWTError, jwt
+    from app import jwks
+
+    def new_key(kid):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        nums = key.public_key().public_numbers()
+        b64 = lambda v: base64.urlsafe_b64encode(v.to_bytes((v.bit_length() + 7) // 8, "big")).rstrip(b"=").decode()
+        pem = key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ).decode()
+        return pem, {"kty": "RSA", "alg": "RS256", "kid": kid, "n": b64(nums.n), "e": b64(nums.e)}
+
+    pem1, jwk1 = new_key("k1")
+    pem2, jwk2 = new_key("k2")
+    published = {"keys": [jwk1]}
+    fetches = []
+
+    def handler(request):
+        fetches.append(1)
+        return httpx.Response(200, json=published)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        jwks.httpx, "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+    verifier = jwks.JWKSVerifier("http://auth/.well-known/jwks.json", algorithms=["RS256"])
+    claims = {"sub": "ana@email.com", "type": "access"}
+
+    async def run():
+        await verifier.refresh()
+        token1 = jwt.encode(claims, pem1, algorithm="RS256", headers={"kid": "k1"})
+        assert verifier.decode(token1)["sub"] == "ana@email.com"
+        assert len(fetches) == 1  # verificação não chama o auth-service
+
+        # chave nova rotacionada: primeiro token falha e dispara refresh
+        published["keys"].append(jwk2)
+        token2 = jwt.encode(claims, pem2, algorithm="RS256", headers={"kid": "k2"})
+        try:
+            verifier.decode(token2)
+            raise AssertionError("esperava JWTError")
+        except JWTError:
+            pass
+        await verifier._forced
+        assert verifier.decode(token2)["sub"] == "ana@email.com"
+
+    asyncio.run(run())
+
+
+def test_jwks_refresh_revalidates_through_the_shared_client():
+    import httpx
+    from app import jwks
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"keys": [{"kid": "k1"}]}, headers={"ETag": '"v1"'})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    verifier = jwks.JWKSVerifier("http://auth/.well-known/jwks.json", algorithms=["RS256"], get_client=lambda: client)
+
+    async def run():
+        assert await verifier.refresh()
+        assert await verifier.refresh()
+        assert not client.is_closed  # cliente do pool não é fechado pelo refresh
+        await client.aclose()
+
+    asyncio.run(run())
+    assert seen == [None, '"v1"']
+    assert set(verifier.keys) == {"k1"}
@@ -0,0 +1,41 @@
+"""Store refresh tokens as SHA-256 digests
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tokens expirados/revogados não precisam ser migrados
+    op.execute("DELETE FROM refresh_tokens WHERE expires_at < now() OR is_revoked")
+
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.String(64), nullable=True))
+    op.execute("UPDATE refresh_tokens SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')")
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'], unique=True)
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+
+    op.drop_index(op.f('ix_refresh_tokens_token'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token')
+
+
+def downgrade() -> None:
+    # O token original não é recuperável a partir do digest: as sessões são encerradas
+    op.execute("DELETE FROM refresh_tokens")
+    op.add_column('refresh_tokens', sa.Column('token', sa.String(), nullable=False))
+    op.create_index(op.f('ix_refresh_tokens_token'), 'refresh_tokens', ['token'], unique=True)
+
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
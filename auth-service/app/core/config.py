@@ -5,6 +5,7 @@ from typing import List
 class Settings(BaseSettings):
     DATABASE_URL: str = ""
     SECRET_KEY: str = ""
+    REDIS_URL: str = ""
     ENVIRONMENT: str = "development"
     SERVICE_NAME: str = "auth-service"
     SERVICE_VERSION: str = "1.0.0"
@@ -0,0 +1,145 @@
+"""Asymmetric signing keys for access tokens and their public JWKS.
+
+With ``auth.algorithm: RS256`` access tokens are signed with a private key
+from ``auth.signing_keys_dir`` (one PEM per file, ``kid`` = file name without
+extension) and carry that ``kid`` in the header. Every key in the directory
+is published on ``/.well-known/jwks.json``, so other services can verify
+tokens offline.
+
+Rotation: drop a new key in the directory (named so it sorts last, e.g.
+``2026-10.pem``) and restart; it becomes the active key. Keep the previous
+file until every token it signed has expired (``access_token_expire_minutes``
+plus the verifiers' JWKS refresh interval), then remove it.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import secrets
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.core.auth_config import load_auth_config
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = {"RS256"}
+
+
+def _b64url_uint(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    private_pem: str
+    public_pem: str
+    jwk: Dict[str, str]
+
+
+def _signing_key(kid: str, private_key: rsa.RSAPrivateKey, algorithm: str) -> SigningKey:
+    public_key = private_key.public_key()
+    numbers = public_key.public_numbers()
+    return SigningKey(
+        kid=kid,
+        private_pem=private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode("ascii"),
+        public_pem=public_key.public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode("ascii"),
+        jwk={
+            "kty": "RSA",
+            "use": "sig",
+            "alg": algorithm,
+            "kid": kid,
+            "n": _b64url_uint(numbers.n),
+            "e": _b64url_uint(numbers.e),
+        },
+    )
+
+
+class KeyRing:
+    """Signing keys loaded once from disk; the active one signs new tokens."""
+
+    def __init__(self, algorithm: str, keys_dir: str, active_kid: str = ""):
+        self.algorithm = algorithm
+        self.keys: Dict[str, SigningKey] = {}
+        self.active_kid: Optional[str] = None
+        self._load(Path(keys_dir), active_kid)
+
+    def _load(self, keys_dir: Path, active_kid: str) -> None:
+        files = sorted(keys_dir.glob("*.pem")) if keys_dir.is_dir() else []
+        for path in files:
+            private_key = serialization.load_pem_private_key(path.read_bytes(), password=None)
+            if not isinstance(private_key, rsa.RSAPrivateKey):
+                raise RuntimeError(f"Chave {path} não é RSA; {self.algorithm} exige RSA")
+            self.keys[path.stem] = _signing_key(path.stem, private_key, self.algorithm)
+
+        if not self.keys:
+            if settings.ENVIRONMENT == "production":
+                raise RuntimeError(
+                    f"auth.algorithm={self.algorithm} mas nenhuma chave encontrada em {keys_dir}"
+                )
+            kid = f"ephemeral-{secrets.token_hex(4)}"
+            logger.warning(
+                "Nenhuma chave em %s; gerando chave efêmera %s (apenas desenvolvimento)", keys_dir, kid
+            )
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            self.keys[kid] = _signing_key(kid, private_key, self.algorithm)
+
+        if active_kid and active_kid not in self.keys:
+            raise RuntimeError(f"auth.active_kid={active_kid} não existe em {keys_dir}")
+        self.active_kid = active_kid or sorted(self.keys)[-1]
+        logger.info("JWT %s: kid ativo=%s, publicados=%s", self.algorithm, self.active_kid, list(self.keys))
+
+    @property
+    def active(self) -> SigningKey:
+        return self.keys[self.active_kid]
+
+    def public_pem(self, kid: Optional[str]) -> Optional[str]:
+        key = self.keys.get(kid or "")
+        return key.public_pem if key else None
+
+    def jwks(self) -> Dict[str, List[Dict[str, str]]]:
+        return {"keys": [key.jwk for key in self.keys.values()]}
+
+
+_key_ring: Optional[KeyRing] = None
+
+
+def get_key_ring() -> KeyRing:
+    global _key_ring
+    if _key_ring is None:
+        auth_config = load_auth_config().get("auth", {})
+        _key_ring = KeyRing(
+            algorithm=auth_config.get("algorithm", "HS256"),
+            keys_dir=auth_config.get("signing_keys_dir", "keys"),
+            active_kid=auth_config.get("active_kid", "") or "",
+        )
+    return _key_ring
+
+
+def get_jwks() -> Dict[str, List[Dict[str, str]]]:
+    """Public JWKS; empty when tokens are signed with a shared secret."""
+    algorithm = load_auth_config().get("auth", {}).get("algorithm", "HS256")
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        return {"keys": []}
+    return get_key_ring().jwks()
+
+
+def jwks_etag(jwks: Dict[str, List[Dict[str, str]]]) -> str:
+    """Strong ETag of a key set; changes only when a key is added or removed."""
+    digest = hashlib.sha256(json.dumps(jwks, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+    return f'"{digest[:32]}"'
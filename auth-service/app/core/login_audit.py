@@ -1,12 +1,127 @@
-from typing import Optional
-from sqlalchemy.orm import Session
+"""Write-behind audit of login attempts.
+
+Login attempts are buffered in memory and written in batches (one multi-row
+``INSERT`` per flush) by a background task, every ``flush_interval_seconds``
+or as soon as ``batch_size`` rows are waiting. The login path never waits on
+an audit write. The buffer is bounded by ``max_buffer``: past that, new rows
+are dropped and counted in ``auth_login_audit_dropped_total``. Whatever is
+still buffered is flushed on shutdown.
+
+``created_at`` is stamped when the attempt happens, not when the row is
+written, so batching does not skew the audit timeline.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
 from uuid import uuid4
+
+from app.core.auth_config import load_auth_config
+from app.core.database import engine
+from app.core.metrics import LOGIN_AUDIT_BUFFERED, LOGIN_AUDIT_DROPPED, LOGIN_AUDIT_WRITTEN
 from app.models.login_audit import LoginAudit
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
+
+def _insert_rows(rows: List[Dict]) -> None:
+    # executemany de um INSERT só → o SQLAlchemy agrupa em INSERT ... VALUES (...), (...)
+    with engine.begin() as conn:
+        conn.execute(LoginAudit.__table__.insert(), rows)
+
+
+class LoginAuditWriter:
+    def __init__(
+        self,
+        write_batch: Callable[[List[Dict]], None] = _insert_rows,
+        flush_interval_seconds: float = 1.0,
+        batch_size: int = 200,
+        max_buffer: int = 10000,
+    ):
+        self.write_batch = write_batch
+        self.flush_interval = flush_interval_seconds
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self._buffer: List[Dict] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    def record(self, row: Dict) -> None:
+        if len(self._buffer) >= self.max_buffer:
+            LOGIN_AUDIT_DROPPED.labels(reason="overflow").inc()
+            return
+        self._buffer.append(row)
+        LOGIN_AUDIT_BUFFERED.set(len(self._buffer))
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write everything buffered so far, ``batch_size`` rows per INSERT."""
+        lock = self._flush_lock or asyncio.Lock()
+        written = 0
+        async with lock:
+            while self._buffer:
+                batch = self._buffer[: self.batch_size]
+                del self._buffer[: len(batch)]
+                LOGIN_AUDIT_BUFFERED.set(len(self._buffer))
+                try:
+                    await asyncio.to_thread(self.write_batch, batch)
+                except Exception as e:
+                    logger.error("Erro ao gravar %d registros de auditoria de login: %s", len(batch), e)
+                    # devolve o lote ao buffer (respeitando o limite) e tenta no próximo ciclo
+                    room = self.max_buffer - len(self._buffer)
+                    kept = batch[:max(room, 0)]
+                    self._buffer[:0] = kept
+                    LOGIN_AUDIT_BUFFERED.set(len(self._buffer))
+                    if len(batch) > len(kept):
+                        LOGIN_AUDIT_DROPPED.labels(reason="write_error").inc(len(batch) - len(kept))
+                    break
+                written += len(batch)
+                LOGIN_AUDIT_WRITTEN.inc(len(batch))
+        return written
+
+
+def _build_login_audit_writer() -> LoginAuditWriter:
+    cfg = {"flush_interval_seconds": 1.0, "batch_size": 200, "max_buffer": 10000}
+    cfg.update(load_auth_config().get("auth", {}).get("login_audit", {}) or {})
+    return LoginAuditWriter(
+        flush_interval_seconds=float(cfg["flush_interval_seconds"]),
+        batch_size=int(cfg["batch_size"]),
+        max_buffer=int(cfg["max_buffer"]),
+    )
+
+
+login_audit_writer = _build_login_audit_writer()
+
 
 def log_login_attempt(
-    db: Session,
     email: str,
     success: bool,
     user: Optional[User] = None,
@@ -14,15 +129,13 @@ def log_login_attempt(
     user_agent: Optional[str] = None,
     failure_reason: Optional[str] = None
 ):
-    audit = LoginAudit(
-        id=str(uuid4()),
-        user_id=user.id if user else None,
-        email=email,
-        ip_address=ip_address,
-        user_agent=user_agent,
-        success=success,
-        failure_reason=failure_reason
-    )
-    db.add(audit)
-    db.commit()
-
+    login_audit_writer.record({
+        "id": str(uuid4()),
+        "user_id": user.id if user else None,
+        "email": email,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "success": success,
+        "failure_reason": failure_reason,
+        "created_at": datetime.now(timezone.utc),
+    })
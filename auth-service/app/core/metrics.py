@@ -1,4 +1,4 @@
-from prometheus_client import Counter
+from prometheus_client import Counter, Gauge, Histogram
 
 LOGIN_ATTEMPTS = Counter(
     "auth_login_attempts_total",
@@ -9,7 +9,7 @@ LOGIN_ATTEMPTS = Counter(
 TOKEN_REFRESHES = Counter(
     "auth_token_refreshes_total",
     "Total de renovações de token",
-    ["result"],  # success / expired / invalid
+    ["result"],  # success / expired / invalid / revoked
 )
 
 USER_REGISTRATIONS = Counter(
@@ -22,3 +22,47 @@ LOGOUTS = Counter(
     "auth_logouts_total",
     "Total de logouts",
 )
+
+PASSWORD_HASH_PENDING = Gauge(
+    "auth_password_hash_pending",
+    "Operações de hash/verificação de senha em execução ou na fila do pool",
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "auth_password_hash_duration_seconds",
+    "Duração (fila + execução) das operações de hash de senha",
+    ["operation"],  # hash / verify
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+PASSWORD_HASH_REJECTIONS = Counter(
+    "auth_password_hash_rejections_total",
+    "Operações de hash rejeitadas com 429 por pool saturado",
+    ["operation"],
+)
+
+PASSWORD_REHASHES = Counter(
+    "auth_password_rehashes_total",
+    "Senhas re-hasheadas no login (mudança de custo ou de algoritmo)",
+)
+
+LOGIN_AUDIT_BUFFERED = Gauge(
+    "auth_login_audit_buffered",
+    "Registros de auditoria de login aguardando gravação em lote",
+)
+
+LOGIN_AUDIT_WRITTEN = Counter(
+    "auth_login_audit_written_total",
+    "Registros de auditoria de login gravados no banco",
+)
+
+LOGIN_AUDIT_DROPPED = Counter(
+    "auth_login_audit_dropped_total",
+    "Registros de auditoria de login descartados por buffer cheio",
+    ["reason"],  # overflow / write_error
+)
+
+REFRESH_TOKENS_SWEPT = Counter(
+    "auth_refresh_tokens_swept_total",
+    "Refresh tokens expirados ou revogados removidos pela limpeza periódica",
+)
@@ -0,0 +1,151 @@
+"""Password hashing off the event loop, with admission control.
+
+bcrypt is CPU-bound for the whole work-factor duration, so calling it from an
+``async`` handler stalls every other request on the worker. Hashing and
+verification run in a bounded thread pool instead (bcrypt and argon2 release
+the GIL while hashing). When the pool plus its queue is full, new calls fail
+fast with 429 instead of queueing behind a login burst.
+
+Hashes carry their own parameters, so changing ``bcrypt_rounds`` or moving to
+``argon2id`` only affects new hashes; ``needs_rehash`` tells the login path
+when to transparently re-hash a password that was just verified.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from app.core.auth_config import load_auth_config
+from app.core.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_PENDING, PASSWORD_HASH_REJECTIONS
+
+try:  # argon2id é opcional (pip install argon2-cffi)
+    from argon2 import PasswordHasher as _Argon2Hasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # pragma: no cover - depende do ambiente
+    _Argon2Hasher = None
+
+logger = logging.getLogger(__name__)
+
+_BCRYPT_COST = re.compile(r"^\$2[aby]?\$(\d{2})\$")
+
+
+def _hashing_config() -> Dict:
+    cfg = {
+        "scheme": "bcrypt",
+        "bcrypt_rounds": 12,
+        "workers": os.cpu_count() or 2,
+        "max_queue": 32,
+        "retry_after_seconds": 1,
+    }
+    cfg.update(load_auth_config().get("auth", {}).get("password_hashing", {}) or {})
+    return cfg
+
+
+class PasswordHasher:
+    """Hash/verify in a bounded pool; sync methods are kept for scripts and tests."""
+
+    def __init__(
+        self,
+        scheme: str = "bcrypt",
+        bcrypt_rounds: int = 12,
+        workers: int = 2,
+        max_queue: int = 32,
+        retry_after_seconds: int = 1,
+    ):
+        if scheme not in ("bcrypt", "argon2id"):
+            raise RuntimeError(f"password_hashing.scheme inválido: {scheme}")
+        if scheme == "argon2id" and _Argon2Hasher is None:
+            raise RuntimeError("password_hashing.scheme=argon2id exige o pacote argon2-cffi")
+        self.scheme = scheme
+        self.bcrypt_rounds = bcrypt_rounds
+        self.workers = workers
+        self.max_pending = workers + max_queue
+        self.retry_after = retry_after_seconds
+        self.pending = 0
+        self._argon2 = _Argon2Hasher() if _Argon2Hasher is not None else None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # --- operações síncronas ---
+
+    def hash_sync(self, password: str) -> str:
+        if self.scheme == "argon2id":
+            return self._argon2.hash(password)
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.bcrypt_rounds)).decode("utf-8")
+
+    def verify_sync(self, password: str, hashed: str) -> bool:
+        if hashed.startswith("$argon2"):
+            if self._argon2 is None:
+                logger.error("Hash argon2 encontrado mas argon2-cffi não está instalado")
+                return False
+            try:
+                return self._argon2.verify(hashed, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        try:
+            return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+        except ValueError:
+            return False
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """True if ``hashed`` was produced with a different scheme or cost."""
+        if self.scheme == "argon2id":
+            return not hashed.startswith("$argon2id$") or self._argon2.check_needs_rehash(hashed)
+        match = _BCRYPT_COST.match(hashed)
+        return match is None or int(match.group(1)) != self.bcrypt_rounds
+
+    # --- pool ---
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwhash")
+        return self._executor
+
+    async def _run(self, operation: str, fn, *args):
+        if self.pending >= self.max_pending:
+            PASSWORD_HASH_REJECTIONS.labels(operation=operation).inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Authentication temporarily overloaded, retry later",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        self.pending += 1
+        PASSWORD_HASH_PENDING.set(self.pending)
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+        finally:
+            self.pending -= 1
+            PASSWORD_HASH_PENDING.set(self.pending)
+            PASSWORD_HASH_DURATION.labels(operation=operation).observe(time.perf_counter() - start)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.hash_sync, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run("verify", self.verify_sync, password, hashed)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _build_password_hasher() -> PasswordHasher:
+    cfg = _hashing_config()
+    return PasswordHasher(
+        scheme=cfg["scheme"],
+        bcrypt_rounds=int(cfg["bcrypt_rounds"]),
+        workers=int(cfg["workers"]),
+        max_queue=int(cfg["max_queue"]),
+        retry_after_seconds=int(cfg["retry_after_seconds"]),
+    )
+
+
+password_hasher = _build_password_hasher()
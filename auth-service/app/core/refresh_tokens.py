@@ -0,0 +1,152 @@
+"""Refresh-token housekeeping: Redis revocation list and expiry sweeper.
+
+Refresh tokens are stored only as their SHA-256 digest (``token_hash``).
+
+Revocation list: on logout the digest is also written to Redis
+(``auth:revoked_refresh:<digest>``) with a TTL equal to the token's remaining
+lifetime, so ``/refresh`` can reject a revoked token without touching
+Postgres. Optional: without ``REDIS_URL`` (or with Redis down) the database
+row stays the source of truth.
+
+Sweeper: every ``sweep_interval_seconds`` each worker deletes expired or
+revoked rows in chunks of ``sweep_batch_size``, one short transaction per
+chunk, so no sweep holds locks on a large part of the table. Chunks are
+picked with ``FOR UPDATE SKIP LOCKED``, so concurrent workers do not contend.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.auth_config import load_auth_config
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import REFRESH_TOKENS_SWEPT
+
+logger = logging.getLogger(__name__)
+
+_REVOKED_PREFIX = "auth:revoked_refresh:"
+
+_DELETE_CHUNK = text(
+    """
+    DELETE FROM refresh_tokens
+    WHERE id IN (
+        SELECT id FROM refresh_tokens
+        WHERE expires_at < now() OR is_revoked
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    """
+)
+
+
+def _refresh_tokens_config() -> dict:
+    cfg = {"sweep_interval_seconds": 300, "sweep_batch_size": 500}
+    cfg.update(load_auth_config().get("auth", {}).get("refresh_tokens", {}) or {})
+    return cfg
+
+
+class RevocationList:
+    def __init__(self, redis_url: str = ""):
+        self.redis_url = redis_url
+        self.redis_client = None
+
+    async def connect(self) -> None:
+        if not self.redis_url:
+            return
+        try:
+            import redis.asyncio as redis
+
+            self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
+            await self.redis_client.ping()
+            logger.info("Lista de revogação de refresh tokens no Redis: %s", self.redis_url)
+        except Exception as e:
+            logger.warning("Erro ao conectar ao Redis: %s. Revogação verificada só no banco.", e)
+            self.redis_client = None
+
+    async def close(self) -> None:
+        if self.redis_client:
+            await self.redis_client.aclose()
+            self.redis_client = None
+
+    async def revoke(self, token_hash: str, expires_at: datetime) -> None:
+        if not self.redis_client:
+            return
+        ttl = int((expires_at - datetime.now(expires_at.tzinfo)).total_seconds())
+        if ttl <= 0:
+            return
+        try:
+            await self.redis_client.set(f"{_REVOKED_PREFIX}{token_hash}", "1", ex=ttl)
+        except Exception as e:
+            logger.warning("Erro ao registrar revogação no Redis: %s", e)
+
+    async def is_revoked(self, token_hash: str) -> bool:
+        """True only when Redis knows the token is revoked; False means "ask the database"."""
+        if not self.redis_client:
+            return False
+        try:
+            return bool(await self.redis_client.exists(f"{_REVOKED_PREFIX}{token_hash}"))
+        except Exception as e:
+            logger.warning("Erro ao consultar revogação no Redis: %s", e)
+            return False
+
+
+def sweep_refresh_tokens(batch_size: int, max_chunks: Optional[int] = None) -> int:
+    """Delete expired/revoked refresh tokens, ``batch_size`` rows per transaction."""
+    deleted = 0
+    chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        with engine.begin() as conn:
+            count = conn.execute(_DELETE_CHUNK, {"batch_size": batch_size}).rowcount
+        chunks += 1
+        deleted += count
+        if count < batch_size:
+            break
+    return deleted
+
+
+class RefreshTokenSweeper:
+    def __init__(self, interval_seconds: float = 300, batch_size: int = 500):
+        self.interval = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                deleted = await asyncio.to_thread(sweep_refresh_tokens, self.batch_size)
+            except Exception as e:
+                logger.error("Erro na limpeza de refresh tokens: %s", e)
+                continue
+            if deleted:
+                REFRESH_TOKENS_SWEPT.inc(deleted)
+                logger.info("Refresh tokens expirados/revogados removidos: %d", deleted)
+
+
+def _build_sweeper() -> RefreshTokenSweeper:
+    cfg = _refresh_tokens_config()
+    return RefreshTokenSweeper(
+        interval_seconds=float(cfg["sweep_interval_seconds"]),
+        batch_size=int(cfg["sweep_batch_size"]),
+    )
+
+
+revocation_list = RevocationList(settings.REDIS_URL)
+refresh_token_sweeper = _build_sweeper()
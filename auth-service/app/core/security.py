@@ -1,25 +1,25 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-import bcrypt
+import hashlib
 import secrets
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.core.auth_config import load_auth_config
+from app.core.jwt_keys import ASYMMETRIC_ALGORITHMS, get_key_ring
+from app.core.password_hashing import password_hasher
 from app.core.database import get_db
 from app.models.user import User
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify plain password against bcrypt hash."""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    """Verify plain password against its hash (blocking; request handlers use password_hasher.verify)."""
+    return password_hasher.verify_sync(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Generate bcrypt hash for password."""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    """Hash a password with the configured scheme (blocking; request handlers use password_hasher.hash)."""
+    return password_hasher.hash_sync(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
@@ -36,6 +36,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     config = load_auth_config()
     auth_config = config.get("auth", {})
     algorithm = auth_config.get("algorithm", "HS256")
+    if algorithm in ASYMMETRIC_ALGORITHMS:
+        key = get_key_ring().active
+        return jwt.encode(to_encode, key.private_pem, algorithm=algorithm, headers={"kid": key.kid})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=algorithm)
     return encoded_jwt
 
@@ -43,13 +46,24 @@ def create_refresh_token() -> str:
     """Generate a refresh token."""
     return secrets.token_urlsafe(32)
 
+def hash_refresh_token(token: str) -> str:
+    """SHA-256 hex digest stored in place of the refresh token itself."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode and validate the JWT access token."""
     try:
         config = load_auth_config()
         auth_config = config.get("auth", {})
         algorithm = auth_config.get("algorithm", "HS256")
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[algorithm])
+        if algorithm in ASYMMETRIC_ALGORITHMS:
+            kid = jwt.get_unverified_header(token).get("kid")
+            public_pem = get_key_ring().public_pem(kid)
+            if public_pem is None:
+                return None
+            payload = jwt.decode(token, public_pem, algorithms=[algorithm])
+        else:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[algorithm])
         if payload.get("type") != "access":
             return None
         return payload
@@ -2,12 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
-from typing import Optional
+from typing import List, Optional
 from app.core.database import get_db
 from app.core.rate_limit import limiter, get_login_rate_limit, get_register_rate_limit
 from app.core.auth_config import load_auth_config
 from app.models.user import User
-from app.schemas.auth import UserCreate, UserResponse, RefreshTokenRequest, TokenResponse
+from app.schemas.auth import UserCreate, UserResponse, UserBatchRequest, RefreshTokenRequest, TokenResponse
 from app.core.security import get_current_user
 from app.core.config import settings
 from app.services import AuthService
@@ -21,7 +21,7 @@ async def register(
     user_data: UserCreate,
     db: Session = Depends(get_db)
 ):
-    return AuthService.register_user(db, user_data)
+    return await AuthService.register_user(db, user_data)
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -36,7 +36,7 @@ async def login(
     user_agent = request.headers.get("user-agent")
     email = form_data.username
     
-    token_response = AuthService.login_user(
+    token_response = await AuthService.login_user(
         db=db,
         email=email,
         password=form_data.password,
@@ -89,7 +89,7 @@ async def refresh_token(
             detail="Refresh token not provided"
         )
     
-    token_response = AuthService.refresh_access_token(db, RefreshTokenRequest(refresh_token=refresh_token_value))
+    token_response = await AuthService.refresh_access_token(db, RefreshTokenRequest(refresh_token=refresh_token_value))
     
     config = load_auth_config()
     auth_config = config.get("auth", {})
@@ -133,7 +133,7 @@ async def logout(
         refresh_token_value = token_data.refresh_token
     
     if refresh_token_value:
-        result = AuthService.logout_user(db, refresh_token_value, current_user.id)
+        result = await AuthService.logout_user(db, refresh_token_value, current_user.id)
     else:
         result = {"message": "Logged out successfully"}
     
@@ -162,3 +162,16 @@ async def get_user_by_id(
         )
     return AuthService.get_current_user_info(user)
 
+
+@router.post("/users/batch", response_model=List[UserResponse])
+async def get_users_by_ids(
+    batch: UserBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Resolve many users in one query; unknown IDs are simply absent from the result."""
+    ids = list(dict.fromkeys(batch.ids))
+    if not ids:
+        return []
+    users = db.query(User).filter(User.id.in_(ids)).all()
+    return [AuthService.get_current_user_info(user) for user in users]
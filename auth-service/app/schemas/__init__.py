@@ -3,6 +3,7 @@ from app.schemas.auth import (
     RefreshTokenRequest,
     UserCreate,
     UserResponse,
+    UserBatchRequest,
 )
 
 __all__ = [
@@ -10,5 +11,6 @@ __all__ = [
     "RefreshTokenRequest",
     "UserCreate",
     "UserResponse",
+    "UserBatchRequest",
 ]
 
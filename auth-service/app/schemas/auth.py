@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional
 from app.models.user import UserRole
 
 
@@ -25,3 +25,6 @@ class UserResponse(BaseModel):
     is_active: bool    
     model_config = {"from_attributes": True}
 
+
+class UserBatchRequest(BaseModel):
+    ids: List[str] = Field(..., max_length=500)
@@ -3,9 +3,11 @@ from uuid import uuid4
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.core.auth_config import load_auth_config
-from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token
+from app.core.security import create_access_token, create_refresh_token, hash_refresh_token
+from app.core.refresh_tokens import revocation_list
+from app.core.password_hashing import password_hasher
 from app.core.login_audit import log_login_attempt
-from app.core.metrics import LOGIN_ATTEMPTS, TOKEN_REFRESHES, USER_REGISTRATIONS, LOGOUTS
+from app.core.metrics import LOGIN_ATTEMPTS, TOKEN_REFRESHES, USER_REGISTRATIONS, LOGOUTS, PASSWORD_REHASHES
 from app.models.user import User, UserRole
 from app.models.refresh_token import RefreshToken
 from app.schemas.auth import UserCreate, UserResponse, RefreshTokenRequest, TokenResponse
@@ -14,7 +16,7 @@ from app.schemas.auth import UserCreate, UserResponse, RefreshTokenRequest, Toke
 class AuthService:
 
     @staticmethod
-    def register_user(db: Session, user_data: UserCreate) -> UserResponse:
+    async def register_user(db: Session, user_data: UserCreate) -> UserResponse:
         existing_user = db.query(User).filter(User.email == user_data.email).first()
         if existing_user:
             USER_REGISTRATIONS.labels(result="duplicate").inc()
@@ -27,7 +29,7 @@ class AuthService:
         user = User(
             id=str(uuid4()),
             email=user_data.email,
-            hashed_password=get_password_hash(user_data.password),
+            hashed_password=await password_hasher.hash(user_data.password),
             full_name=user_data.full_name,
             role=role_value,
         )
@@ -46,7 +48,7 @@ class AuthService:
         )
     
     @staticmethod
-    def login_user(
+    async def login_user(
         db: Session,
         email: str,
         password: str,
@@ -55,10 +57,9 @@ class AuthService:
     ) -> TokenResponse:
         user = db.query(User).filter(User.email == email).first()
         
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await password_hasher.verify(password, user.hashed_password):
             LOGIN_ATTEMPTS.labels(result="failure", failure_reason="invalid_credentials").inc()
             log_login_attempt(
-                db=db,
                 email=email,
                 success=False,
                 ip_address=ip_address,
@@ -74,7 +75,6 @@ class AuthService:
         if not user.is_active:
             LOGIN_ATTEMPTS.labels(result="failure", failure_reason="inactive_user").inc()
             log_login_attempt(
-                db=db,
                 email=email,
                 success=False,
                 user=user,
@@ -95,21 +95,26 @@ class AuthService:
             expires_delta=access_token_expires
         )
         
+        if password_hasher.needs_rehash(user.hashed_password):
+            # custo ou algoritmo mudou: aproveita a senha em claro já verificada
+            user.hashed_password = await password_hasher.hash(password)
+            PASSWORD_REHASHES.inc()
+
         refresh_token_value = create_refresh_token()
         refresh_token_expires = datetime.now(timezone.utc) + timedelta(days=auth_config.get("refresh_token_expire_days", 7))
         
         refresh_token = RefreshToken(
             id=str(uuid4()),
             user_id=user.id,
-            token=refresh_token_value,
+            token_hash=hash_refresh_token(refresh_token_value),
             expires_at=refresh_token_expires,
             is_revoked=False
         )
+        # token + eventual re-hash numa única transação; a auditoria é write-behind
         db.add(refresh_token)
         db.commit()
         
         log_login_attempt(
-            db=db,
             email=email,
             success=True,
             user=user,
@@ -125,9 +130,17 @@ class AuthService:
         )
     
     @staticmethod
-    def refresh_access_token(db: Session, token_data: RefreshTokenRequest) -> TokenResponse:
+    async def refresh_access_token(db: Session, token_data: RefreshTokenRequest) -> TokenResponse:
+        token_hash = hash_refresh_token(token_data.refresh_token)
+        if await revocation_list.is_revoked(token_hash):
+            TOKEN_REFRESHES.labels(result="revoked").inc()
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token"
+            )
+
         refresh_token = db.query(RefreshToken).filter(
-            RefreshToken.token == token_data.refresh_token,
+            RefreshToken.token_hash == token_hash,
             RefreshToken.is_revoked == False
         ).first()
         
@@ -163,21 +176,22 @@ class AuthService:
         TOKEN_REFRESHES.labels(result="success").inc()
         return TokenResponse(
             access_token=access_token,
-            refresh_token=refresh_token.token,
+            refresh_token=token_data.refresh_token,
             token_type="bearer"
         )
     
     @staticmethod
-    def logout_user(db: Session, refresh_token: str, user_id: str) -> dict:
+    async def logout_user(db: Session, refresh_token: str, user_id: str) -> dict:
         LOGOUTS.inc()
         token = db.query(RefreshToken).filter(
-            RefreshToken.token == refresh_token,
+            RefreshToken.token_hash == hash_refresh_token(refresh_token),
             RefreshToken.user_id == user_id
         ).first()
         
         if token:
             token.is_revoked = True
             db.commit()
+            await revocation_list.revoke(token.token_hash, token.expires_at)
         
         return {"message": "Logged out successfully"}
     
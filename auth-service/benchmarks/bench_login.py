@@ -0,0 +1,99 @@
+"""Login throughput and /me latency under concurrent login load.
+
+Runs against a live auth-service (e.g. ``docker compose up auth-service``):
+
+    python benchmarks/bench_login.py --base-url http://localhost:8002 \\
+        --email ana@email.com --password 123 --logins 200 --concurrency 50
+
+Phases:
+
+1. ``/me`` latency with the service idle (baseline);
+2. ``--logins`` logins with ``--concurrency`` in flight while a probe keeps
+   calling ``/me``; reports logins/s, 429s and the probe's latency.
+
+With bcrypt on the event loop the probe's latency during phase 2 grows with
+the whole login backlog; with the hashing pool it stays close to baseline
+and excess logins come back as 429 instead of queueing.
+
+Raise ``auth.rate_limit.login_per_minute`` in ``config/auth.yaml`` before
+running, otherwise slowapi answers most logins with 429 before bcrypt runs.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+def _summary(samples: List[float]) -> str:
+    if not samples:
+        return "sem amostras"
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return (
+        f"n={len(samples)} p50={statistics.median(samples) * 1000:.1f}ms "
+        f"p95={p95 * 1000:.1f}ms max={samples[-1] * 1000:.1f}ms"
+    )
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> httpx.Response:
+    return await client.post("/api/auth/login", data={"username": email, "password": password})
+
+
+async def _probe_me(client: httpx.AsyncClient, token: str, stop: asyncio.Event, samples: List[float]) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/api/auth/me", headers=headers)
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.05)
+
+
+async def main(args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency + 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        resp = await _login(client, args.email, args.password)
+        resp.raise_for_status()
+        token = resp.json()["access_token"]
+
+        baseline: List[float] = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_me(client, token, stop, baseline))
+        await asyncio.sleep(2)
+        stop.set()
+        await probe
+        print(f"/me ocioso:          {_summary(baseline)}")
+
+        under_load: List[float] = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_me(client, token, stop, under_load))
+        semaphore = asyncio.Semaphore(args.concurrency)
+        statuses: List[int] = []
+
+        async def one_login() -> None:
+            async with semaphore:
+                statuses.append((await _login(client, args.email, args.password)).status_code)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+        ok = statuses.count(200)
+        print(f"logins:              {ok}/{args.logins} ok, {statuses.count(429)} x 429 em {elapsed:.2f}s "
+              f"({ok / elapsed:.1f} logins/s)")
+        print(f"/me durante logins:  {_summary(under_load)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8002")
+    parser.add_argument("--email", default="ana@email.com")
+    parser.add_argument("--password", default="123")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
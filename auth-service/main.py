@@ -1,4 +1,6 @@
-from fastapi import FastAPI
+import contextlib
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -8,12 +10,30 @@ from slowapi.middleware import SlowAPIMiddleware
 from app.routes import router
 from app.core.config import settings
 from app.core.rate_limit import limiter, rate_limit_handler
+from app.core.jwt_keys import get_jwks, jwks_etag
+from app.core.login_audit import login_audit_writer
+from app.core.password_hashing import password_hasher
+from app.core.refresh_tokens import refresh_token_sweeper, revocation_list
 from prometheus_fastapi_instrumentator import Instrumentator
 
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    await login_audit_writer.start()
+    await revocation_list.connect()
+    await refresh_token_sweeper.start()
+    yield
+    await refresh_token_sweeper.stop()
+    await revocation_list.close()
+    await login_audit_writer.stop()
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title="Orqestra Auth Service",
     description="Authentication and User Management API",
     version=settings.SERVICE_VERSION,
+    lifespan=lifespan,
 )
 
 app.state.limiter = limiter
@@ -36,6 +56,17 @@ Instrumentator(
     excluded_handlers=["/metrics", "/health", "/api/health"],
 ).instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
 
+@app.get("/.well-known/jwks.json", include_in_schema=False)
+async def jwks(request: Request, response: Response):
+    """Public keys for offline verification of access tokens."""
+    keys = get_jwks()
+    headers = {"Cache-Control": "public, max-age=300", "ETag": jwks_etag(keys)}
+    # revalidação condicional dos verificadores (api-gateway): 304 sem corpo
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return keys
+
 @app.get("/api/health")
 async def health_check():
     return {"status": "ok", "service": settings.SERVICE_NAME}
@@ -103,3 +103,200 @@ def test_register_rate_limit_enabled(mock_config):
 def test_register_rate_limit_disabled(mock_config):
     from app.core.rate_limit import get_register_rate_limit
     assert get_register_rate_limit() == "1000/hour"
+
+
+# ── JWT assimétrico (RS256 + JWKS) ────────────────────────────────────────
+
+RS256_CONFIG = {"auth": {"algorithm": "RS256", "access_token_expire_minutes": 30}}
+
+
+def _write_rsa_key(path):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+
+
+def test_rs256_tokens_carry_kid_and_verify_against_jwks(tmp_path):
+    from jose import jwt
+    from app.core import jwt_keys, security
+
+    _write_rsa_key(tmp_path / "2026-01.pem")
+    _write_rsa_key(tmp_path / "2026-02.pem")
+    ring = jwt_keys.KeyRing("RS256", str(tmp_path))
+    assert ring.active_kid == "2026-02"  # a mais recente assina
+
+    with patch("app.core.security.load_auth_config", return_value=RS256_CONFIG), \
+            patch("app.core.security.get_key_ring", return_value=ring):
+        token = security.create_access_token({"sub": "user@test.com"})
+        assert jwt.get_unverified_header(token)["kid"] == "2026-02"
+        assert security.decode_access_token(token)["sub"] == "user@test.com"
+
+    # verificação offline só com a chave pública publicada no JWKS
+    jwks = ring.jwks()
+    assert {k["kid"] for k in jwks["keys"]} == {"2026-01", "2026-02"}
+    public_jwk = next(k for k in jwks["keys"] if k["kid"] == "2026-02")
+    assert jwt.decode(token, public_jwk, algorithms=["RS256"])["sub"] == "user@test.com"
+
+
+def test_rs256_rejects_unknown_kid(tmp_path):
+    from jose import jwt
+    from app.core import jwt_keys, security
+
+    _write_rsa_key(tmp_path / "old.pem")
+    signer = jwt_keys.KeyRing("RS256", str(tmp_path))
+    token = jwt.encode(
+        {"sub": "a@b.com", "type": "access"}, signer.active.private_pem,
+        algorithm="RS256", headers={"kid": "retired"},
+    )
+    with patch("app.core.security.load_auth_config", return_value=RS256_CONFIG), \
+            patch("app.core.security.get_key_ring", return_value=signer):
+        assert security.decode_access_token(token) is None
+
+
+# ── Pool de hashing de senha ──────────────────────────────────────────────
+
+def test_needs_rehash_when_bcrypt_cost_changes():
+    from app.core.password_hashing import PasswordHasher
+    old = PasswordHasher(bcrypt_rounds=4)
+    new = PasswordHasher(bcrypt_rounds=5)
+    hashed = old.hash_sync("senha")
+    assert not old.needs_rehash(hashed)
+    assert new.needs_rehash(hashed)
+    assert new.verify_sync("senha", hashed)  # hash antigo continua válido
+
+
+def test_password_pool_rejects_with_429_when_saturated():
+    import asyncio
+    import threading
+    from fastapi import HTTPException
+    from app.core.password_hashing import PasswordHasher
+
+    hasher = PasswordHasher(bcrypt_rounds=4, workers=1, max_queue=1)
+    gate = threading.Event()
+    hasher.hash_sync = lambda password: gate.wait(5) and "hash"
+
+    async def run():
+        running = [asyncio.ensure_future(hasher.hash("a")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        try:
+            await hasher.hash("b")
+            raise AssertionError("esperava 429")
+        except HTTPException as e:
+            assert e.status_code == 429 and "Retry-After" in e.headers
+        gate.set()
+        assert await asyncio.gather(*running) == ["hash", "hash"]
+        assert hasher.pending == 0
+
+    asyncio.run(run())
+    hasher.shutdown()
+
+
+def test_login_rehashes_password_with_outdated_cost():
+    import asyncio
+    from unittest.mock import MagicMock
+    from app import services
+    from app.core.password_hashing import PasswordHasher
+
+    user = MagicMock(email="ana@email.com", id="u1", is_active=True)
+    user.hashed_password = PasswordHasher(bcrypt_rounds=4).hash_sync("123")
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = user
+
+    with patch.object(services, "password_hasher", PasswordHasher(bcrypt_rounds=5)), \
+            patch.object(services, "log_login_attempt"), \
+            patch.object(services, "create_access_token", return_value="jwt"):
+        asyncio.run(services.AuthService.login_user(db, "ana@email.com", "123"))
+
+    assert user.hashed_password.startswith("$2b$05$")
+    db.commit.assert_called()
+
+
+def test_login_audit_is_written_in_batches():
+    import asyncio
+    from app.core.login_audit import LoginAuditWriter
+
+    batches = []
+    writer = LoginAuditWriter(write_batch=batches.append, batch_size=3, max_buffer=5)
+    for i in range(7):
+        writer.record({"id": str(i)})
+
+    # buffer limitado: os dois últimos registros são descartados
+    assert asyncio.run(writer.flush()) == 5
+    assert [[row["id"] for row in batch] for batch in batches] == [["0", "1", "2"], ["3", "4"]]
+
+
+def test_login_audit_keeps_rows_when_write_fails():
+    import asyncio
+    from app.core.login_audit import LoginAuditWriter
+
+    def failing(rows):
+        raise RuntimeError("db down")
+
+    writer = LoginAuditWriter(write_batch=failing, batch_size=10)
+    writer.record({"id": "1"})
+    assert asyncio.run(writer.flush()) == 0
+
+    written = []
+    writer.write_batch = written.append
+    assert asyncio.run(writer.flush()) == 1
+    assert written == [[{"id": "1"}]]
+
+
+def test_refresh_token_is_stored_as_sha256_digest():
+    import asyncio
+    import hashlib
+    from unittest.mock import AsyncMock, MagicMock
+    from app import services
+
+    user = MagicMock(email="ana@email.com", id="u1", is_active=True)
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = user
+
+    with patch.object(services.password_hasher, "verify", AsyncMock(return_value=True)), \
+            patch.object(services.password_hasher, "needs_rehash", return_value=False), \
+            patch.object(services, "log_login_attempt"), \
+            patch.object(services, "create_access_token", return_value="jwt"):
+        token = asyncio.run(services.AuthService.login_user(db, "ana@email.com", "123"))
+
+    row = db.add.call_args[0][0]
+    assert row.token_hash == hashlib.sha256(token.refresh_token.encode()).hexdigest()
+    assert len(row.token_hash) == 64
+
+
+def test_refresh_rejects_token_revoked_in_redis_without_db():
+    import asyncio
+    import pytest
+    from unittest.mock import AsyncMock, MagicMock
+    from fastapi import HTTPException
+    from app import services
+    from app.schemas.auth import RefreshTokenRequest
+
+    db = MagicMock()
+    with patch.object(services.revocation_list, "is_revoked", AsyncMock(return_value=True)):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(services.AuthService.refresh_access_token(db, RefreshTokenRequest(refresh_token="t")))
+
+    assert exc.value.status_code == 401
+    db.query.assert_not_called()
+
+
+def test_jwks_endpoint_answers_304_to_matching_etag():
+    from fastapi.testclient import TestClient
+    import main
+
+    jwks = {"keys": [{"kid": "k1", "kty": "RSA", "n": "abc", "e": "AQAB"}]}
+    with patch("main.get_jwks", return_value=jwks):
+        client = TestClient(main.app)
+        first = client.get("/.well-known/jwks.json")
+        etag = first.headers["etag"]
+        assert first.json() == jwks
+        again = client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+        assert again.status_code == 304 and again.headers["etag"] == etag
+
+    rotated = {"keys": jwks["keys"] + [{"kid": "k2", "kty": "RSA", "n": "def", "e": "AQAB"}]}
+    with patch("main.get_jwks", return_value=rotated):
+        changed = client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["etag"] != etag
@@ -0,0 +1,34 @@
+"""Indexes for keyset pagination and filtering of the campaign list
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_campaigns_created_date_id', 'campaigns', ['created_date', 'id'], unique=False)
+    op.create_index('ix_campaigns_status_created_date_id', 'campaigns', ['status', 'created_date', 'id'], unique=False)
+    op.create_index('ix_campaigns_created_by_created_date_id', 'campaigns', ['created_by', 'created_date', 'id'], unique=False)
+    op.create_index(
+        'ix_campaigns_communication_channels',
+        'campaigns',
+        ['communication_channels'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campaigns_communication_channels', table_name='campaigns')
+    op.drop_index('ix_campaigns_created_by_created_date_id', table_name='campaigns')
+    op.drop_index('ix_campaigns_status_created_date_id', table_name='campaigns')
+    op.drop_index('ix_campaigns_created_date_id', table_name='campaigns')
@@ -0,0 +1,39 @@
+"""Partial indexes for the my-tasks inbox
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_campaigns_inbox_drafts',
+        'campaigns',
+        ['created_by', 'created_date'],
+        unique=False,
+        postgresql_where=sa.text("status = 'DRAFT'"),
+    )
+    op.create_index(
+        'ix_campaigns_inbox_open',
+        'campaigns',
+        ['status', 'created_date'],
+        unique=False,
+        postgresql_where=sa.text(
+            "status IN ('CREATIVE_STAGE', 'CONTENT_REVIEW', 'CONTENT_ADJUSTMENT', 'CAMPAIGN_BUILDING')"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campaigns_inbox_open', table_name='campaigns')
+    op.drop_index('ix_campaigns_inbox_drafts', table_name='campaigns')
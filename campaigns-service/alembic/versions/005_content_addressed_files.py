@@ -0,0 +1,50 @@
+"""Content-addressed creative piece files
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'file_blobs',
+        sa.Column('digest', sa.String(64), primary_key=True),
+        sa.Column('file_key', sa.String(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.create_index(op.f('ix_file_blobs_last_used_at'), 'file_blobs', ['last_used_at'], unique=False)
+
+    op.create_table(
+        'creative_piece_files',
+        sa.Column('piece_id', sa.String(), sa.ForeignKey('creative_pieces.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('slot', sa.String(), primary_key=True),
+        sa.Column('digest', sa.String(64), sa.ForeignKey('file_blobs.digest'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.create_index(op.f('ix_creative_piece_files_digest'), 'creative_piece_files', ['digest'], unique=False)
+
+    # Arquivos já enviados mantêm as chaves antigas (campaigns/...) e não entram na coleta
+    op.add_column('creative_pieces', sa.Column('file_digests', sa.Text(), nullable=True))
+    op.add_column('creative_pieces', sa.Column('html_file_digest', sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('creative_pieces', 'html_file_digest')
+    op.drop_column('creative_pieces', 'file_digests')
+    op.drop_index(op.f('ix_creative_piece_files_digest'), table_name='creative_piece_files')
+    op.drop_table('creative_piece_files')
+    op.drop_index(op.f('ix_file_blobs_last_used_at'), table_name='file_blobs')
+    op.drop_table('file_blobs')
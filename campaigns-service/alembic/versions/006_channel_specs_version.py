@@ -0,0 +1,53 @@
+"""Channel specs version counter and change notification
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'channel_specs_version',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.execute("INSERT INTO channel_specs_version (id, version) VALUES (1, 1)")
+
+    # Qualquer escrita em channel_specs (app, SQL manual ou migration) incrementa
+    # a versão e avisa os caches do MCP server; o NOTIFY só sai no commit.
+    op.execute("""
+        CREATE FUNCTION bump_channel_specs_version() RETURNS trigger AS $$
+        DECLARE
+            new_version BIGINT;
+        BEGIN
+            UPDATE channel_specs_version
+               SET version = version + 1, updated_at = now()
+             WHERE id = 1
+            RETURNING version INTO new_version;
+            PERFORM pg_notify('channel_specs_changed', new_version::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER channel_specs_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON channel_specs
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_channel_specs_version()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS channel_specs_changed ON channel_specs")
+    op.execute("DROP FUNCTION IF EXISTS bump_channel_specs_version()")
+    op.drop_table('channel_specs_version')
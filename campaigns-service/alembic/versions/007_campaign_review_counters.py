@@ -0,0 +1,59 @@
+"""Denormalized piece review counters on campaigns
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = (
+    'review_total',
+    'review_approved',
+    'review_rejected',
+    'review_pending',
+    'review_ia_passed',
+    'review_ia_failed',
+)
+
+
+def upgrade() -> None:
+    for col in COUNTER_COLUMNS:
+        op.add_column('campaigns', sa.Column(col, sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill com as mesmas regras de app/services/review_counters.py
+    op.execute("""
+        UPDATE campaigns c
+           SET review_total = s.total,
+               review_approved = s.approved,
+               review_rejected = s.rejected,
+               review_pending = s.total - s.approved - s.rejected,
+               review_ia_passed = s.ia_passed,
+               review_ia_failed = s.ia_failed
+          FROM (
+            SELECT campaign_id,
+                   count(*) AS total,
+                   count(*) FILTER (WHERE
+                       human_verdict = 'approved'
+                    OR (ia_verdict = 'approved' AND human_verdict NOT IN ('rejected', 'manually_rejected'))
+                   ) AS approved,
+                   count(*) FILTER (WHERE human_verdict IN ('rejected', 'manually_rejected')) AS rejected,
+                   count(*) FILTER (WHERE ia_verdict = 'approved') AS ia_passed,
+                   count(*) FILTER (WHERE ia_verdict = 'rejected') AS ia_failed
+              FROM piece_review
+             GROUP BY campaign_id
+          ) s
+         WHERE c.id = s.campaign_id
+    """)
+
+
+def downgrade() -> None:
+    for col in reversed(COUNTER_COLUMNS):
+        op.drop_column('campaigns', col)
@@ -0,0 +1,44 @@
+"""Transactional outbox for campaign events
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE outbox_events_publish_seq")
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('campaign_id', sa.String(), nullable=False),
+        sa.Column('event_type', sa.String(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('seq', sa.BigInteger(), nullable=True),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(op.f('ix_outbox_events_campaign_id'), 'outbox_events', ['campaign_id'], unique=False)
+    op.create_index('ix_outbox_events_seq', 'outbox_events', ['seq'], unique=True)
+    op.create_index(
+        'ix_outbox_events_unpublished', 'outbox_events', ['id'],
+        unique=False, postgresql_where=sa.text('published_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_events_unpublished', table_name='outbox_events')
+    op.drop_index('ix_outbox_events_seq', table_name='outbox_events')
+    op.drop_index(op.f('ix_outbox_events_campaign_id'), table_name='outbox_events')
+    op.drop_table('outbox_events')
+    op.execute("DROP SEQUENCE outbox_events_publish_seq")
@@ -1,25 +1,133 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
 import httpx
-from typing import Optional, Dict
+
 from app.core.config import settings
+from app.core.metrics import AUTH_USER_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# limite de UserBatchRequest.ids no auth-service
+USER_BATCH_MAX_IDS = 500
+
+
+class UserCache:
+    """In-process LRU of auth-service users with a per-entry TTL."""
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = 300, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    def get(self, user_id: str) -> Optional[Dict]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at <= self._clock():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return user
+
+    def set(self, user_id: str, user: Dict) -> None:
+        self._entries[user_id] = (self._clock() + self.ttl, user)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
 
 
 class AuthServiceClient:
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None, cache: Optional[UserCache] = None):
         self.base_url = base_url or settings.AUTH_SERVICE_URL
         self.timeout = 10.0
-    
+        self.cache = cache or UserCache(
+            max_size=settings.AUTH_USER_CACHE_MAX_SIZE,
+            ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        # cliente único (pool de conexões keep-alive), criado sob demanda
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_users(self, user_ids: Iterable[Optional[str]], token: str) -> Dict[str, Dict]:
+        """Resolve users by ID: cache first, then batch calls for the misses.
+
+        IDs are deduplicated and misses are sent in chunks of at most
+        ``USER_BATCH_MAX_IDS``, concurrently. Users auth-service does not know
+        (or whose chunk failed) are simply absent from the result.
+        """
+        ids = [uid for uid in dict.fromkeys(user_ids) if uid]
+        found: Dict[str, Dict] = {}
+        missing = []
+        for uid in ids:
+            user = self.cache.get(uid)
+            if user is None:
+                missing.append(uid)
+            else:
+                found[uid] = user
+        if found:
+            AUTH_USER_LOOKUPS.labels(result="hit").inc(len(found))
+        if not missing or not token:
+            return found
+
+        AUTH_USER_LOOKUPS.labels(result="miss").inc(len(missing))
+        chunks = await asyncio.gather(*(
+            self._fetch_users(missing[i:i + USER_BATCH_MAX_IDS], token)
+            for i in range(0, len(missing), USER_BATCH_MAX_IDS)
+        ))
+        for users in chunks:
+            for user in users:
+                uid = user.get("id")
+                if uid:
+                    self.cache.set(uid, user)
+                    found[uid] = user
+        return found
+
+    async def _fetch_users(self, user_ids: List[str], token: str) -> List[Dict]:
+        try:
+            response = await self._http().post(
+                "/api/auth/users/batch",
+                json={"ids": user_ids},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            if response.status_code != 200:
+                logger.warning("Busca de usuários no auth-service retornou %s", response.status_code)
+                return []
+            return response.json()
+        except Exception as e:
+            logger.warning("Erro ao buscar usuários no auth-service: %s", e)
+            return []
+
     async def get_user_by_id(self, user_id: str, token: str) -> Optional[Dict]:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/api/auth/users/{user_id}",
-                    headers={"Authorization": f"Bearer {token}"}
-                )
-                if response.status_code == 200:
-                    return response.json()
-                return None
-            except Exception:
-                return None
+        return (await self.get_users([user_id], token)).get(user_id)
 
-auth_client = AuthServiceClient()
 
+def display_name(user: Optional[Dict], default: Optional[str] = None) -> Optional[str]:
+    """``full_name`` or ``email`` of a resolved user, else ``default``."""
+    if not user:
+        return default
+    return user.get("full_name") or user.get("email") or default
+
+
+auth_client = AuthServiceClient()
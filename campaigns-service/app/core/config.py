@@ -5,13 +5,38 @@ from typing import List
 class Settings(BaseSettings):
 
     DATABASE_URL: str = ""
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
     AUTH_SERVICE_URL: str = "http://auth-service:8002"
+    AUTH_USER_CACHE_TTL_SECONDS: float = 300
+    AUTH_USER_CACHE_MAX_SIZE: int = 5000
     AWS_ACCESS_KEY_ID: str = ""
     AWS_SECRET_ACCESS_KEY: str = ""
     AWS_REGION: str = "us-east-1"
     S3_ENDPOINT_URL: str = "http://localstack:4566"
     S3_PUBLIC_URL: str = "http://localhost:4566"
     S3_BUCKET_NAME: str = "orqestra-creative-pieces"
+    S3_PRESIGN_EXPIRY_SECONDS: int = 300
+    S3_PRESIGN_ENDPOINT_URL: str = ""  # vazio → S3_PUBLIC_URL
+    S3_MULTIPART_THRESHOLD_MB: int = 8
+    S3_MULTIPART_CHUNKSIZE_MB: int = 8
+    S3_UPLOAD_MAX_CONCURRENCY: int = 4
+    UPLOAD_MAX_MB: int = 10
+    BLOB_GC_INTERVAL_SECONDS: float = 3600  # 0 desliga a coleta
+    BLOB_GC_GRACE_SECONDS: float = 3600
+    BLOB_GC_BATCH_SIZE: int = 500
+    CHANNEL_SPECS_POLL_SECONDS: float = 30  # rede de segurança do LISTEN/NOTIFY; 0 desliga
+    REDIS_URL: str = ""  # vazio → broker de eventos em memória (um worker só)
+    EVENTS_STREAM_KEY: str = "campaigns:events"
+    EVENTS_STREAM_MAXLEN: int = 10000
+    OUTBOX_RELAY_INTERVAL_SECONDS: float = 0.5  # 0 desliga o relay
+    OUTBOX_RELAY_BATCH_SIZE: int = 200
+    OUTBOX_RETENTION_HOURS: float = 24  # eventos publicados ficam para replay (Last-Event-ID)
+    SSE_HEARTBEAT_SECONDS: float = 15
+    SSE_REPLAY_LIMIT: int = 1000
+    SSE_SUBSCRIBER_QUEUE_SIZE: int = 256
     ENVIRONMENT: str = "development"
     SERVICE_NAME: str = "campaigns-service"
     SERVICE_VERSION: str = "1.0.0"
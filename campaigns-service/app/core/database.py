@@ -1,22 +1,62 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+"""Async database access (SQLAlchemy ``AsyncEngine`` over asyncpg).
+
+Handlers and MCP tools share one async pool per worker, sized by the
+``DB_POOL_*`` settings. ``DATABASE_URL`` keeps the plain ``postgresql://``
+form used by Alembic (sync, psycopg2); the async driver is selected here.
+"""
+
+import contextlib
+import time
+from typing import AsyncIterator
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKOUT_TIMEOUTS, DB_POOL_CHECKOUT_WAIT, DB_POOL_CONNECTIONS
+
+
+def async_database_url(url: str) -> str:
+    """Point a ``postgresql://`` / ``postgresql+psycopg2://`` URL at asyncpg."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
 
-engine = create_engine(
-    settings.DATABASE_URL,
+
+engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+DB_POOL_CONNECTIONS.labels(state="in_use").set_function(lambda: engine.pool.checkedout())
+DB_POOL_CONNECTIONS.labels(state="idle").set_function(lambda: engine.pool.checkedin())
+
+
+@contextlib.asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """Session with its connection already checked out; the wait is measured."""
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        try:
+            await db.connection()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
         yield db
-    finally:
-        db.close()
 
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with session_scope() as db:
+        yield db
@@ -0,0 +1,126 @@
+"""Broker for campaign change events published by the outbox relay.
+
+Events are appended to one ordered stream, keyed by the relay's publish
+sequence (``seq``), and read back by every worker's ``EventHub``. With
+``REDIS_URL`` the stream is a Redis Stream (``EVENTS_STREAM_KEY``, capped
+at about ``EVENTS_STREAM_MAXLEN`` entries) whose entry ids are ``<seq>-0``.
+Publishing the same ``seq`` twice is therefore a no-op. Without Redis, or
+with Redis down at startup, the stream lives in process memory. That is
+enough for a single worker and for tests, but events then only reach SSE
+clients connected to the worker that relayed them.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+StreamEntry = Tuple[int, Dict[str, Any]]
+
+
+class InMemoryStream:
+    def __init__(self, maxlen: int = 10000):
+        self._entries: deque = deque(maxlen=maxlen)
+        self._changed = asyncio.Condition()
+
+    async def publish(self, seq: int, event: Dict[str, Any]) -> None:
+        async with self._changed:
+            if self._entries and seq <= self._entries[-1][0]:
+                return
+            self._entries.append((seq, event))
+            self._changed.notify_all()
+
+    async def read(self, after: int, timeout: float) -> List[StreamEntry]:
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: self._entries and self._entries[-1][0] > after),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                return []
+            return [entry for entry in self._entries if entry[0] > after]
+
+    async def last_seq(self) -> int:
+        return self._entries[-1][0] if self._entries else 0
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisStream:
+    def __init__(self, client, key: str, maxlen: int):
+        self.client = client
+        self.key = key
+        self.maxlen = maxlen
+
+    async def publish(self, seq: int, event: Dict[str, Any]) -> None:
+        from redis.exceptions import ResponseError
+
+        try:
+            await self.client.xadd(
+                self.key, {"data": json.dumps(event)}, id=f"{seq}-0", maxlen=self.maxlen, approximate=True
+            )
+        except ResponseError as e:
+            # id menor ou igual ao último: já publicado (retentativa do relay)
+            if "equal or smaller" not in str(e):
+                raise
+
+    async def read(self, after: int, timeout: float) -> List[StreamEntry]:
+        response = await self.client.xread({self.key: f"{after}-0"}, count=500, block=int(timeout * 1000))
+        entries = []
+        for _key, messages in response or []:
+            for entry_id, fields in messages:
+                entries.append((int(entry_id.split("-", 1)[0]), json.loads(fields["data"])))
+        return entries
+
+    async def last_seq(self) -> int:
+        last = await self.client.xrevrange(self.key, count=1)
+        return int(last[0][0].split("-", 1)[0]) if last else 0
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class EventBroker:
+    def __init__(self, redis_url: str = "", stream_key: str = "campaigns:events", maxlen: int = 10000):
+        self.redis_url = redis_url
+        self.stream_key = stream_key
+        self.maxlen = maxlen
+        self.stream = InMemoryStream(maxlen)
+
+    async def connect(self) -> None:
+        if not self.redis_url:
+            logger.info("REDIS_URL vazio: eventos de campanha em memória (um worker só)")
+            return
+        try:
+            import redis.asyncio as redis
+
+            client = redis.from_url(self.redis_url, decode_responses=True)
+            await client.ping()
+            self.stream = RedisStream(client, self.stream_key, self.maxlen)
+            logger.info("Eventos de campanha no Redis Stream %s", self.stream_key)
+        except Exception as e:
+            logger.warning("Erro ao conectar ao Redis: %s. Eventos de campanha em memória.", e)
+
+    async def close(self) -> None:
+        await self.stream.close()
+        self.stream = InMemoryStream(self.maxlen)
+
+    async def publish(self, seq: int, event: Dict[str, Any]) -> None:
+        await self.stream.publish(seq, event)
+
+    async def read(self, after: int, timeout: float) -> List[StreamEntry]:
+        """Entries with ``seq > after``, waiting up to ``timeout`` seconds for the first one."""
+        return await self.stream.read(after, timeout)
+
+    async def last_seq(self) -> int:
+        return await self.stream.last_seq()
+
+
+event_broker = EventBroker(settings.REDIS_URL, settings.EVENTS_STREAM_KEY, settings.EVENTS_STREAM_MAXLEN)
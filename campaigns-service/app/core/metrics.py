@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 CAMPAIGN_OPERATIONS = Counter(
     "campaigns_operations_total",
@@ -27,7 +27,7 @@ REVIEW_VERDICTS = Counter(
 S3_UPLOADS = Counter(
     "campaigns_s3_uploads_total",
     "Total de uploads para S3",
-    ["status"],  # success / error
+    ["status"],  # success / error / deduplicated
 )
 
 S3_UPLOAD_DURATION = Histogram(
@@ -41,3 +41,70 @@ MCP_TOOL_CALLS = Counter(
     "Total de chamadas a ferramentas MCP",
     ["tool_name"],
 )
+
+AUTH_USER_LOOKUPS = Counter(
+    "campaigns_auth_user_lookups_total",
+    "Resoluções de usuários do auth-service pelo cache local",
+    ["result"],  # hit / miss
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "campaigns_db_pool_checkout_wait_seconds",
+    "Espera para obter uma conexão do pool do banco",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "campaigns_db_pool_checkout_timeouts_total",
+    "Requisições que esgotaram DB_POOL_TIMEOUT esperando conexão",
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "campaigns_db_pool_connections",
+    "Conexões do pool do banco por estado",
+    ["state"],  # in_use / idle
+)
+
+FILE_BLOBS_COLLECTED = Counter(
+    "campaigns_file_blobs_collected_total",
+    "Arquivos de peças sem referência removidos do S3 pela coleta",
+)
+
+CHANNEL_SPEC_CACHE_RELOADS = Counter(
+    "campaigns_channel_spec_cache_reloads_total",
+    "Recargas do cache de specs de canal",
+    ["reason"],  # startup / notify / poll / lazy
+)
+
+CHANNEL_SPEC_VERSION = Gauge(
+    "campaigns_channel_spec_version",
+    "Versão das specs de canal carregada no cache",
+)
+
+OUTBOX_EVENTS_PUBLISHED = Counter(
+    "campaigns_outbox_events_published_total",
+    "Eventos do outbox publicados no broker",
+    ["event_type"],
+)
+
+OUTBOX_PUBLISH_LAG = Histogram(
+    "campaigns_outbox_publish_lag_seconds",
+    "Tempo entre o commit do evento no outbox e a publicação no broker",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+SSE_SUBSCRIBERS = Gauge(
+    "campaigns_sse_subscribers",
+    "Conexões SSE abertas em /campaigns/events/stream",
+)
+
+SSE_EVENTS_SENT = Counter(
+    "campaigns_sse_events_sent_total",
+    "Eventos enviados aos clientes SSE",
+    ["source"],  # live / replay
+)
+
+SSE_SUBSCRIBERS_DROPPED = Counter(
+    "campaigns_sse_subscribers_dropped_total",
+    "Clientes SSE desconectados por fila cheia (reconectam com Last-Event-ID)",
+)
@@ -1,5 +1,8 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from typing import BinaryIO, List, Optional
 from app.core.config import settings
 import logging
 
@@ -13,7 +16,31 @@ s3_client = boto3.client(
     region_name=settings.AWS_REGION
 )
 
+# URLs pré-assinadas são assinadas já com o host público: a assinatura SigV4
+# cobre o host, então reescrever localstack:4566 depois de assinar a invalidaria
+_presign_client = boto3.client(
+    's3',
+    endpoint_url=settings.S3_PRESIGN_ENDPOINT_URL or settings.S3_PUBLIC_URL or settings.S3_ENDPOINT_URL or None,
+    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+    region_name=settings.AWS_REGION,
+    config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+)
+
+_MB = 1024 * 1024
+
+_transfer_config = TransferConfig(
+    multipart_threshold=settings.S3_MULTIPART_THRESHOLD_MB * _MB,
+    multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE_MB * _MB,
+    max_concurrency=settings.S3_UPLOAD_MAX_CONCURRENCY,
+)
+
+# Resultado do head_bucket feito no startup; operações seguintes não repetem a checagem
+_bucket_ready = False
+
+
 def ensure_bucket_exists():
+    global _bucket_ready
     try:
         s3_client.head_bucket(Bucket=settings.S3_BUCKET_NAME)
         logger.info(f"bucket {settings.S3_BUCKET_NAME} already exists")
@@ -29,23 +56,56 @@ def ensure_bucket_exists():
         else:
             logger.error(f"error checking bucket: {e}")
             raise
+    _bucket_ready = True
 
 
-def upload_file(file_content: bytes, file_key: str, content_type: str) -> str:
-    ensure_bucket_exists()
-    
+def _require_bucket() -> None:
+    """Check the bucket only if startup could not (or it disappeared since)."""
+    if not _bucket_ready:
+        ensure_bucket_exists()
+
+
+def _forget_bucket_if_missing(error: ClientError) -> None:
+    # LocalStack reiniciado perde o bucket: a próxima operação volta a criá-lo
+    global _bucket_ready
+    if error.response.get('Error', {}).get('Code') == 'NoSuchBucket':
+        _bucket_ready = False
+
+
+def public_file_url(file_key: str) -> str:
+    return f"{settings.S3_PUBLIC_URL}/{settings.S3_BUCKET_NAME}/{file_key}"
+
+
+def object_exists(file_key: str) -> bool:
+    _require_bucket()
     try:
-        s3_client.put_object(
-            Bucket=settings.S3_BUCKET_NAME,
-            Key=file_key,
-            Body=file_content,
-            ContentType=content_type
+        s3_client.head_object(Bucket=settings.S3_BUCKET_NAME, Key=file_key)
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+            return False
+        logger.error("failed to head file %s: %s", file_key, e)
+        raise Exception(f"Failed to get file from S3: {e}") from e
+
+
+def upload_fileobj(fileobj: BinaryIO, file_key: str, content_type: str) -> str:
+    """Stream a file object to S3 (multipart above the configured threshold)."""
+    _require_bucket()
+
+    try:
+        s3_client.upload_fileobj(
+            fileobj,
+            settings.S3_BUCKET_NAME,
+            file_key,
+            ExtraArgs={"ContentType": content_type},
+            Config=_transfer_config,
         )
-        
-        file_url = f"{settings.S3_PUBLIC_URL}/{settings.S3_BUCKET_NAME}/{file_key}"
+
+        file_url = public_file_url(file_key)
         logger.info(f"file uploaded successfully: {file_url}")
         return file_url
     except ClientError as e:
+        _forget_bucket_if_missing(e)
         logger.error(f"failed to upload file: {e}")
         raise Exception(f"Failed to upload file to S3: {str(e)}")
 
@@ -67,19 +127,62 @@ def delete_file(file_key: str) -> None:
         raise Exception(f"Failed to delete file from S3: {error_msg}")
 
 
+def delete_files(file_keys: List[str]) -> None:
+    """Delete many objects, up to 1000 per request."""
+    for i in range(0, len(file_keys), 1000):
+        chunk = file_keys[i:i + 1000]
+        try:
+            resp = s3_client.delete_objects(
+                Bucket=settings.S3_BUCKET_NAME,
+                Delete={"Objects": [{"Key": key} for key in chunk], "Quiet": True},
+            )
+        except ClientError as e:
+            logger.error("failed to delete %d files: %s", len(chunk), e)
+            raise Exception(f"Failed to delete files from S3: {e}") from e
+        errors = resp.get("Errors") or []
+        if errors:
+            raise Exception(f"Failed to delete {len(errors)} files from S3: {errors[0].get('Message')}")
+
+
 def get_file(file_key: str) -> tuple[bytes, str]:
     """Download file from S3. Returns (body, content_type)."""
-    ensure_bucket_exists()
+    _require_bucket()
     try:
         resp = s3_client.get_object(Bucket=settings.S3_BUCKET_NAME, Key=file_key)
         body = resp["Body"].read()
         content_type = resp.get("ContentType") or "application/octet-stream"
         return body, content_type
     except ClientError as e:
+        _forget_bucket_if_missing(e)
         logger.error("failed to get file %s: %s", file_key, e)
         raise Exception(f"Failed to get file from S3: {e}") from e
 
 
+def presign_file(file_key: str, expires_in: Optional[int] = None) -> dict:
+    """Short-lived presigned GET URL plus object metadata (HEAD only, body not read).
+
+    Returns ``url``, ``expires_in``, ``content_type``, ``content_length`` and ``etag``.
+    """
+    expires_in = expires_in or settings.S3_PRESIGN_EXPIRY_SECONDS
+    try:
+        head = s3_client.head_object(Bucket=settings.S3_BUCKET_NAME, Key=file_key)
+    except ClientError as e:
+        logger.error("failed to head file %s: %s", file_key, e)
+        raise Exception(f"Failed to get file from S3: {e}") from e
+    url = _presign_client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": settings.S3_BUCKET_NAME, "Key": file_key},
+        ExpiresIn=expires_in,
+    )
+    return {
+        "url": url,
+        "expires_in": expires_in,
+        "content_type": head.get("ContentType") or "application/octet-stream",
+        "content_length": head.get("ContentLength"),
+        "etag": head.get("ETag"),
+    }
+
+
 def normalize_file_url(url: str) -> str:
     if not url:
         return url
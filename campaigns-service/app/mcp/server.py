@@ -1,18 +1,20 @@
+import asyncio
 import base64
 import logging
 from typing import Any, Dict, Optional
 
 from mcp.server.fastmcp import FastMCP
+from sqlalchemy import select
 from mcp.server.transport_security import TransportSecuritySettings
 from starlette.applications import Starlette
 from starlette.routing import Mount
 
 from app.core.config import settings
-from app.core.database import SessionLocal
-from app.core.s3_client import get_file
+from app.core.database import session_scope
+from app.core.s3_client import get_file, presign_file
 from app.core.metrics import MCP_TOOL_CALLS
 from app.models.creative_piece import CreativePiece
-from app.models.channel_spec import ChannelSpec
+from app.services.channel_spec_cache import channel_spec_cache
 from app.services.file_upload import extract_file_key_from_url, get_app_file_urls_dict
 
 logger = logging.getLogger(__name__)
@@ -34,29 +36,35 @@ async def retrieve_piece_content(
     campaign_id: str,
     piece_id: str,
     commercial_space: Optional[str] = None,
+    delivery: str = "inline",
 ) -> Dict[str, Any]:
     """
     Busca o conteúdo de uma peça criativa (E-mail ou App).
 
     - E-mail: retorna HTML (contentType text/html, content como string).
     - App: requer commercial_space; retorna imagem em base64 (content como data URL).
+    - delivery="url": em vez do conteúdo, retorna url (GET pré-assinado, válido
+      por expiresIn segundos), contentLength e etag.
+    - digest: SHA-256 do arquivo (null para arquivos anteriores ao armazenamento
+      por conteúdo), estável entre peças e campanhas — serve de chave de cache.
 
     Args:
         campaign_id: ID da campanha.
         piece_id: ID da peça (CreativePiece).
         commercial_space: Obrigatório para peças App.
+        delivery: "inline" (padrão) ou "url".
     """
     MCP_TOOL_CALLS.labels(tool_name="retrieve_piece_content").inc()
-    db = SessionLocal()
+    if delivery not in ("inline", "url"):
+        return {"error": "delivery must be 'inline' or 'url'"}
     try:
-        piece = (
-            db.query(CreativePiece)
-            .filter(
-                CreativePiece.campaign_id == campaign_id,
-                CreativePiece.id == piece_id,
-            )
-            .first()
-        )
+        async with session_scope() as db:
+            piece = (await db.execute(
+                select(CreativePiece).where(
+                    CreativePiece.campaign_id == campaign_id,
+                    CreativePiece.id == piece_id,
+                )
+            )).scalars().first()
 
         if not piece:
             return {"error": f"Piece {piece_id} not found in campaign {campaign_id}"}
@@ -67,12 +75,14 @@ async def retrieve_piece_content(
             file_key = extract_file_key_from_url(piece.html_file_url, settings.S3_BUCKET_NAME)
             if not file_key:
                 return {"error": "Invalid HTML file URL"}
-            body, content_type = get_file(file_key)
+            if delivery == "url":
+                return await _presigned_content(file_key, piece.html_file_digest)
+            body, content_type = await asyncio.to_thread(get_file, file_key)
             try:
                 html = body.decode("utf-8")
             except UnicodeDecodeError:
                 html = body.decode("latin-1")
-            return {"contentType": content_type, "content": html}
+            return {"contentType": content_type, "content": html, "digest": piece.html_file_digest}
 
         if piece.piece_type == "App":
             if not commercial_space:
@@ -84,23 +94,25 @@ async def retrieve_piece_content(
             file_key = extract_file_key_from_url(file_url, settings.S3_BUCKET_NAME)
             if not file_key:
                 return {"error": "Invalid file URL"}
-            body, content_type = get_file(file_key)
+            digest = get_app_file_urls_dict(piece.file_digests).get(commercial_space)
+            if delivery == "url":
+                return await _presigned_content(file_key, digest)
+            body, content_type = await asyncio.to_thread(get_file, file_key)
             b64 = base64.b64encode(body).decode("ascii")
             data_url = f"data:{content_type};base64,{b64}"
-            return {"contentType": content_type, "content": data_url}
+            return {"contentType": content_type, "content": data_url, "digest": digest}
 
         return {"error": f"Download not supported for piece type: {piece.piece_type}"}
     except Exception as e:
         logger.exception("retrieve_piece_content error: %s", e)
         return {"error": str(e)}
-    finally:
-        db.close()
 
 
 @mcp.tool()
 async def get_channel_specs(
     channel: str,
     commercial_space: Optional[str] = None,
+    if_none_match: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Retorna as especificações técnicas de um canal e espaço comercial.
@@ -108,9 +120,14 @@ async def get_channel_specs(
     Inclui limites de caracteres, peso de arquivo e dimensões de imagem.
     Para APP com commercial_space, retorna specs específicos do espaço.
 
+    Servido de um cache em memória (versionado e invalidado por NOTIFY quando
+    channel_specs muda): não consulta o banco.
+
     Args:
         channel: Canal (SMS, PUSH, EMAIL ou APP).
         commercial_space: Espaço comercial (opcional, usado para APP).
+        if_none_match: etag de uma resposta anterior; se as specs não mudaram,
+            retorna só {"notModified": true, "version", "etag"}.
 
     Returns:
         Dict com specs por field_name. Exemplo:
@@ -131,7 +148,9 @@ async def get_channel_specs(
                     "min_width": 300, "min_height": 300,
                     "max_width": 4096, "max_height": 4096
                 }
-            }
+            },
+            "version": 3,
+            "etag": "\"5f2c...\""
         }
     """
     MCP_TOOL_CALLS.labels(tool_name="get_channel_specs").inc()
@@ -139,63 +158,37 @@ async def get_channel_specs(
     if channel_upper == "E-MAIL":
         channel_upper = "EMAIL"
 
-    db = SessionLocal()
     try:
-        generic_rows = (
-            db.query(ChannelSpec)
-            .filter(
-                ChannelSpec.channel == channel_upper,
-                ChannelSpec.commercial_space.is_(None),
-                ChannelSpec.active.is_(True),
-            )
-            .all()
-        )
-
-        generic_specs = {}
-        for row in generic_rows:
-            generic_specs[row.field_name] = _row_to_dict(row)
+        snapshot = await channel_spec_cache.get()
+        if if_none_match and if_none_match == snapshot.etag:
+            return {"notModified": True, "version": snapshot.version, "etag": snapshot.etag}
 
         # Specs do espaço comercial (se informado)
-        space_specs = {}
-        if commercial_space:
-            space_rows = (
-                db.query(ChannelSpec)
-                .filter(
-                    ChannelSpec.channel == channel_upper,
-                    ChannelSpec.commercial_space == commercial_space,
-                    ChannelSpec.active.is_(True),
-                )
-                .all()
-            )
-            for row in space_rows:
-                space_specs[row.field_name] = _row_to_dict(row)
+        generic_specs, space_specs = snapshot.lookup(channel_upper, commercial_space)
 
         return {
             "channel": channel_upper,
             "commercial_space": commercial_space,
             "specs": space_specs if space_specs else generic_specs,
             "generic_specs": generic_specs,
+            "version": snapshot.version,
+            "etag": snapshot.etag,
         }
     except Exception as e:
         logger.exception("get_channel_specs error: %s", e)
         return {"error": str(e), "channel": channel_upper, "specs": {}, "generic_specs": {}}
-    finally:
-        db.close()
-
-
-def _row_to_dict(row: ChannelSpec) -> Dict[str, Any]:
-    """Converte um ChannelSpec row para dict (somente campos com valor)."""
-    result: Dict[str, Any] = {}
-    for attr in (
-        "min_chars", "max_chars", "warn_chars",
-        "max_weight_kb",
-        "min_width", "min_height", "max_width", "max_height",
-        "expected_width", "expected_height", "tolerance_pct",
-    ):
-        val = getattr(row, attr, None)
-        if val is not None:
-            result[attr] = val
-    return result
+
+
+async def _presigned_content(file_key: str, digest: Optional[str]) -> Dict[str, Any]:
+    meta = await asyncio.to_thread(presign_file, file_key)
+    return {
+        "contentType": meta["content_type"],
+        "url": meta["url"],
+        "expiresIn": meta["expires_in"],
+        "contentLength": meta["content_length"],
+        "etag": meta["etag"],
+        "digest": digest,
+    }
 
 
 def build_mcp_app() -> Starlette:
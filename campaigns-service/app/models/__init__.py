@@ -1,10 +1,12 @@
 from app.models.campaign import Campaign, CampaignStatus, CampaignCategory, RequestingArea, CampaignPriority, CommunicationChannel, CommercialSpace, CommunicationTone, ExecutionModel, TriggerEvent
 from app.models.comment import Comment
 from app.models.creative_piece import CreativePiece, CreativePieceType
+from app.models.file_blob import FileBlob, CreativePieceFile
 from app.models.piece_review import PieceReview, HumanVerdict, IaVerdict
 from app.models.piece_review_event import PieceReviewEvent, PieceReviewEventType
 from app.models.campaign_status_event import CampaignStatusEvent
-from app.models.channel_spec import ChannelSpec
+from app.models.channel_spec import ChannelSpec, ChannelSpecVersion
+from app.models.outbox_event import OutboxEvent
 from app.models.user_role import UserRole
 
 __all__ = [
@@ -21,6 +23,8 @@ __all__ = [
     "Comment",
     "CreativePiece",
     "CreativePieceType",
+    "FileBlob",
+    "CreativePieceFile",
     "PieceReview",
     "HumanVerdict",
     "IaVerdict",
@@ -28,6 +32,8 @@ __all__ = [
     "PieceReviewEventType",
     "CampaignStatusEvent",
     "ChannelSpec",
+    "ChannelSpecVersion",
+    "OutboxEvent",
     "UserRole",
 ]
 
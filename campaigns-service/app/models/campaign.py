@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, DateTime, Integer, Enum as SQLEnum, ARRAY, ForeignKey, Date, Numeric, TypeDecorator
+from sqlalchemy import Column, String, DateTime, Integer, Enum as SQLEnum, ARRAY, ForeignKey, Date, Numeric, TypeDecorator, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import enum
 from decimal import Decimal
 from typing import Type, TypeVar
@@ -125,5 +125,35 @@ class Campaign(Base):
     status = Column(EnumValueType(CampaignStatus), default=CampaignStatus.DRAFT, nullable=False)
     created_by = Column(String, nullable=False)
     created_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Resumo de piece_review mantido nas escritas de revisão (app/services/review_counters.py)
+    review_total = Column(Integer, default=0, server_default="0", nullable=False)
+    review_approved = Column(Integer, default=0, server_default="0", nullable=False)
+    review_rejected = Column(Integer, default=0, server_default="0", nullable=False)
+    review_pending = Column(Integer, default=0, server_default="0", nullable=False)
+    review_ia_passed = Column(Integer, default=0, server_default="0", nullable=False)
+    review_ia_failed = Column(Integer, default=0, server_default="0", nullable=False)
     comments = relationship("Comment", back_populates="campaign", cascade="all, delete-orphan")
     creative_pieces = relationship("CreativePiece", back_populates="campaign", cascade="all, delete-orphan")
+
+    # Paginação keyset em (created_date, id) e filtros da listagem
+    __table_args__ = (
+        Index("ix_campaigns_created_date_id", "created_date", "id"),
+        Index("ix_campaigns_status_created_date_id", "status", "created_date", "id"),
+        Index("ix_campaigns_created_by_created_date_id", "created_by", "created_date", "id"),
+        Index("ix_campaigns_communication_channels", "communication_channels", postgresql_using="gin"),
+        # Caixa de tarefas (my-tasks): índices parciais só com as linhas que viram tarefa
+        Index(
+            "ix_campaigns_inbox_drafts",
+            "created_by",
+            "created_date",
+            postgresql_where=text("status = 'DRAFT'"),
+        ),
+        Index(
+            "ix_campaigns_inbox_open",
+            "status",
+            "created_date",
+            postgresql_where=text(
+                "status IN ('CREATIVE_STAGE', 'CONTENT_REVIEW', 'CONTENT_ADJUSTMENT', 'CAMPAIGN_BUILDING')"
+            ),
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime
+from sqlalchemy import BigInteger, Column, String, Integer, Float, Boolean, DateTime
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -34,3 +34,13 @@ class ChannelSpec(Base):
     active = Column(Boolean, nullable=False, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class ChannelSpecVersion(Base):
+    """Contador (linha única, id=1) incrementado por trigger a cada mudança em channel_specs."""
+
+    __tablename__ = "channel_specs_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -23,6 +23,8 @@ class CreativePiece(Base):
     body = Column(Text, nullable=True) 
     file_urls = Column(Text, nullable=True)  
     html_file_url = Column(String, nullable=True)  
+    file_digests = Column(Text, nullable=True)  # JSON espaço comercial → sha256 (App)
+    html_file_digest = Column(String(64), nullable=True)
     ia_verdict = Column(String, nullable=True)
     ia_analysis_text = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
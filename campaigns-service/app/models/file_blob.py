@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, String
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class FileBlob(Base):
+    """One S3 object per distinct file content, stored under ``sha256/<digest>.<ext>``."""
+    __tablename__ = "file_blobs"
+
+    digest = Column(String(64), primary_key=True)
+    file_key = Column(String, nullable=False)
+    content_type = Column(String, nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+
+class CreativePieceFile(Base):
+    """Reference from a piece slot (commercial space for App, "" for E-mail) to a blob."""
+    __tablename__ = "creative_piece_files"
+
+    piece_id = Column(String, ForeignKey("creative_pieces.id", ondelete="CASCADE"), primary_key=True)
+    slot = Column(String, primary_key=True)
+    digest = Column(String(64), ForeignKey("file_blobs.digest"), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,30 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Sequence, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# Ordem de publicação (id do evento no SSE/stream); atribuída pelo relay, não no insert
+OUTBOX_PUBLISH_SEQ = Sequence("outbox_events_publish_seq", metadata=Base.metadata)
+
+
+class OutboxEvent(Base):
+    """Campaign change written in the same transaction as the status/review event it mirrors.
+
+    ``seq`` stays null until the relay publishes the row; it then gives the
+    delivery order, which is also the event id clients resume from.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    campaign_id = Column(String, nullable=False, index=True)
+    event_type = Column(String, nullable=False)  # campaign.status_changed | piece_review.changed
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    seq = Column(BigInteger, nullable=True)
+    published_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_events_seq", "seq", unique=True),
+        # fila do relay: só as linhas ainda não publicadas
+        Index("ix_outbox_events_unpublished", "id", postgresql_where=text("published_at IS NULL")),
+    )
@@ -1,7 +1,12 @@
+import asyncio
 import base64
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Response
-from sqlalchemy.orm import Session
-from typing import Dict, Optional
+import hashlib
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import Dict, List, Optional
 from uuid import uuid4
 import json
 import logging
@@ -21,6 +26,8 @@ from app.schemas.campaign import (
     MyTasksResponse,
     PieceContentResponse,
     PieceReviewHistoryResponse,
+    BulkReviewPiecesRequest,
+    BulkReviewPiecesResponse,
     ReviewPieceRequest,
     SubmitForReviewRequest,
     UpdateIaVerdictRequest,
@@ -39,7 +46,9 @@ from app.services.file_upload import (
     get_app_file_urls_dict,
     download_file_from_url,
 )
-from app.core.s3_client import normalize_file_url, delete_file, get_file
+from app.core.s3_client import normalize_file_url, delete_file, get_file, presign_file
+from app.services.file_blobs import EMAIL_SLOT, attach_blob, detach_blob, is_blob_key
+from app.services.event_stream import event_hub, parse_last_event_id, stream_events
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -65,9 +74,9 @@ def _require_campaign_status_for_creative_work(campaign: Campaign) -> None:
         )
 
 
-def _get_campaign_or_404(db: Session, campaign_id: str) -> Campaign:
+async def _get_campaign_or_404(db: AsyncSession, campaign_id: str) -> Campaign:
     """Get campaign by ID or raise 404."""
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
+    campaign = await db.get(Campaign, campaign_id)
     if not campaign:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -86,6 +95,8 @@ def normalize_creative_piece_response(piece) -> dict:
         "body": piece.body,
         "iaVerdict": piece.ia_verdict,
         "iaAnalysisText": piece.ia_analysis_text,
+        "fileDigests": piece.file_digests,
+        "htmlFileDigest": piece.html_file_digest,
         "createdAt": piece.created_at,
         "updatedAt": piece.updated_at,
     }
@@ -110,28 +121,86 @@ def normalize_creative_piece_response(piece) -> dict:
 
 @router.get("", response_model=CampaignsResponse)
 async def get_campaigns(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="nextCursor da página anterior"),
+    status_filter: Optional[List[CampaignStatus]] = Query(None, alias="status"),
+    category: Optional[str] = None,
+    channel: Optional[str] = None,
+    created_by: Optional[str] = Query(None, alias="createdBy"),
+    created_from: Optional[date] = Query(None, alias="createdFrom"),
+    created_to: Optional[date] = Query(None, alias="createdTo"),
+    fields: Optional[str] = Query(None, description="Coleções a incluir: comments,creativePieces,pieceReviews"),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
     auth_token: str = Depends(get_token_from_cookie_or_header),
 ):
-    return await CampaignService.get_campaigns(db, current_user, auth_token, skip, limit)
+    return await CampaignService.get_campaigns(
+        db,
+        current_user,
+        auth_token,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        statuses=status_filter,
+        category=category,
+        channel=channel,
+        created_by=created_by,
+        created_from=created_from,
+        created_to=created_to,
+        fields=fields,
+    )
 
 
 @router.get("/my-tasks", response_model=MyTasksResponse)
 async def get_my_tasks(
-    db: Session = Depends(get_db),
+    request: Request,
+    limit: int = Query(50, ge=1, le=200, description="Tarefas por grupo (count traz o total)"),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
-    """Get personalized task list for the current user based on their role."""
-    return await CampaignService.get_my_tasks(db, current_user)
+    """Get personalized task list for the current user based on their role.
+
+    Carries an ``ETag``; a poll with a matching ``If-None-Match`` gets 304.
+    """
+    result = await CampaignService.get_my_tasks(db, current_user, limit)
+    body = MyTasksResponse.model_validate(result).model_dump_json(by_alias=True).encode("utf-8")
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/events/stream")
+async def stream_campaign_events(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    last_event_id_query: Optional[str] = Query(None, alias="lastEventId"),
+    current_user: Dict = Depends(get_current_user),
+):
+    """Server-Sent Events with status and piece review changes of campaigns the user can see.
+
+    Reconnecting with ``Last-Event-ID`` (or ``?lastEventId=``) replays what was
+    missed; ``event: reset`` means the gap was too large and state should be refetched.
+    """
+    # sem Depends(get_db): a conexão do pool não fica presa durante o stream
+    return StreamingResponse(
+        stream_events(
+            event_hub,
+            current_user,
+            parse_last_event_id(last_event_id or last_event_id_query),
+            settings.SSE_HEARTBEAT_SECONDS,
+            settings.SSE_REPLAY_LIMIT,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{campaign_id}", response_model=CampaignResponse)
 async def get_campaign(
     campaign_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
     auth_token: str = Depends(get_token_from_cookie_or_header),
 ):
@@ -141,7 +210,7 @@ async def get_campaign(
 @router.post("", response_model=CampaignResponse, status_code=status.HTTP_201_CREATED)
 async def create_campaign(
     campaign_data: CampaignCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
     auth_token: str = Depends(get_token_from_cookie_or_header),
 ):
@@ -153,7 +222,7 @@ async def create_campaign(
 async def update_campaign(
     campaign_id: str,
     campaign_data: CampaignUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
     auth_token: str = Depends(get_token_from_cookie_or_header),
 ):
@@ -163,10 +232,10 @@ async def update_campaign(
 @router.delete("/{campaign_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_campaign(
     campaign_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
-    CampaignService.delete_campaign(db, campaign_id, current_user)
+    await CampaignService.delete_campaign(db, campaign_id, current_user)
     return None
 
 
@@ -174,23 +243,23 @@ async def delete_campaign(
 async def add_comment(
     campaign_id: str,
     comment_data: CommentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
-    return CampaignService.add_comment(db, campaign_id, comment_data, current_user)
+    return await CampaignService.add_comment(db, campaign_id, comment_data, current_user)
 
 
 @router.post("/{campaign_id}/submit-for-review", response_model=CampaignResponse)
 async def submit_for_review(
     campaign_id: str,
     body: SubmitForReviewRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
     auth_token: str = Depends(get_token_from_cookie_or_header),
 ):
     """Creation analyst submits campaign for review. Sends IA verdict snapshot per piece and transitions to CONTENT_REVIEW."""
     _require_creative_analyst(current_user)
-    _get_campaign_or_404(db, campaign_id)
+    await _get_campaign_or_404(db, campaign_id)
     return await CampaignService.submit_for_review(db, campaign_id, body, current_user, auth_token)
 
 
@@ -198,39 +267,51 @@ async def submit_for_review(
 async def review_piece(
     campaign_id: str,
     body: ReviewPieceRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
     auth_token: str = Depends(get_token_from_cookie_or_header),
 ):
     """Marketing manager approves/rejects a piece (or manually rejects an IA-approved piece)."""
     require_marketing_manager(current_user)
-    _get_campaign_or_404(db, campaign_id)
+    await _get_campaign_or_404(db, campaign_id)
     return await CampaignService.review_piece(db, campaign_id, body, current_user, auth_token)
 
 
+@router.post("/{campaign_id}/pieces/reviews:bulk", response_model=BulkReviewPiecesResponse)
+async def bulk_review_pieces(
+    campaign_id: str,
+    body: BulkReviewPiecesRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Dict = Depends(get_current_user),
+):
+    """Marketing manager approves/rejects many pieces at once (all decisions or none)."""
+    require_marketing_manager(current_user)
+    return await CampaignService.bulk_review_pieces(db, campaign_id, body, current_user)
+
+
 @router.patch("/{campaign_id}/piece-reviews/ia-verdict", response_model=CampaignResponse)
 async def update_ia_verdict(
     campaign_id: str,
     body: UpdateIaVerdictRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
     auth_token: str = Depends(get_token_from_cookie_or_header),
 ):
     """Marketing manager updates IA verdict for a piece that was submitted without AI validation."""
     require_marketing_manager(current_user)
-    _get_campaign_or_404(db, campaign_id)
+    await _get_campaign_or_404(db, campaign_id)
     return await CampaignService.update_ia_verdict(db, campaign_id, body, current_user, auth_token)
 
 
 @router.get("/{campaign_id}/piece-review-history", response_model=PieceReviewHistoryResponse)
 async def get_piece_review_history(
     campaign_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
     auth_token: str = Depends(get_token_from_cookie_or_header),
 ):
     """Get the full history of piece review events for a campaign (timeline)."""
-    _get_campaign_or_404(db, campaign_id)
+    await _get_campaign_or_404(db, campaign_id)
     events = await CampaignService.get_piece_review_history(db, campaign_id, auth_token)
     return PieceReviewHistoryResponse(events=events)
 
@@ -238,12 +319,12 @@ async def get_piece_review_history(
 @router.get("/{campaign_id}/status-history", response_model=CampaignStatusHistoryResponse)
 async def get_status_history(
     campaign_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
     auth_token: str = Depends(get_token_from_cookie_or_header),
 ):
     """Get the full history of status transitions for a campaign (horizontal timeline)."""
-    campaign = _get_campaign_or_404(db, campaign_id)
+    campaign = await _get_campaign_or_404(db, campaign_id)
     events = await CampaignService.get_status_history(db, campaign_id, auth_token)
     return CampaignStatusHistoryResponse(events=events, currentStatus=campaign.status)
 
@@ -252,13 +333,13 @@ async def get_status_history(
 async def submit_creative_piece(
     campaign_id: str,
     piece_data: CreativePieceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
     _require_creative_analyst(current_user)
-    campaign = _get_campaign_or_404(db, campaign_id)
+    campaign = await _get_campaign_or_404(db, campaign_id)
     _require_campaign_status_for_creative_work(campaign)
-    return CampaignService.submit_creative_piece(db, campaign_id, piece_data, current_user)
+    return await CampaignService.submit_creative_piece(db, campaign_id, piece_data, current_user)
 
 
 @router.patch("/{campaign_id}/creative-pieces/{piece_id}/ia-analysis", response_model=CreativePieceResponse)
@@ -266,16 +347,14 @@ async def update_piece_ia_analysis(
     campaign_id: str,
     piece_id: str,
     body: UpdatePieceIaAnalysisRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
     """Persist IA analysis result on a creative piece (used after validation for Email/App)."""
-    _get_campaign_or_404(db, campaign_id)
-    piece = (
-        db.query(CreativePiece)
-        .filter(CreativePiece.campaign_id == campaign_id, CreativePiece.id == piece_id)
-        .first()
-    )
+    await _get_campaign_or_404(db, campaign_id)
+    piece = (await db.execute(
+        select(CreativePiece).where(CreativePiece.campaign_id == campaign_id, CreativePiece.id == piece_id)
+    )).scalars().first()
     if not piece:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Creative piece not found")
     ia = (body.ia_verdict or "").lower()
@@ -283,8 +362,8 @@ async def update_piece_ia_analysis(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="iaVerdict must be 'approved' or 'rejected'")
     piece.ia_verdict = ia
     piece.ia_analysis_text = body.ia_analysis_text
-    db.commit()
-    db.refresh(piece)
+    await db.commit()
+    await db.refresh(piece)
     return CreativePieceResponse.model_validate(normalize_creative_piece_response(piece))
 
 
@@ -293,21 +372,19 @@ async def upload_app_creative_piece(
     campaign_id: str,
     commercial_space: str = Form(...),
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
     _require_creative_analyst(current_user)
-    campaign = _get_campaign_or_404(db, campaign_id)
+    campaign = await _get_campaign_or_404(db, campaign_id)
     _require_campaign_status_for_creative_work(campaign)
     
-    existing_piece = (
-        db.query(CreativePiece)
-        .filter(
+    existing_piece = (await db.execute(
+        select(CreativePiece).where(
             CreativePiece.campaign_id == campaign_id,
             CreativePiece.piece_type == "App"
         )
-        .first()
-    )
+    )).scalars().first()
     
     if existing_piece and existing_piece.file_urls:
         try:
@@ -315,7 +392,8 @@ async def upload_app_creative_piece(
             if commercial_space in current_file_urls:
                 old_file_url = current_file_urls[commercial_space]
                 file_key = extract_file_key_from_url(old_file_url, settings.S3_BUCKET_NAME)
-                if file_key:
+                # arquivos por conteúdo são compartilhados: a referência trocada abaixo libera o antigo
+                if file_key and not is_blob_key(file_key):
                     try:
                         delete_file(file_key)
                     except Exception as e:
@@ -323,16 +401,20 @@ async def upload_app_creative_piece(
         except (json.JSONDecodeError, Exception) as e:
             logger.warning(f"error processing old file urls: {e}")
     
-    file_url = await upload_app_file(campaign, commercial_space, file, db)
+    file_url, digest = await upload_app_file(campaign, commercial_space, file, db)
     current_file_urls = existing_piece.file_urls if existing_piece else None
     updated_file_urls = update_app_file_urls(current_file_urls, commercial_space, file_url)
+    current_digests = existing_piece.file_digests if existing_piece else None
+    updated_digests = update_app_file_urls(current_digests, commercial_space, digest)
     
     if existing_piece:
         existing_piece.file_urls = updated_file_urls
+        existing_piece.file_digests = updated_digests
         existing_piece.ia_verdict = None
         existing_piece.ia_analysis_text = None
-        db.commit()
-        db.refresh(existing_piece)
+        await attach_blob(db, existing_piece.id, commercial_space, digest)
+        await db.commit()
+        await db.refresh(existing_piece)
         return CreativePieceResponse.model_validate(normalize_creative_piece_response(existing_piece))
     else:
         creative_piece = CreativePiece(
@@ -340,10 +422,13 @@ async def upload_app_creative_piece(
             campaign_id=campaign_id,
             piece_type="App",
             file_urls=updated_file_urls,
+            file_digests=updated_digests,
         )
         db.add(creative_piece)
-        db.commit()
-        db.refresh(creative_piece)
+        await db.flush()
+        await attach_blob(db, creative_piece.id, commercial_space, digest)
+        await db.commit()
+        await db.refresh(creative_piece)
         return CreativePieceResponse.model_validate(normalize_creative_piece_response(creative_piece))
 
 
@@ -351,38 +436,38 @@ async def upload_app_creative_piece(
 async def upload_email_creative_piece(
     campaign_id: str,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
     _require_creative_analyst(current_user)
-    campaign = _get_campaign_or_404(db, campaign_id)
+    campaign = await _get_campaign_or_404(db, campaign_id)
     _require_campaign_status_for_creative_work(campaign)
     
-    existing_piece = (
-        db.query(CreativePiece)
-        .filter(
+    existing_piece = (await db.execute(
+        select(CreativePiece).where(
             CreativePiece.campaign_id == campaign_id,
             CreativePiece.piece_type == "E-mail"
         )
-        .first()
-    )
+    )).scalars().first()
     
     if existing_piece and existing_piece.html_file_url:
         try:
             file_key = extract_file_key_from_url(existing_piece.html_file_url, settings.S3_BUCKET_NAME)
-            if file_key:
+            if file_key and not is_blob_key(file_key):
                 delete_file(file_key)
         except Exception as e:
             logger.warning(f"failed to delete old file: {e}")
     
-    file_url = await upload_email_file(campaign, file, db)
+    file_url, digest = await upload_email_file(campaign, file, db)
     
     if existing_piece:
         existing_piece.html_file_url = file_url
+        existing_piece.html_file_digest = digest
         existing_piece.ia_verdict = None
         existing_piece.ia_analysis_text = None
-        db.commit()
-        db.refresh(existing_piece)
+        await attach_blob(db, existing_piece.id, EMAIL_SLOT, digest)
+        await db.commit()
+        await db.refresh(existing_piece)
         return CreativePieceResponse.model_validate(normalize_creative_piece_response(existing_piece))
     else:
         creative_piece = CreativePiece(
@@ -390,36 +475,59 @@ async def upload_email_creative_piece(
             campaign_id=campaign_id,
             piece_type="E-mail",
             html_file_url=file_url,
+            html_file_digest=digest,
         )
         db.add(creative_piece)
-        db.commit()
-        db.refresh(creative_piece)
+        await db.flush()
+        await attach_blob(db, creative_piece.id, EMAIL_SLOT, digest)
+        await db.commit()
+        await db.refresh(creative_piece)
         return CreativePieceResponse.model_validate(normalize_creative_piece_response(creative_piece))
 
 
+async def _presigned_piece_content(file_key: str, digest: Optional[str]) -> PieceContentResponse:
+    """Presigned URL + metadata instead of the bytes (``delivery=url``)."""
+    try:
+        meta = await asyncio.to_thread(presign_file, file_key)
+    except Exception as e:
+        logger.exception("download piece content: presign failed for %s: %s", file_key, e)
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Failed to fetch file from storage") from e
+    return PieceContentResponse(
+        content_type=meta["content_type"],
+        url=meta["url"],
+        expires_in=meta["expires_in"],
+        content_length=meta["content_length"],
+        etag=meta["etag"],
+        digest=digest,
+    )
+
+
 @router.get(
     "/{campaign_id}/creative-pieces/{piece_id}/content",
     response_model=PieceContentResponse,
+    response_model_exclude_none=True,
     summary="Download piece content",
-    description="Returns HTML (JSON-safe string) or image (base64 data URL). For App pieces, use ?commercial_space=.",
+    description=(
+        "Returns HTML (JSON-safe string) or image (base64 data URL). For App pieces, use ?commercial_space=. "
+        "With ?delivery=url, returns a short-lived presigned GET URL plus contentLength/etag instead of the bytes."
+    ),
 )
 async def download_piece_content(
     campaign_id: str,
     piece_id: str,
     commercial_space: Optional[str] = Query(None, description="Required for App pieces; use the commercial space key"),
-    db: Session = Depends(get_db),
+    delivery: str = Query("inline", pattern="^(inline|url)$", description="inline (conteúdo no corpo) ou url (pré-assinada)"),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
     """Download creative piece content from S3. E-mail -> HTML (escaped for JSON). App -> image as base64 data URL."""
-    _get_campaign_or_404(db, campaign_id)
-    piece = (
-        db.query(CreativePiece)
-        .filter(
+    await _get_campaign_or_404(db, campaign_id)
+    piece = (await db.execute(
+        select(CreativePiece).where(
             CreativePiece.campaign_id == campaign_id,
             CreativePiece.id == piece_id,
         )
-        .first()
-    )
+    )).scalars().first()
     if not piece:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Creative piece not found")
 
@@ -432,8 +540,10 @@ async def download_piece_content(
         file_key = extract_file_key_from_url(piece.html_file_url, settings.S3_BUCKET_NAME)
         if not file_key:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Invalid HTML file URL")
+        if delivery == "url":
+            return await _presigned_piece_content(file_key, piece.html_file_digest)
         try:
-            body, content_type = get_file(file_key)
+            body, content_type = await asyncio.to_thread(get_file, file_key)
         except Exception as e:
             logger.exception("download piece content: get_file failed for %s: %s", file_key, e)
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Failed to fetch file from storage") from e
@@ -447,7 +557,7 @@ async def download_piece_content(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="HTML file could not be decoded as UTF-8 or Latin-1",
                 )
-        return PieceContentResponse(content_type=content_type, content=html)
+        return PieceContentResponse(content_type=content_type, content=html, digest=piece.html_file_digest)
 
     if piece.piece_type == "App":
         if not commercial_space:
@@ -465,14 +575,17 @@ async def download_piece_content(
         file_key = extract_file_key_from_url(file_url, settings.S3_BUCKET_NAME)
         if not file_key:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Invalid file URL")
+        digest = get_app_file_urls_dict(piece.file_digests).get(commercial_space)
+        if delivery == "url":
+            return await _presigned_piece_content(file_key, digest)
         try:
-            body, content_type = get_file(file_key)
+            body, content_type = await asyncio.to_thread(get_file, file_key)
         except Exception as e:
             logger.exception("download piece content: get_file failed for %s: %s", file_key, e)
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Failed to fetch file from storage") from e
         b64 = base64.b64encode(body).decode("ascii")
         data_url = f"data:{content_type};base64,{b64}"
-        return PieceContentResponse(content_type=content_type, content=data_url)
+        return PieceContentResponse(content_type=content_type, content=data_url, digest=digest)
 
     raise HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST,
@@ -484,21 +597,19 @@ async def download_piece_content(
 async def delete_app_creative_piece(
     campaign_id: str,
     commercial_space: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
     _require_creative_analyst(current_user)
-    campaign = _get_campaign_or_404(db, campaign_id)
+    campaign = await _get_campaign_or_404(db, campaign_id)
     _require_campaign_status_for_creative_work(campaign)
     
-    app_piece = (
-        db.query(CreativePiece)
-        .filter(
+    app_piece = (await db.execute(
+        select(CreativePiece).where(
             CreativePiece.campaign_id == campaign_id,
             CreativePiece.piece_type == "App"
         )
-        .first()
-    )
+    )).scalars().first()
     
     if not app_piece or not app_piece.file_urls:
         raise HTTPException(
@@ -523,7 +634,10 @@ async def delete_app_creative_piece(
     try:
         file_url = file_urls[commercial_space]
         file_key = extract_file_key_from_url(file_url, settings.S3_BUCKET_NAME)
-        if file_key:
+        if is_blob_key(file_key):
+            # compartilhado por conteúdo: sem referências, a coleta remove do S3
+            await detach_blob(db, app_piece.id, commercial_space)
+        elif file_key:
             delete_file(file_key)
             logger.info(f"successfully deleted file from s3: {file_key}")
         else:
@@ -534,32 +648,33 @@ async def delete_app_creative_piece(
     del file_urls[commercial_space]
     
     if len(file_urls) == 0:
-        db.delete(app_piece)
+        await db.delete(app_piece)
     else:
         app_piece.file_urls = json.dumps(file_urls)
+        digests = get_app_file_urls_dict(app_piece.file_digests)
+        digests.pop(commercial_space, None)
+        app_piece.file_digests = json.dumps(digests) if digests else None
     
-    db.commit()
+    await db.commit()
     return None
 
 
 @router.delete("/{campaign_id}/creative-pieces/email", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_email_creative_piece(
     campaign_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
     _require_creative_analyst(current_user)
-    campaign = _get_campaign_or_404(db, campaign_id)
+    campaign = await _get_campaign_or_404(db, campaign_id)
     _require_campaign_status_for_creative_work(campaign)
     
-    email_piece = (
-        db.query(CreativePiece)
-        .filter(
+    email_piece = (await db.execute(
+        select(CreativePiece).where(
             CreativePiece.campaign_id == campaign_id,
             CreativePiece.piece_type == "E-mail"
         )
-        .first()
-    )
+    )).scalars().first()
     
     if not email_piece or not email_piece.html_file_url:
         raise HTTPException(
@@ -569,7 +684,9 @@ async def delete_email_creative_piece(
     
     try:
         file_key = extract_file_key_from_url(email_piece.html_file_url, settings.S3_BUCKET_NAME)
-        if file_key:
+        if is_blob_key(file_key):
+            pass  # a referência sai com a peça (ON DELETE CASCADE); a coleta remove do S3
+        elif file_key:
             delete_file(file_key)
             logger.info(f"successfully deleted file from s3: {file_key}")
         else:
@@ -577,8 +694,8 @@ async def delete_email_creative_piece(
     except Exception as e:
         logger.error(f"failed to delete file from s3: {e}", exc_info=True)
     
-    db.delete(email_piece)
-    db.commit()
+    await db.delete(email_piece)
+    await db.commit()
     return None
 
 
@@ -588,7 +705,7 @@ async def download_creative_piece(
     channel: str = Query(..., description="Channel: EMAIL or APP"),
     commercial_space: Optional[str] = Query(None, description="Commercial space (required for APP)"),
     filename: Optional[str] = Query(None, description="Suggested filename for download"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user),
 ):
     """
@@ -602,7 +719,7 @@ async def download_creative_piece(
             detail="Only business analysts and campaign analysts can download pieces"
         )
     
-    campaign = _get_campaign_or_404(db, campaign_id)
+    campaign = await _get_campaign_or_404(db, campaign_id)
     
     channel_upper = channel.upper().replace("-", "").replace(" ", "")
     if channel_upper == "E-MAIL":
@@ -610,14 +727,12 @@ async def download_creative_piece(
     
     if channel_upper == "EMAIL":
         # Download email HTML
-        piece = (
-            db.query(CreativePiece)
-            .filter(
+        piece = (await db.execute(
+            select(CreativePiece).where(
                 CreativePiece.campaign_id == campaign_id,
                 CreativePiece.piece_type == "E-mail"
             )
-            .first()
-        )
+        )).scalars().first()
         if not piece or not piece.html_file_url:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -634,14 +749,12 @@ async def download_creative_piece(
                 detail="commercial_space is required for APP channel"
             )
         
-        piece = (
-            db.query(CreativePiece)
-            .filter(
+        piece = (await db.execute(
+            select(CreativePiece).where(
                 CreativePiece.campaign_id == campaign_id,
                 CreativePiece.piece_type == "App"
             )
-            .first()
-        )
+        )).scalars().first()
         if not piece or not piece.file_urls:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -90,6 +90,8 @@ class CreativePieceResponse(BaseModel):
     body: Optional[str] = None
     file_urls: Optional[str] = Field(None, alias="fileUrls")
     html_file_url: Optional[str] = Field(None, alias="htmlFileUrl")
+    file_digests: Optional[str] = Field(None, alias="fileDigests")  # JSON espaço comercial → sha256
+    html_file_digest: Optional[str] = Field(None, alias="htmlFileDigest")
     ia_verdict: Optional[str] = Field(None, alias="iaVerdict")
     ia_analysis_text: Optional[str] = Field(None, alias="iaAnalysisText")
     created_at: datetime = Field(alias="createdAt")
@@ -99,13 +101,22 @@ class CreativePieceResponse(BaseModel):
 
 
 class PieceContentResponse(BaseModel):
-    """Response for GET .../creative-pieces/{piece_id}/content."""
+    """Response for GET .../creative-pieces/{piece_id}/content.
+
+    ``delivery=inline`` fills ``content``; ``delivery=url`` fills ``url`` (a
+    presigned GET valid for ``expiresIn`` seconds) and the object metadata.
+    """
 
     content_type: str = Field(..., alias="contentType", description="e.g. text/html or image/png")
-    content: str = Field(
-        ...,
+    content: Optional[str] = Field(
+        None,
         description="HTML as UTF-8 string (JSON-safe) or image as data URL (data:image/png;base64,...)",
     )
+    url: Optional[str] = Field(None, description="Presigned GET URL (delivery=url)")
+    expires_in: Optional[int] = Field(None, alias="expiresIn", description="Seconds until url expires")
+    content_length: Optional[int] = Field(None, alias="contentLength", description="Object size in bytes")
+    etag: Optional[str] = Field(None, description="S3 ETag of the object, usable as a cache key")
+    digest: Optional[str] = Field(None, description="SHA-256 of the file content (stable cache key)")
 
     model_config = {"populate_by_name": True}
 
@@ -164,6 +175,10 @@ class CampaignResponse(BaseModel):
     piece_reviews: Optional[List["PieceReviewResponse"]] = Field(None, alias="pieceReviews")
     approved_piece_count: int = Field(0, alias="approvedPieceCount")
     total_piece_count: int = Field(0, alias="totalPieceCount")
+    rejected_piece_count: int = Field(0, alias="rejectedPieceCount")
+    pending_piece_count: int = Field(0, alias="pendingPieceCount")
+    ia_passed_piece_count: int = Field(0, alias="iaPassedPieceCount")
+    ia_failed_piece_count: int = Field(0, alias="iaFailedPieceCount")
     has_rejected_pieces: bool = Field(False, alias="hasRejectedPieces")
     all_pieces_approved: bool = Field(False, alias="allPiecesApproved")
 
@@ -172,6 +187,9 @@ class CampaignResponse(BaseModel):
 
 class CampaignsResponse(BaseModel):
     campaigns: List[CampaignResponse]
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
+
+    model_config = {"populate_by_name": True}
 
 
 # --- CONTENT_REVIEW workflow (submit-for-review, piece review) ---
@@ -229,6 +247,45 @@ class ReviewPieceRequest(BaseModel):
     model_config = {"populate_by_name": True}
 
 
+class BulkReviewPiecesRequest(BaseModel):
+    """Request body for POST /campaigns/{id}/pieces/reviews:bulk (all or nothing)."""
+
+    reviews: List[ReviewPieceRequest] = Field(..., min_length=1, max_length=500)
+
+    model_config = {"populate_by_name": True}
+
+
+class BulkReviewResult(BaseModel):
+    """Resulting state of one reviewed unit."""
+
+    piece_id: str = Field(alias="pieceId")
+    channel: str
+    commercial_space: str = Field(alias="commercialSpace", default="")
+    human_verdict: str = Field(alias="humanVerdict")
+    effective_status: str = Field(alias="effectiveStatus")
+
+    model_config = {"populate_by_name": True}
+
+
+class BulkReviewPiecesResponse(BaseModel):
+    """Response for POST /campaigns/{id}/pieces/reviews:bulk.
+
+    ``nextStatus`` is where the review now allows the campaign to move
+    (CAMPAIGN_BUILDING when every piece is approved, CONTENT_ADJUSTMENT when
+    some piece is rejected and none is pending), or null while pieces are pending.
+    """
+
+    campaign_id: str = Field(alias="campaignId")
+    status: str
+    next_status: Optional[str] = Field(None, alias="nextStatus")
+    approved: int
+    rejected: int
+    pending: int
+    results: List[BulkReviewResult]
+
+    model_config = {"populate_by_name": True}
+
+
 class UpdatePieceIaAnalysisRequest(BaseModel):
     """Request body for PATCH /campaigns/{id}/creative-pieces/{piece_id}/ia-analysis."""
 
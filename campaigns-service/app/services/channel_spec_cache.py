@@ -0,0 +1,185 @@
+"""In-process, versioned cache of ``channel_specs`` for ``get_channel_specs``.
+
+All active specs are loaded at startup into an immutable snapshot, so
+lookups never touch the database. A statement trigger on ``channel_specs``
+(migration 006) bumps ``channel_specs_version`` and sends
+``NOTIFY channel_specs_changed``. The cache LISTENs on a dedicated asyncpg
+connection and reloads on every notification. As a safety net for a
+dropped LISTEN connection it also polls the version counter every
+``CHANNEL_SPECS_POLL_SECONDS``.
+
+Every snapshot carries the counter ``version`` and an ``etag`` (hash of the
+content), which callers can keep to cache the specs themselves.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import engine, session_scope
+from app.core.metrics import CHANNEL_SPEC_CACHE_RELOADS, CHANNEL_SPEC_VERSION
+from app.models.channel_spec import ChannelSpec, ChannelSpecVersion
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "channel_specs_changed"
+
+_SPEC_ATTRS = (
+    "min_chars", "max_chars", "warn_chars",
+    "max_weight_kb",
+    "min_width", "min_height", "max_width", "max_height",
+    "expected_width", "expected_height", "tolerance_pct",
+)
+
+SpecTable = Dict[Tuple[str, Optional[str]], Dict[str, Dict[str, Any]]]
+
+
+def spec_row_to_dict(row: ChannelSpec) -> Dict[str, Any]:
+    """Converte um ChannelSpec row para dict (somente campos com valor)."""
+    result: Dict[str, Any] = {}
+    for attr in _SPEC_ATTRS:
+        val = getattr(row, attr, None)
+        if val is not None:
+            result[attr] = val
+    return result
+
+
+@dataclass(frozen=True)
+class SpecSnapshot:
+    version: int
+    etag: str
+    specs: SpecTable
+
+    def lookup(self, channel: str, commercial_space: Optional[str] = None):
+        """``(generic_specs, space_specs)`` of a channel, by field name."""
+        generic = self.specs.get((channel, None), {})
+        space = self.specs.get((channel, commercial_space), {}) if commercial_space else {}
+        return generic, space
+
+
+def build_snapshot(version: int, rows: List[ChannelSpec]) -> SpecSnapshot:
+    specs: SpecTable = {}
+    for row in rows:
+        specs.setdefault((row.channel, row.commercial_space), {})[row.field_name] = spec_row_to_dict(row)
+    canonical = json.dumps(
+        sorted([channel, space or "", field, spec] for (channel, space), fields in specs.items()
+               for field, spec in fields.items()),
+        sort_keys=True,
+    )
+    etag = f'"{hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]}"'
+    return SpecSnapshot(version=version, etag=etag, specs=specs)
+
+
+async def _load_specs() -> Tuple[int, List[ChannelSpec]]:
+    async with session_scope() as db:
+        version = await _read_version_with(db)
+        rows = (await db.execute(select(ChannelSpec).where(ChannelSpec.active.is_(True)))).scalars().all()
+    return version, list(rows)
+
+
+async def _read_version_with(db) -> int:
+    version = (await db.execute(select(ChannelSpecVersion.version).where(ChannelSpecVersion.id == 1))).scalar()
+    return int(version or 0)
+
+
+async def _read_version() -> int:
+    async with session_scope() as db:
+        return await _read_version_with(db)
+
+
+class ChannelSpecCache:
+    def __init__(
+        self,
+        load: Callable[[], Awaitable[Tuple[int, List[ChannelSpec]]]] = _load_specs,
+        read_version: Callable[[], Awaitable[int]] = _read_version,
+        poll_interval_seconds: float = 30,
+    ):
+        self._load = load
+        self._read_version = read_version
+        self.poll_interval = poll_interval_seconds
+        self._snapshot: Optional[SpecSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._listener = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._reload_task: Optional[asyncio.Task] = None
+        self._dirty = False
+
+    async def get(self) -> SpecSnapshot:
+        if self._snapshot is None:
+            await self.reload("lazy")
+        return self._snapshot
+
+    async def reload(self, reason: str) -> SpecSnapshot:
+        async with self._lock:
+            version, rows = await self._load()
+            self._snapshot = build_snapshot(version, rows)
+        CHANNEL_SPEC_CACHE_RELOADS.labels(reason=reason).inc()
+        CHANNEL_SPEC_VERSION.set(version)
+        logger.info("Specs de canal carregadas (versão %d, %d linhas, motivo: %s)", version, len(rows), reason)
+        return self._snapshot
+
+    async def start(self) -> None:
+        try:
+            await self.reload("startup")
+        except Exception as e:
+            logger.warning("Erro ao carregar specs de canal: %s. Carregamento na primeira chamada.", e)
+        try:
+            await self._listen()
+        except Exception as e:
+            logger.warning("Erro ao escutar %s: %s. Invalidação só por polling.", NOTIFY_CHANNEL, e)
+        if self.poll_interval > 0:
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        for task in (self._poll_task, self._reload_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._poll_task = self._reload_task = None
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        # conexão dedicada: um LISTEN prenderia uma conexão do pool para sempre
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self._listener = await asyncpg.connect(dsn)
+        await self._listener.add_listener(NOTIFY_CHANNEL, self._on_notify)
+
+    def _on_notify(self, *_args) -> None:
+        # várias notificações seguidas viram uma recarga só
+        self._dirty = True
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self._dirty:
+            self._dirty = False
+            try:
+                await self.reload("notify")
+            except Exception as e:
+                logger.warning("Erro ao recarregar specs de canal: %s", e)
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                version = await self._read_version()
+                if self._snapshot is None or version != self._snapshot.version:
+                    await self.reload("poll")
+            except Exception as e:
+                logger.warning("Erro ao verificar versão das specs de canal: %s", e)
+
+
+channel_spec_cache = ChannelSpecCache(poll_interval_seconds=settings.CHANNEL_SPECS_POLL_SECONDS)
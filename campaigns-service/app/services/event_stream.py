@@ -0,0 +1,178 @@
+"""Server-Sent Events for ``GET /campaigns/events/stream``.
+
+Each worker runs one ``EventHub``. It is the only reader of the broker
+stream, and it fans every event out to the worker's SSE connections
+through bounded per-connection queues. A connection whose queue fills up
+is closed rather than slowing the others. The browser's ``EventSource``
+then reconnects with ``Last-Event-ID``, and the missed events are replayed
+from ``outbox_events``, where ``seq`` is the SSE id. Every connection only
+receives events of campaigns the user can see, by the same rules as
+``can_view_campaign``. For a status change, the user gets the event if
+they could see the campaign before or after it.
+"""
+
+import asyncio
+import json
+import logging
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.core.event_broker import EventBroker, event_broker
+from app.core.metrics import SSE_EVENTS_SENT, SSE_SUBSCRIBERS, SSE_SUBSCRIBERS_DROPPED
+from app.core.permissions import can_view_campaign
+from app.models.outbox_event import OutboxEvent
+from app.services.outbox import event_message
+
+logger = logging.getLogger(__name__)
+
+_READ_TIMEOUT_SECONDS = 5
+_RETRY_MS = 3000
+
+
+class Subscription:
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = False
+
+
+class EventHub:
+    def __init__(self, broker: EventBroker, queue_size: int = 256):
+        self.broker = broker
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_seq = 0
+
+    async def start(self) -> None:
+        # só eventos novos; o que veio antes chega por replay do outbox
+        try:
+            self._last_seq = await self.broker.last_seq()
+        except Exception as e:
+            logger.warning("Erro ao ler a posição do stream de eventos: %s", e)
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        SSE_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.discard(subscription)
+            SSE_SUBSCRIBERS.dec()
+
+    def dispatch(self, entries: List[Tuple[int, Dict[str, Any]]]) -> None:
+        for seq, event in entries:
+            self._last_seq = max(self._last_seq, seq)
+            for subscription in list(self._subscribers):
+                try:
+                    subscription.queue.put_nowait((seq, event))
+                except asyncio.QueueFull:
+                    subscription.dropped = True
+                    self.unsubscribe(subscription)
+                    SSE_SUBSCRIBERS_DROPPED.inc()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                entries = await self.broker.read(self._last_seq, _READ_TIMEOUT_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Erro ao ler o stream de eventos: %s", e)
+                await asyncio.sleep(1)
+                continue
+            self.dispatch(entries)
+
+
+def visible_to(user: Dict, event: Dict[str, Any]) -> bool:
+    data = event.get("data") or {}
+    statuses = {data.get("campaignStatus"), data.get("fromStatus")} - {None}
+    return any(
+        can_view_campaign(user, SimpleNamespace(status=s, created_by=data.get("createdBy")))
+        for s in statuses
+    )
+
+
+def format_sse(seq: int, event: Dict[str, Any]) -> bytes:
+    return f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n".encode()
+
+
+async def replay_events(after_seq: int, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+    """Published events with ``seq > after_seq``, oldest first, at most ``limit + 1``."""
+    async with session_scope() as db:
+        rows = (await db.execute(
+            select(OutboxEvent)
+            .where(OutboxEvent.seq > after_seq)
+            .order_by(OutboxEvent.seq)
+            .limit(limit + 1)
+        )).scalars().all()
+    return [(row.seq, event_message(row)) for row in rows]
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    if value and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+
+async def stream_events(
+    hub: EventHub,
+    user: Dict,
+    last_event_id: Optional[int],
+    heartbeat_seconds: float,
+    replay_limit: int,
+) -> AsyncIterator[bytes]:
+    """SSE body for one connection: replay after ``last_event_id``, then live events."""
+    # inscreve antes do replay: o que for publicado durante o replay fica na fila
+    subscription = hub.subscribe()
+    try:
+        yield f"retry: {_RETRY_MS}\n\n".encode()
+        sent = last_event_id or 0
+        if last_event_id is not None:
+            missed = await replay_events(last_event_id, replay_limit)
+            if len(missed) > replay_limit:
+                # lacuna grande demais: o cliente recarrega o estado e segue ao vivo
+                sent, missed = missed[-1][0], []
+                yield f"id: {sent}\nevent: reset\ndata: {{}}\n\n".encode()
+            for seq, event in missed:
+                sent = seq
+                if visible_to(user, event):
+                    SSE_EVENTS_SENT.labels(source="replay").inc()
+                    yield format_sse(seq, event)
+
+        while True:
+            try:
+                seq, event = await asyncio.wait_for(subscription.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if subscription.dropped:
+                    return
+                yield b": ping\n\n"
+                continue
+            if seq <= sent:
+                continue
+            sent = seq
+            if visible_to(user, event):
+                SSE_EVENTS_SENT.labels(source="live").inc()
+                yield format_sse(seq, event)
+            if subscription.dropped and subscription.queue.empty():
+                return
+    finally:
+        hub.unsubscribe(subscription)
+
+
+event_hub = EventHub(event_broker, queue_size=settings.SSE_SUBSCRIBER_QUEUE_SIZE)
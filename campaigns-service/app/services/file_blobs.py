@@ -0,0 +1,160 @@
+"""Content-addressed storage of creative piece files.
+
+Each distinct file is stored once in S3 under ``sha256/<digest>.<ext>`` and
+recorded in ``file_blobs``; ``creative_piece_files`` maps every piece slot
+(the commercial space for App, ``""`` for E-mail) to the blob it uses.
+Uploading the same bytes again, in any piece or campaign, only adds a
+reference.
+
+A blob's reference count is the number of ``creative_piece_files`` rows
+pointing at it. References are replaced or removed with the slot, and go
+away with the piece (``ON DELETE CASCADE``). ``BlobCollector`` deletes blobs
+that have had no references for ``BLOB_GC_GRACE_SECONDS``: S3 object first,
+then the row. Claiming a blob on upload touches ``last_used_at`` and locks
+its row until the upload commits, and the collector skips locked rows, so a
+blob being re-used is never collected under it.
+"""
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Optional, Tuple
+
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.core.metrics import FILE_BLOBS_COLLECTED
+from app.core.s3_client import delete_files
+from app.models.file_blob import CreativePieceFile, FileBlob
+
+logger = logging.getLogger(__name__)
+
+EMAIL_SLOT = ""
+_BLOB_PREFIX = "sha256/"
+_HASH_CHUNK = 1024 * 1024
+
+
+def hash_fileobj(fileobj: BinaryIO) -> Tuple[str, int]:
+    """SHA-256 hex digest and size of a file object, read in chunks; rewound afterwards."""
+    fileobj.seek(0)
+    sha = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: fileobj.read(_HASH_CHUNK), b""):
+        sha.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return sha.hexdigest(), size
+
+
+def blob_key(digest: str, file_extension: str) -> str:
+    return f"{_BLOB_PREFIX}{digest}{file_extension}"
+
+
+def is_blob_key(file_key: Optional[str]) -> bool:
+    return bool(file_key) and file_key.startswith(_BLOB_PREFIX)
+
+
+async def claim_blob(db: AsyncSession, digest: str, file_key: str, content_type: str, size_bytes: int) -> None:
+    """Record the blob (or mark an existing one as used); the row stays locked until commit."""
+    stmt = pg_insert(FileBlob).values(
+        digest=digest,
+        file_key=file_key,
+        content_type=content_type,
+        size_bytes=size_bytes,
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[FileBlob.digest],
+        set_={"last_used_at": func.now()},
+    ))
+
+
+async def attach_blob(db: AsyncSession, piece_id: str, slot: str, digest: str) -> None:
+    """Point a piece slot at a blob, replacing (and so releasing) what it used before."""
+    stmt = pg_insert(CreativePieceFile).values(piece_id=piece_id, slot=slot, digest=digest)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[CreativePieceFile.piece_id, CreativePieceFile.slot],
+        set_={"digest": digest},
+    ))
+
+
+async def detach_blob(db: AsyncSession, piece_id: str, slot: str) -> None:
+    await db.execute(
+        delete(CreativePieceFile).where(
+            CreativePieceFile.piece_id == piece_id,
+            CreativePieceFile.slot == slot,
+        )
+    )
+
+
+async def collect_unreferenced_blobs(db: AsyncSession, grace_seconds: float, batch_size: int) -> int:
+    """Delete up to ``batch_size`` blobs unreferenced for ``grace_seconds``; returns how many."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    rows = (await db.execute(
+        select(FileBlob.digest, FileBlob.file_key)
+        .where(
+            FileBlob.last_used_at < cutoff,
+            ~exists().where(CreativePieceFile.digest == FileBlob.digest),
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )).all()
+    if not rows:
+        return 0
+    # S3 primeiro: se falhar, as linhas continuam e o próximo ciclo tenta de novo
+    await asyncio.to_thread(delete_files, [r.file_key for r in rows])
+    await db.execute(delete(FileBlob).where(FileBlob.digest.in_([r.digest for r in rows])))
+    await db.commit()
+    return len(rows)
+
+
+class BlobCollector:
+    def __init__(self, interval_seconds: float = 3600, grace_seconds: float = 3600, batch_size: int = 500):
+        self.interval = interval_seconds
+        self.grace = grace_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def collect(self) -> int:
+        collected = 0
+        while True:
+            async with session_scope() as db:
+                count = await collect_unreferenced_blobs(db, self.grace, self.batch_size)
+            collected += count
+            if count < self.batch_size:
+                return collected
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                collected = await self.collect()
+            except Exception as e:
+                logger.error("Erro na coleta de arquivos sem referência: %s", e)
+                continue
+            if collected:
+                FILE_BLOBS_COLLECTED.inc(collected)
+                logger.info("Arquivos sem referência removidos do S3: %d", collected)
+
+
+blob_collector = BlobCollector(
+    interval_seconds=settings.BLOB_GC_INTERVAL_SECONDS,
+    grace_seconds=settings.BLOB_GC_GRACE_SECONDS,
+    batch_size=settings.BLOB_GC_BATCH_SIZE,
+)
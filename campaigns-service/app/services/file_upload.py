@@ -1,29 +1,73 @@
+import asyncio
 import json
 import time
-import uuid
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from fastapi import UploadFile, HTTPException, status
-from app.core.s3_client import upload_file, delete_file, get_file
+from app.core.config import settings
+from app.core.s3_client import upload_fileobj, delete_file, get_file, object_exists, public_file_url
 from app.core.metrics import S3_UPLOADS, S3_UPLOAD_DURATION
 from app.models.campaign import Campaign
-from sqlalchemy.orm import Session
+from app.services.file_blobs import blob_key, claim_blob, hash_fileobj
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-def generate_file_key(campaign_id: str, piece_type: str, commercial_space: Optional[str] = None, file_extension: str = "") -> str:
-    file_id = str(uuid.uuid4())
-    if commercial_space:
-        safe_space = commercial_space.replace(" ", "_").replace("/", "_")
-        return f"campaigns/{campaign_id}/{piece_type}/{safe_space}/{file_id}{file_extension}"
-    else:
-        return f"campaigns/{campaign_id}/{piece_type}/{file_id}{file_extension}"
+# Só o início do arquivo é lido para validar o formato; o resto vai do spool direto ao S3
+_SNIFF_BYTES = 64 * 1024
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+async def _read_head(file: UploadFile) -> bytes:
+    """Enforce UPLOAD_MAX_MB and return the first bytes; the spool is rewound afterwards."""
+    size = file.size
+    if size is None:
+        file.file.seek(0, 2)
+        size = file.file.tell()
+    if size > settings.UPLOAD_MAX_MB * 1024 * 1024:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds the {settings.UPLOAD_MAX_MB} MB limit"
+        )
+    await file.seek(0)
+    head = await file.read(_SNIFF_BYTES)
+    await file.seek(0)
+    return head
+
+
+async def _store_content_addressed(
+    file: UploadFile,
+    db: AsyncSession,
+    file_extension: str,
+    content_type: str,
+) -> Tuple[str, str]:
+    """Store the upload under its SHA-256; the PUT is skipped when the object already exists.
+
+    Returns ``(file_url, digest)``.
+    """
+    digest, size = await asyncio.to_thread(hash_fileobj, file.file)
+    file_key = blob_key(digest, file_extension)
+    await claim_blob(db, digest, file_key, content_type, size)
+    if await asyncio.to_thread(object_exists, file_key):
+        S3_UPLOADS.labels(status="deduplicated").inc()
+        return public_file_url(file_key), digest
+
+    _s3_start = time.perf_counter()
+    try:
+        file_url = await asyncio.to_thread(upload_fileobj, file.file, file_key, content_type)
+        S3_UPLOAD_DURATION.observe(time.perf_counter() - _s3_start)
+        S3_UPLOADS.labels(status="success").inc()
+    except Exception:
+        S3_UPLOADS.labels(status="error").inc()
+        raise
+    return file_url, digest
 
 
 async def upload_app_file(
     campaign: Campaign,
     commercial_space: str,
     file: UploadFile,
-    db: Session
-) -> str:
+    db: AsyncSession
+) -> Tuple[str, str]:
+    """Validate and store an App image; returns ``(file_url, digest)``."""
 
     if not file.filename.endswith('.png'):
         raise HTTPException(
@@ -37,25 +81,22 @@ async def upload_app_file(
             detail=f"Commercial space '{commercial_space}' is not configured for this campaign"
         )
     
-    file_content = await file.read()
-    file_key = generate_file_key(campaign.id, "App", commercial_space, ".png")
-    _s3_start = time.perf_counter()
-    try:
-        file_url = upload_file(file_content, file_key, "image/png")
-        S3_UPLOAD_DURATION.observe(time.perf_counter() - _s3_start)
-        S3_UPLOADS.labels(status="success").inc()
-    except Exception:
-        S3_UPLOADS.labels(status="error").inc()
-        raise
+    head = await _read_head(file)
+    if not head.startswith(_PNG_SIGNATURE):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="App files must be PNG format"
+        )
     
-    return file_url
+    return await _store_content_addressed(file, db, ".png", "image/png")
 
 
 async def upload_email_file(
     campaign: Campaign,
     file: UploadFile,
-    db: Session
-) -> str:
+    db: AsyncSession
+) -> Tuple[str, str]:
+    """Validate and store an e-mail HTML; returns ``(file_url, digest)``."""
    
     if not file.filename.endswith('.html'):
         raise HTTPException(
@@ -63,13 +104,13 @@ async def upload_email_file(
             detail="E-mail files must be HTML format (.html extension)"
         )
     
-    file_content = await file.read()
+    head = await _read_head(file)
    
     try:
-        content_str = file_content.decode('utf-8')
+        content_str = head.decode('utf-8')
     except UnicodeDecodeError:
         try:
-            content_str = file_content.decode('latin-1')
+            content_str = head.decode('latin-1')
         except UnicodeDecodeError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -94,17 +135,7 @@ async def upload_email_file(
             detail="O arquivo não parece ser HTML válido. Certifique-se de que o arquivo contém tags HTML (como <html>, <body>, <div>, etc.)"
         )
     
-    file_key = generate_file_key(campaign.id, "E-mail", None, ".html")
-    _s3_start = time.perf_counter()
-    try:
-        file_url = upload_file(file_content, file_key, "text/html")
-        S3_UPLOAD_DURATION.observe(time.perf_counter() - _s3_start)
-        S3_UPLOADS.labels(status="success").inc()
-    except Exception:
-        S3_UPLOADS.labels(status="error").inc()
-        raise
-    
-    return file_url
+    return await _store_content_addressed(file, db, ".html", "text/html")
 
 
 def update_app_file_urls(
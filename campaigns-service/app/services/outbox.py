@@ -0,0 +1,189 @@
+"""Transactional outbox for campaign status and piece review changes.
+
+Service methods that write ``CampaignStatusEvent`` or ``PieceReviewEvent``
+rows also add an ``OutboxEvent`` in the same transaction, so an event is
+published if and only if its change committed. ``OutboxRelay`` moves
+committed rows to the ``EventBroker``. Each batch runs under a transaction-level
+advisory lock, so only one worker relays at a time. The relay numbers rows
+from ``outbox_events_publish_seq`` in the order it finds them committed,
+publishes them, and marks them published. A row that commits late, after a
+higher id, just gets a later ``seq``; ``seq`` never goes back.
+
+Delivery is at least once. If the commit fails after publishing, the rows
+are published again with new ``seq`` values; ``eventId`` (the outbox row id)
+lets consumers drop the duplicate. Published rows are kept for
+``OUTBOX_RETENTION_HOURS`` so SSE clients can resume from ``Last-Event-ID``.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.core.event_broker import EventBroker, event_broker
+from app.core.metrics import OUTBOX_EVENTS_PUBLISHED, OUTBOX_PUBLISH_LAG
+from app.models.campaign import Campaign
+from app.models.outbox_event import OUTBOX_PUBLISH_SEQ, OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+STATUS_CHANGED = "campaign.status_changed"
+PIECE_REVIEW_CHANGED = "piece_review.changed"
+
+# chave do pg_advisory_xact_lock que elege o relay da vez
+_RELAY_LOCK_KEY = 0x6F7574626F78
+_PURGE_INTERVAL_SECONDS = 60
+
+
+def _status_value(value) -> Optional[str]:
+    return value.value if hasattr(value, "value") else value
+
+
+def _campaign_payload(campaign: Campaign, actor_id: str) -> Dict[str, Any]:
+    # status e criador no momento do evento: o stream SSE filtra por eles
+    return {
+        "campaignId": campaign.id,
+        "campaignStatus": _status_value(campaign.status),
+        "createdBy": campaign.created_by,
+        "actorId": actor_id,
+    }
+
+
+def record_status_change(
+    db: AsyncSession,
+    campaign: Campaign,
+    from_status: Optional[str],
+    to_status: str,
+    actor_id: str,
+) -> None:
+    payload = _campaign_payload(campaign, actor_id)
+    payload.update(campaignStatus=_status_value(to_status), fromStatus=_status_value(from_status), toStatus=_status_value(to_status))
+    db.add(OutboxEvent(campaign_id=campaign.id, event_type=STATUS_CHANGED, payload=payload))
+
+
+def review_piece_ref(channel: str, piece_id: str, commercial_space: str, event_type: str) -> Dict[str, str]:
+    return {"channel": channel, "pieceId": piece_id, "commercialSpace": commercial_space, "eventType": event_type}
+
+
+def record_review_change(
+    db: AsyncSession,
+    campaign: Campaign,
+    pieces: List[Dict[str, str]],
+    actor_id: str,
+) -> None:
+    """One outbox row for all pieces touched by one review write (``pieces`` from ``review_piece_ref``)."""
+    payload = _campaign_payload(campaign, actor_id)
+    payload["pieces"] = pieces
+    db.add(OutboxEvent(campaign_id=campaign.id, event_type=PIECE_REVIEW_CHANGED, payload=payload))
+
+
+def event_message(row: OutboxEvent) -> Dict[str, Any]:
+    """Broker/SSE representation of a published outbox row."""
+    return {
+        "eventId": row.id,
+        "type": row.event_type,
+        "campaignId": row.campaign_id,
+        "createdAt": row.created_at.isoformat() if row.created_at else None,
+        "data": row.payload,
+    }
+
+
+async def relay_outbox_batch(db: AsyncSession, broker: EventBroker, batch_size: int) -> int:
+    """Publish up to ``batch_size`` unpublished rows in id order; returns how many (0 if another worker holds the lock)."""
+    if not (await db.execute(select(func.pg_try_advisory_xact_lock(_RELAY_LOCK_KEY)))).scalar():
+        return 0
+    rows = (await db.execute(
+        select(OutboxEvent)
+        .where(OutboxEvent.published_at.is_(None))
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+    )).scalars().all()
+    if not rows:
+        return 0
+    seqs = sorted((await db.execute(
+        select(OUTBOX_PUBLISH_SEQ.next_value()).select_from(func.generate_series(1, len(rows)))
+    )).scalars().all())
+    now = datetime.now(timezone.utc)
+    for row, seq in zip(rows, seqs):
+        row.seq = seq
+        row.published_at = now
+        await broker.publish(seq, event_message(row))
+    await db.commit()
+    for row in rows:
+        OUTBOX_EVENTS_PUBLISHED.labels(event_type=row.event_type).inc()
+        if row.created_at:
+            OUTBOX_PUBLISH_LAG.observe(max((now - row.created_at).total_seconds(), 0))
+    return len(rows)
+
+
+async def purge_published(db: AsyncSession, retention_hours: float) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+    result = await db.execute(delete(OutboxEvent).where(OutboxEvent.published_at < cutoff))
+    await db.commit()
+    return result.rowcount
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        broker: EventBroker,
+        interval_seconds: float = 0.5,
+        batch_size: int = 200,
+        retention_hours: float = 24,
+    ):
+        self.broker = broker
+        self.interval = interval_seconds
+        self.batch_size = batch_size
+        self.retention_hours = retention_hours
+        self._task: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+
+    async def start(self) -> None:
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def relay(self) -> int:
+        relayed = 0
+        while True:
+            async with session_scope() as db:
+                count = await relay_outbox_batch(db, self.broker, self.batch_size)
+            relayed += count
+            if count < self.batch_size:
+                return relayed
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.relay()
+                if time.monotonic() - self._last_purge > _PURGE_INTERVAL_SECONDS:
+                    self._last_purge = time.monotonic()
+                    async with session_scope() as db:
+                        purged = await purge_published(db, self.retention_hours)
+                    if purged:
+                        logger.info("Eventos do outbox expirados removidos: %d", purged)
+            except Exception as e:
+                logger.error("Erro no relay do outbox: %s", e)
+            await asyncio.sleep(self.interval)
+
+
+outbox_relay = OutboxRelay(
+    event_broker,
+    interval_seconds=settings.OUTBOX_RELAY_INTERVAL_SECONDS,
+    batch_size=settings.OUTBOX_RELAY_BATCH_SIZE,
+    retention_hours=settings.OUTBOX_RETENTION_HOURS,
+)
@@ -0,0 +1,113 @@
+"""Per-campaign piece review counters stored on ``campaigns``.
+
+``review_total``, ``review_approved``, ``review_rejected``, ``review_pending``,
+``review_ia_passed`` and ``review_ia_failed`` summarize the campaign's
+``piece_review`` rows. Status transitions and responses read them instead
+of loading the reviews. Every write to ``piece_review`` adjusts them in the
+same transaction, with ``col = col + delta``, so concurrent reviews do not
+overwrite each other's counts.
+
+If the counters ever drift (manual SQL, an old deploy writing reviews),
+recompute them from the source rows:
+
+    python -m app.services.review_counters [--campaign ID ...]
+"""
+
+import argparse
+import asyncio
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import and_, exists, func, literal, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.campaign import Campaign
+from app.models.piece_review import HumanVerdict, PieceReview
+
+COUNTER_COLUMNS = (
+    "review_total",
+    "review_approved",
+    "review_rejected",
+    "review_pending",
+    "review_ia_passed",
+    "review_ia_failed",
+)
+
+# Mesmas regras de _compute_effective_status (services.py), em SQL: o parecer
+# humano prevalece sobre o da IA
+_IA_APPROVED = PieceReview.ia_verdict == "approved"
+_REJECTED = PieceReview.human_verdict.in_((HumanVerdict.REJECTED.value, HumanVerdict.MANUALLY_REJECTED.value))
+_APPROVED = or_(
+    PieceReview.human_verdict == HumanVerdict.APPROVED.value,
+    and_(_IA_APPROVED, ~_REJECTED),
+)
+
+
+async def adjust_review_counters(db: AsyncSession, campaign_id: str, deltas: Dict[str, int]) -> None:
+    """Add ``deltas`` (column -> change) to the campaign's counters; zero changes are skipped."""
+    values = {col: getattr(Campaign, col) + d for col, d in deltas.items() if d}
+    if values:
+        await db.execute(
+            update(Campaign)
+            .where(Campaign.id == campaign_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def recompute_review_counters(db: AsyncSession, campaign_ids: Optional[Iterable[str]] = None) -> int:
+    """Rewrite counters from ``piece_review``; returns how many campaigns were out of date."""
+    ids = list(campaign_ids) if campaign_ids is not None else None
+    total = func.count()
+    approved = func.count().filter(_APPROVED)
+    rejected = func.count().filter(_REJECTED)
+    counts = (
+        select(
+            PieceReview.campaign_id,
+            total.label("review_total"),
+            approved.label("review_approved"),
+            rejected.label("review_rejected"),
+            (total - approved - rejected).label("review_pending"),
+            func.count().filter(_IA_APPROVED).label("review_ia_passed"),
+            func.count().filter(PieceReview.ia_verdict == "rejected").label("review_ia_failed"),
+        )
+        .group_by(PieceReview.campaign_id)
+    )
+    if ids is not None:
+        counts = counts.where(PieceReview.campaign_id.in_(ids))
+    counts = counts.subquery()
+
+    stored = tuple_(*(getattr(Campaign, col) for col in COUNTER_COLUMNS))
+    with_reviews = update(Campaign).where(
+        Campaign.id == counts.c.campaign_id,
+        stored.is_distinct_from(tuple_(*(counts.c[col] for col in COUNTER_COLUMNS))),
+    ).values({col: counts.c[col] for col in COUNTER_COLUMNS})
+    without_reviews = update(Campaign).where(
+        ~exists().where(PieceReview.campaign_id == Campaign.id),
+        stored.is_distinct_from(tuple_(*(literal(0) for _ in COUNTER_COLUMNS))),
+    ).values(dict.fromkeys(COUNTER_COLUMNS, 0))
+    if ids is not None:
+        without_reviews = without_reviews.where(Campaign.id.in_(ids))
+
+    fixed = 0
+    for stmt in (with_reviews, without_reviews):
+        result = await db.execute(stmt.execution_options(synchronize_session=False))
+        fixed += result.rowcount
+    await db.commit()
+    return fixed
+
+
+async def _main(campaign_ids: Optional[list]) -> None:
+    from app.core.database import engine, session_scope
+
+    async with session_scope() as db:
+        fixed = await recompute_review_counters(db, campaign_ids)
+    await engine.dispose()
+    print(f"Contadores de revisão recalculados: {fixed} campanha(s) corrigida(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recalcula os contadores de revisão das campanhas a partir de piece_review.")
+    parser.add_argument("--campaign", action="append", dest="campaign_ids", metavar="ID",
+                        help="só esta campanha (repetível); padrão: todas")
+    args = parser.parse_args()
+    asyncio.run(_main(args.campaign_ids))
@@ -1,8 +1,11 @@
-from datetime import datetime, timezone
-from typing import Dict, List, Optional
+import base64
+from datetime import date, datetime, time, timedelta, timezone
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
 from uuid import uuid4
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, and_, case, delete, func, insert, literal, or_, select, tuple_, type_coerce, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from fastapi import HTTPException, status
 
 from app.models.campaign import Campaign, CampaignStatus
@@ -22,6 +25,8 @@ from app.schemas.campaign import (
     CreativePieceCreate,
     CreativePieceResponse,
     PieceReviewResponse,
+    BulkReviewPiecesRequest,
+    BulkReviewPiecesResponse,
     ReviewPieceRequest,
     SubmitForReviewRequest,
 )
@@ -31,7 +36,9 @@ from app.core.permissions import (
     can_transition_status,
 )
 from app.core.s3_client import normalize_file_url
-from app.core.auth_client import auth_client
+from app.services.outbox import record_review_change, record_status_change, review_piece_ref
+from app.services.review_counters import COUNTER_COLUMNS, adjust_review_counters
+from app.core.auth_client import auth_client, display_name
 from app.core.metrics import (
     CAMPAIGN_OPERATIONS,
     STATUS_TRANSITIONS,
@@ -71,45 +78,153 @@ def _piece_review_to_response(pr: PieceReview) -> dict:
 
 
 def _is_piece_finally_approved(ia: str | None, human: str) -> bool:
-    """True if piece is approved.
+    """True if piece is approved (same rule as ``effectiveStatus``).
 
-    - IA approved and not manually rejected → approved
-    - IA rejected/None and human approved → approved
+    - human approved → approved
+    - IA approved and no human rejection → approved
     """
-    if ia == "approved":
-        return human != HumanVerdict.MANUALLY_REJECTED.value
-    # ia is rejected, warning, or None (não validado) → depende do humano
-    return human == HumanVerdict.APPROVED.value
+    return _compute_effective_status(ia, human) == "approved"
 
 
 def _is_piece_finally_rejected(ia: str | None, human: str) -> bool:
-    """True if piece is rejected.
+    """True if piece is rejected (same rule as ``effectiveStatus``).
 
-    - IA approved and manually rejected → rejected
-    - IA rejected/None and human rejected → rejected
+    - human rejected or manually rejected → rejected, whatever the IA says
     """
-    if ia == "approved":
-        return human == HumanVerdict.MANUALLY_REJECTED.value
-    # ia is rejected, warning, or None (não validado) → depende do humano
-    return human == HumanVerdict.REJECTED.value
+    return _compute_effective_status(ia, human) == "rejected"
 
 
-async def campaign_to_response(
+def _review_counts(verdicts) -> Dict[str, int]:
+    """Counter values (see review_counters) for ``(ia_verdict, human_verdict)`` pairs."""
+    counts = dict.fromkeys(COUNTER_COLUMNS, 0)
+    for ia, human in verdicts:
+        counts["review_total"] += 1
+        if _is_piece_finally_approved(ia, human):
+            counts["review_approved"] += 1
+        elif _is_piece_finally_rejected(ia, human):
+            counts["review_rejected"] += 1
+        else:
+            counts["review_pending"] += 1
+        if ia == "approved":
+            counts["review_ia_passed"] += 1
+        elif ia == "rejected":
+            counts["review_ia_failed"] += 1
+    return counts
+
+
+def _review_count_deltas(before, after) -> Dict[str, int]:
+    old, new = _review_counts(before), _review_counts(after)
+    return {col: new[col] - old[col] for col in COUNTER_COLUMNS}
+
+
+# action -> (human_verdict, event_type)
+_REVIEW_ACTIONS = {
+    "approve": (HumanVerdict.APPROVED.value, PieceReviewEventType.APPROVED.value),
+    "reject": (HumanVerdict.REJECTED.value, PieceReviewEventType.REJECTED.value),
+    "manually_reject": (HumanVerdict.MANUALLY_REJECTED.value, PieceReviewEventType.MANUALLY_REJECTED.value),
+}
+
+
+def _review_key(channel: Optional[str], commercial_space: Optional[str]) -> tuple:
+    """Normalized ``(channel, commercial_space)`` as stored in piece_review."""
+    ch = (channel or "").upper().replace("-", "").replace(" ", "")
+    if ch == "E-MAIL":
+        ch = "EMAIL"
+    return ch, (commercial_space or "").strip() or ""
+
+
+def _rejection_reason(action: str, reason: Optional[str]) -> Optional[str]:
+    if action in ("reject", "manually_reject") and reason is not None:
+        return reason.strip() or None
+    return None
+
+
+_REVIEW_STATUSES = (
+    CampaignStatus.CONTENT_REVIEW.value,
+    CampaignStatus.CONTENT_ADJUSTMENT.value,
+)
+
+
+def _status_value(campaign: Campaign) -> Optional[str]:
+    _status = getattr(campaign, "status", None)
+    return _status.value if hasattr(_status, "value") else (_status.strip() if isinstance(_status, str) else None)
+
+
+async def _load_by_campaign(db: AsyncSession, model, campaign_ids: List[str]) -> Dict[str, List[Any]]:
+    """Rows of ``model`` for the given campaigns, grouped by campaign, in one query."""
+    grouped: Dict[str, List[Any]] = {campaign_id: [] for campaign_id in campaign_ids}
+    if campaign_ids:
+        rows = (await db.execute(select(model).where(model.campaign_id.in_(campaign_ids)))).scalars().all()
+        for row in rows:
+            grouped[row.campaign_id].append(row)
+    return grouped
+
+
+async def _load_piece_reviews(db: AsyncSession, campaigns: List[Campaign]) -> Dict[str, List[PieceReview]]:
+    """PieceReview rows of every campaign in review, grouped by campaign, in one query."""
+    ids = [c.id for c in campaigns if _status_value(c) in _REVIEW_STATUSES]
+    return await _load_by_campaign(db, PieceReview, ids)
+
+
+# Coleções aninhadas que `fields=` pode omitir (nome no JSON → atributo)
+CAMPAIGN_SECTIONS = {
+    "comments": "comments",
+    "creativePieces": "creative_pieces",
+    "creative_pieces": "creative_pieces",
+    "pieceReviews": "piece_reviews",
+    "piece_reviews": "piece_reviews",
+}
+ALL_SECTIONS = frozenset(CAMPAIGN_SECTIONS.values())
+
+
+def parse_fields(fields: Optional[str]) -> Set[str]:
+    """Nested sections requested by ``fields=`` (comma-separated); all when absent."""
+    if fields is None:
+        return set(ALL_SECTIONS)
+    sections = set()
+    for name in filter(None, (f.strip() for f in fields.split(","))):
+        if name not in CAMPAIGN_SECTIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field '{name}'. Allowed: comments, creativePieces, pieceReviews",
+            )
+        sections.add(CAMPAIGN_SECTIONS[name])
+    return sections
+
+
+def _encode_cursor(campaign: Campaign) -> str:
+    raw = json.dumps([campaign.created_date.isoformat(), campaign.id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_date, campaign_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_date), str(campaign_id)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _serialize_campaign(
     campaign: Campaign,
-    auth_token: Optional[str] = None,
-    db: Optional[Session] = None,
+    comments: Optional[List[Comment]],
+    creative_pieces: Optional[List[CreativePiece]],
+    reviews: Optional[List[PieceReview]],
+    users: Dict[str, Dict],
+    sections: Set[str] = ALL_SECTIONS,
 ) -> CampaignResponse:
-    """Convert Campaign model to CampaignResponse schema."""
+    """Build the response from already-loaded rows; performs no I/O."""
     comments_list = None
-    if campaign.comments:
+    if "comments" in sections and comments:
         comments_list = [
-            CommentResponse.model_validate(c) for c in campaign.comments
+            CommentResponse.model_validate(c) for c in comments
         ]
     
     creative_pieces_list = None
-    if campaign.creative_pieces:
+    if "creative_pieces" in sections and creative_pieces:
         normalized_pieces = []
-        for cp in campaign.creative_pieces:
+        for cp in creative_pieces:
             piece_data = {
                 "id": cp.id,
                 "pieceType": cp.piece_type,
@@ -118,6 +233,8 @@ async def campaign_to_response(
                 "body": cp.body,
                 "iaVerdict": cp.ia_verdict,
                 "iaAnalysisText": cp.ia_analysis_text,
+                "fileDigests": cp.file_digests,
+                "htmlFileDigest": cp.html_file_digest,
                 "createdAt": cp.created_at,
                 "updatedAt": cp.updated_at,
             }
@@ -142,37 +259,20 @@ async def campaign_to_response(
         creative_pieces_list = normalized_pieces
 
     piece_reviews_list = None
-    approved_piece_count = 0
-    total_piece_count = 0
-    has_rejected_pieces = False
-    all_pieces_approved = False
-    _status = getattr(campaign, "status", None)
-    _status_val = _status.value if hasattr(_status, "value") else (_status.strip() if isinstance(_status, str) else None)
-    if db and _status_val in (
-        CampaignStatus.CONTENT_REVIEW.value,
-        CampaignStatus.CONTENT_ADJUSTMENT.value,
-    ):
-        rows = db.query(PieceReview).filter(PieceReview.campaign_id == campaign.id).all()
-        if rows:
-            total_piece_count = len(rows)
-            out = []
-            for r in rows:
-                d = _piece_review_to_response(r)
-                eff = d["effectiveStatus"]
-                if eff == "approved":
-                    approved_piece_count += 1
-                elif eff == "rejected":
-                    has_rejected_pieces = True
-                if r.reviewed_by and auth_token:
-                    try:
-                        u = await auth_client.get_user_by_id(r.reviewed_by, auth_token)
-                        if u:
-                            d["reviewedByName"] = u.get("full_name") or u.get("email") or r.reviewed_by
-                    except Exception:
-                        pass
-                out.append(PieceReviewResponse.model_validate(d))
-            piece_reviews_list = out
-            all_pieces_approved = (approved_piece_count == total_piece_count) and total_piece_count > 0
+    if reviews:
+        out = []
+        for r in reviews:
+            d = _piece_review_to_response(r)
+            if r.reviewed_by and r.reviewed_by in users:
+                d["reviewedByName"] = display_name(users[r.reviewed_by], r.reviewed_by)
+            out.append(PieceReviewResponse.model_validate(d))
+        piece_reviews_list = out
+
+    # Contagens vêm dos contadores da campanha, não das linhas carregadas
+    total_piece_count = campaign.review_total or 0
+    approved_piece_count = campaign.review_approved or 0
+    has_rejected_pieces = bool(campaign.review_rejected)
+    all_pieces_approved = total_piece_count > 0 and approved_piece_count == total_piece_count
     
     response_dict = {
         "id": campaign.id,
@@ -201,35 +301,155 @@ async def campaign_to_response(
         "piece_reviews": piece_reviews_list,
         "approved_piece_count": approved_piece_count,
         "total_piece_count": total_piece_count,
+        "rejected_piece_count": campaign.review_rejected or 0,
+        "pending_piece_count": campaign.review_pending or 0,
+        "ia_passed_piece_count": campaign.review_ia_passed or 0,
+        "ia_failed_piece_count": campaign.review_ia_failed or 0,
         "has_rejected_pieces": has_rejected_pieces,
         "all_pieces_approved": all_pieces_approved,
     }
     
-    if auth_token and campaign.created_by:
-        try:
-            creator = await auth_client.get_user_by_id(campaign.created_by, auth_token)
-            if creator:
-                created_by_name = creator.get("full_name") or creator.get("email", "Usuário")
-                if created_by_name:
-                    response_dict["created_by_name"] = created_by_name
-        except Exception:
-            pass
+    creator = users.get(campaign.created_by) if campaign.created_by else None
+    if creator:
+        response_dict["created_by_name"] = display_name(creator, "Usuário")
     
     return CampaignResponse.model_validate(response_dict)
 
 
+async def campaigns_to_responses(
+    campaigns: List[Campaign],
+    auth_token: Optional[str] = None,
+    db: Optional[AsyncSession] = None,
+    sections: Set[str] = ALL_SECTIONS,
+) -> List[CampaignResponse]:
+    """Serialize a page of campaigns with a constant number of queries.
+
+    Comments, creative pieces and piece reviews of the whole page come from
+    one ``IN`` query each (relationships are never lazy-loaded, which an
+    ``AsyncSession`` would not allow) and every creator/reviewer is resolved
+    in one auth-service call. Sections left out of ``sections`` are neither
+    loaded nor returned.
+    """
+    ids = [c.id for c in campaigns]
+    comments_by_campaign = {}
+    pieces_by_campaign = {}
+    reviews_by_campaign = {}
+    if db and campaigns:
+        if "comments" in sections:
+            comments_by_campaign = await _load_by_campaign(db, Comment, ids)
+        if "creative_pieces" in sections:
+            pieces_by_campaign = await _load_by_campaign(db, CreativePiece, ids)
+        if "piece_reviews" in sections:
+            reviews_by_campaign = await _load_piece_reviews(db, campaigns)
+    users: Dict[str, Dict] = {}
+    if auth_token and campaigns:
+        user_ids = [c.created_by for c in campaigns]
+        for rows in reviews_by_campaign.values():
+            user_ids.extend(r.reviewed_by for r in rows)
+        users = await auth_client.get_users(user_ids, auth_token)
+    return [
+        _serialize_campaign(
+            c,
+            comments_by_campaign.get(c.id),
+            pieces_by_campaign.get(c.id),
+            reviews_by_campaign.get(c.id),
+            users,
+            sections,
+        )
+        for c in campaigns
+    ]
+
+
+async def campaign_to_response(
+    campaign: Campaign,
+    auth_token: Optional[str] = None,
+    db: Optional[AsyncSession] = None,
+) -> CampaignResponse:
+    """Convert Campaign model to CampaignResponse schema."""
+    return (await campaigns_to_responses([campaign], auth_token, db))[0]
+
+
+@dataclass(frozen=True)
+class _InboxTask:
+    task_type: str
+    status: str
+    own_only: bool
+    id_prefix: str
+    title: str
+    description: str
+    item_description: Callable[[Any], str]
+
+
+# Caixa de tarefas por papel, na ordem em que os grupos aparecem
+_INBOX_TASKS: Dict[str, List[_InboxTask]] = {
+    UserRole.BUSINESS_ANALYST.value: [
+        _InboxTask(
+            "send_to_creative", CampaignStatus.DRAFT.value, True, "send",
+            "Enviar para Criação",
+            "Campanhas em rascunho prontas para enviar à equipe de criação",
+            lambda r: "Enviar para etapa criativa",
+        ),
+    ],
+    UserRole.MARKETING_MANAGER.value: [
+        _InboxTask(
+            "review_content", CampaignStatus.CONTENT_REVIEW.value, False, "review",
+            "Aprovar Conteúdo",
+            "Campanhas com peças criativas aguardando sua aprovação",
+            lambda r: "Revisar e aprovar peças criativas",
+        ),
+    ],
+    UserRole.CREATIVE_ANALYST.value: [
+        _InboxTask(
+            "create_pieces", CampaignStatus.CREATIVE_STAGE.value, False, "create",
+            "Criar Peças",
+            "Campanhas aguardando criação de peças criativas",
+            lambda r: f"Criar peças para {', '.join(r.communication_channels or [])}",
+        ),
+        _InboxTask(
+            "adjust_pieces", CampaignStatus.CONTENT_ADJUSTMENT.value, False, "adjust",
+            "Ajustar Peças",
+            "Campanhas com peças rejeitadas que precisam de ajustes",
+            lambda r: "Corrigir peças rejeitadas",
+        ),
+    ],
+    UserRole.CAMPAIGN_ANALYST.value: [
+        _InboxTask(
+            "publish_campaign", CampaignStatus.CAMPAIGN_BUILDING.value, False, "publish",
+            "Publicar Campanha",
+            "Campanhas aprovadas prontas para publicação",
+            lambda r: "Publicar campanha",
+        ),
+    ],
+}
+
+
 class CampaignService:
     """Business logic for campaign operations."""
     
     @staticmethod
     async def get_campaigns(
-        db: Session,
+        db: AsyncSession,
         current_user: Dict,
         auth_token: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        statuses: Optional[List[CampaignStatus]] = None,
+        category: Optional[str] = None,
+        channel: Optional[str] = None,
+        created_by: Optional[str] = None,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None,
+        fields: Optional[str] = None,
     ) -> CampaignsResponse:
-        """Get campaigns visible to user based on role and permissions."""
+        """Get campaigns visible to user based on role and permissions.
+
+        Newest first, keyset-paginated on ``(created_date, id)``: pass the
+        previous page's ``nextCursor`` as ``cursor``. ``skip`` is still
+        honoured when no cursor is given. Filters run in SQL and can only
+        narrow the role's visibility.
+        """
+        sections = parse_fields(fields)
         user_role = current_user.get("role")
         if not user_role:
             raise HTTPException(
@@ -249,41 +469,61 @@ class CampaignService:
             return CampaignsResponse(campaigns=[])
         
         visible_status_values = [status.value for status in visible_statuses]
-        query = db.query(Campaign)
+        query = select(Campaign)
         
         if user_role == UserRole.BUSINESS_ANALYST:
-            query = query.filter(
+            query = query.where(
                 or_(
                     Campaign.status.in_(visible_status_values),
                     (Campaign.created_by == current_user.get("id")) & (Campaign.status == CampaignStatus.DRAFT.value)
                 )
             )
         else:
-            query = query.filter(Campaign.status.in_(visible_status_values))
-        
-        campaigns = (
+            query = query.where(Campaign.status.in_(visible_status_values))
+
+        if statuses:
+            query = query.where(Campaign.status.in_([s.value for s in statuses]))
+        if category:
+            query = query.where(Campaign.category == category)
+        if channel:
+            # @> usa o índice GIN de communication_channels
+            query = query.where(type_coerce(Campaign.communication_channels, ARRAY(String)).contains([channel]))
+        if created_by:
+            query = query.where(Campaign.created_by == created_by)
+        if created_from:
+            query = query.where(Campaign.created_date >= datetime.combine(created_from, time.min, timezone.utc))
+        if created_to:
+            query = query.where(
+                Campaign.created_date < datetime.combine(created_to + timedelta(days=1), time.min, timezone.utc)
+            )
+
+        if cursor:
+            after_date, after_id = _decode_cursor(cursor)
+            query = query.where(
+                tuple_(Campaign.created_date, Campaign.id)
+                < tuple_(literal(after_date, Campaign.created_date.type), literal(after_id, String))
+            )
+        elif skip:
+            query = query.offset(skip)
+
+        campaigns = list((await db.execute(
             query
-            .order_by(Campaign.created_date.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+            .order_by(Campaign.created_date.desc(), Campaign.id.desc())
+            .limit(limit + 1)
+        )).scalars().all())
+        next_cursor = None
+        if len(campaigns) > limit:
+            campaigns = campaigns[:limit]
+            next_cursor = _encode_cursor(campaigns[-1])
         
-        campaign_responses = []
-        for campaign in campaigns:
-            response = await campaign_to_response(campaign, auth_token, db)
-            campaign_responses.append(response)
+        campaign_responses = await campaigns_to_responses(campaigns, auth_token, db, sections)
         
-        return CampaignsResponse(campaigns=campaign_responses)
+        return CampaignsResponse(campaigns=campaign_responses, next_cursor=next_cursor)
     
     @staticmethod
-    async def get_campaign(db: Session, campaign_id: str, current_user: Dict, auth_token: Optional[str] = None) -> CampaignResponse:
+    async def get_campaign(db: AsyncSession, campaign_id: str, current_user: Dict, auth_token: Optional[str] = None) -> CampaignResponse:
         """Get single campaign by ID if user has permission."""
-        campaign = (
-            db.query(Campaign)
-            .filter(Campaign.id == campaign_id)
-            .first()
-        )
+        campaign = await db.get(Campaign, campaign_id)
         
         if not campaign:
             raise HTTPException(
@@ -302,7 +542,7 @@ class CampaignService:
     
     @staticmethod
     async def create_campaign(
-        db: Session,
+        db: AsyncSession,
         campaign_data: CampaignCreate,
         current_user: Dict,
         auth_token: Optional[str] = None
@@ -342,26 +582,25 @@ class CampaignService:
             actor_id=current_user.get("id") or "",
         )
         db.add(status_event)
+        record_status_change(db, campaign, None, CampaignStatus.DRAFT.value, current_user.get("id") or "")
         
-        db.commit()
-        db.refresh(campaign)
+        await db.commit()
+        await db.refresh(campaign)
         
         return await campaign_to_response(campaign, auth_token, db)
     
     @staticmethod
     async def update_campaign(
-        db: Session,
+        db: AsyncSession,
         campaign_id: str,
         campaign_data: CampaignUpdate,
         current_user: Dict,
         auth_token: Optional[str] = None
     ) -> CampaignResponse:
         """Update campaign if user has permission."""
-        campaign = (
-            db.query(Campaign)
-            .filter(Campaign.id == campaign_id)
-            .first()
-        )
+        # FOR UPDATE: a transição lê os contadores de revisão, que as revisões
+        # concorrentes atualizam nesta mesma linha
+        campaign = await db.get(Campaign, campaign_id, with_for_update=True, populate_existing=True)
         
         if not campaign:
             raise HTTPException(
@@ -422,18 +661,13 @@ class CampaignService:
                 CampaignStatus.CONTENT_ADJUSTMENT,
                 CampaignStatus.CAMPAIGN_BUILDING,
             ):
-                rows = db.query(PieceReview).filter(PieceReview.campaign_id == campaign_id).all()
-                if not rows:
+                if not campaign.review_total:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="Nenhum parecer de peça encontrado. Submeta para revisão antes de alterar o status.",
                     )
-                any_rejected = any(
-                    _is_piece_finally_rejected(r.ia_verdict, r.human_verdict) for r in rows
-                )
-                all_approved = all(
-                    _is_piece_finally_approved(r.ia_verdict, r.human_verdict) for r in rows
-                )
+                any_rejected = campaign.review_rejected > 0
+                all_approved = campaign.review_approved == campaign.review_total
                 if new_status == CampaignStatus.CONTENT_ADJUSTMENT and not any_rejected:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
@@ -455,6 +689,9 @@ class CampaignService:
                 actor_id=current_user.get("id") or "",
             )
             db.add(status_event)
+            record_status_change(
+                db, campaign, status_event.from_status, new_status.value, current_user.get("id") or ""
+            )
         
         enum_fields = ['category', 'requesting_area', 'priority', 'communication_tone', 'execution_model', 'trigger_event']
         array_enum_fields = ['communication_channels', 'commercial_spaces']
@@ -469,19 +706,15 @@ class CampaignService:
             else:
                 setattr(campaign, field, value)
         
-        db.commit()
-        db.refresh(campaign)
+        await db.commit()
+        await db.refresh(campaign)
         
         return await campaign_to_response(campaign, auth_token, db)
     
     @staticmethod
-    def delete_campaign(db: Session, campaign_id: str, current_user: Dict) -> None:
+    async def delete_campaign(db: AsyncSession, campaign_id: str, current_user: Dict) -> None:
         """Delete campaign (only draft campaigns by creator)."""
-        campaign = (
-            db.query(Campaign)
-            .filter(Campaign.id == campaign_id)
-            .first()
-        )
+        campaign = await db.get(Campaign, campaign_id)
         
         if not campaign:
             raise HTTPException(
@@ -498,22 +731,18 @@ class CampaignService:
                 detail="You can only delete your own drafts"
             )
         
-        db.delete(campaign)
-        db.commit()
+        await db.delete(campaign)
+        await db.commit()
     
     @staticmethod
-    def add_comment(
-        db: Session,
+    async def add_comment(
+        db: AsyncSession,
         campaign_id: str,
         comment_data: CommentCreate,
         current_user: Dict
     ) -> CommentResponse:
         """Add comment to campaign."""
-        campaign = (
-            db.query(Campaign)
-            .filter(Campaign.id == campaign_id)
-            .first()
-        )
+        campaign = await db.get(Campaign, campaign_id)
         
         if not campaign:
             raise HTTPException(
@@ -536,14 +765,14 @@ class CampaignService:
         )
         
         db.add(comment)
-        db.commit()
-        db.refresh(comment)
+        await db.commit()
+        await db.refresh(comment)
         
         return CommentResponse.model_validate(comment)
     
     @staticmethod
-    def submit_creative_piece(
-        db: Session,
+    async def submit_creative_piece(
+        db: AsyncSession,
         campaign_id: str,
         piece_data: CreativePieceCreate,
         current_user: Dict
@@ -556,11 +785,7 @@ class CampaignService:
                 detail="Only creative analysts can submit creative pieces"
             )
         
-        campaign = (
-            db.query(Campaign)
-            .filter(Campaign.id == campaign_id)
-            .first()
-        )
+        campaign = await db.get(Campaign, campaign_id)
         
         if not campaign:
             raise HTTPException(
@@ -574,14 +799,12 @@ class CampaignService:
                 detail="Creative pieces can only be submitted when campaign is in CREATIVE_STAGE or CONTENT_ADJUSTMENT"
             )
         
-        existing_piece = (
-            db.query(CreativePiece)
-            .filter(
+        existing_piece = (await db.execute(
+            select(CreativePiece).where(
                 CreativePiece.campaign_id == campaign_id,
                 CreativePiece.piece_type == piece_data.piece_type
             )
-            .first()
-        )
+        )).scalars().first()
         
         ia_v = piece_data.ia_verdict.lower() if piece_data.ia_verdict else None
         if ia_v and ia_v not in ("approved", "rejected"):
@@ -608,8 +831,8 @@ class CampaignService:
                 existing_piece.ia_verdict = None
                 existing_piece.ia_analysis_text = None
 
-            db.commit()
-            db.refresh(existing_piece)
+            await db.commit()
+            await db.refresh(existing_piece)
             return CreativePieceResponse.model_validate(existing_piece)
         else:
             creative_piece = CreativePiece(
@@ -624,14 +847,14 @@ class CampaignService:
             )
 
             db.add(creative_piece)
-            db.commit()
-            db.refresh(creative_piece)
+            await db.commit()
+            await db.refresh(creative_piece)
 
             return CreativePieceResponse.model_validate(creative_piece)
 
     @staticmethod
     async def submit_for_review(
-        db: Session,
+        db: AsyncSession,
         campaign_id: str,
         body: SubmitForReviewRequest,
         current_user: Dict,
@@ -644,7 +867,7 @@ class CampaignService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only creative analysts can submit for review",
             )
-        campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
+        campaign = await db.get(Campaign, campaign_id)
         if not campaign:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
         if campaign.status not in (CampaignStatus.CREATIVE_STAGE.value, CampaignStatus.CONTENT_ADJUSTMENT.value):
@@ -652,10 +875,13 @@ class CampaignService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Submit for review only allowed when campaign is CREATIVE_STAGE or CONTENT_ADJUSTMENT",
             )
-        db.query(PieceReview).filter(PieceReview.campaign_id == campaign_id).delete()
+        await db.execute(delete(PieceReview).where(PieceReview.campaign_id == campaign_id))
         actor_id = current_user.get("id") or ""
+        submitted_verdicts = []
+        submitted_pieces = []
         creative_pieces_by_id: Dict[str, CreativePiece] = {}
-        for cp in db.query(CreativePiece).filter(CreativePiece.campaign_id == campaign_id).all():
+        pieces = await db.execute(select(CreativePiece).where(CreativePiece.campaign_id == campaign_id))
+        for cp in pieces.scalars():
             creative_pieces_by_id[cp.id] = cp
 
         for item in body.piece_reviews:
@@ -684,6 +910,8 @@ class CampaignService:
                 human_verdict=HumanVerdict.PENDING.value,
             )
             db.add(pr)
+            submitted_verdicts.append((ia, HumanVerdict.PENDING.value))
+            submitted_pieces.append(review_piece_ref(ch, item.piece_id, space, PieceReviewEventType.SUBMITTED.value))
             # Create history event (immutable)
             event = PieceReviewEvent(
                 campaign_id=campaign_id,
@@ -696,6 +924,10 @@ class CampaignService:
             )
             db.add(event)
         
+        # Os pareceres anteriores foram apagados: contadores recomeçam do lote submetido
+        for col, value in _review_counts(submitted_verdicts).items():
+            setattr(campaign, col, value)
+
         # Record status change event
         old_status = campaign.status
         campaign.status = CampaignStatus.CONTENT_REVIEW.value
@@ -706,18 +938,20 @@ class CampaignService:
             actor_id=actor_id,
         )
         db.add(status_event)
+        record_status_change(db, campaign, old_status, CampaignStatus.CONTENT_REVIEW.value, actor_id)
+        record_review_change(db, campaign, submitted_pieces, actor_id)
         STATUS_TRANSITIONS.labels(from_status=old_status, to_status=CampaignStatus.CONTENT_REVIEW.value).inc()
 
         for item in body.piece_reviews:
             REVIEW_SUBMISSIONS.labels(channel=(item.channel or "").upper()).inc()
         
-        db.commit()
-        db.refresh(campaign)
+        await db.commit()
+        await db.refresh(campaign)
         return await campaign_to_response(campaign, auth_token, db)
 
     @staticmethod
     async def review_piece(
-        db: Session,
+        db: AsyncSession,
         campaign_id: str,
         body: ReviewPieceRequest,
         current_user: Dict,
@@ -730,7 +964,7 @@ class CampaignService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only marketing managers can review pieces",
             )
-        campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
+        campaign = await db.get(Campaign, campaign_id)
         if not campaign:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
         if campaign.status != CampaignStatus.CONTENT_REVIEW.value:
@@ -738,52 +972,39 @@ class CampaignService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Review only allowed when campaign is CONTENT_REVIEW",
             )
-        ch = (body.channel or "").upper().replace("-", "").replace(" ", "")
-        if ch == "E-MAIL":
-            ch = "EMAIL"
-        space = (body.commercial_space or "").strip() or ""
+        ch, space = _review_key(body.channel, body.commercial_space)
         action = (body.action or "").lower()
-        if action not in ("approve", "reject", "manually_reject"):
+        if action not in _REVIEW_ACTIONS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="action must be approve, reject, or manually_reject",
             )
-        pr = (
-            db.query(PieceReview)
-            .filter(
+        pr = (await db.execute(
+            select(PieceReview).where(
                 PieceReview.campaign_id == campaign_id,
                 PieceReview.channel == ch,
                 PieceReview.piece_id == body.piece_id,
                 PieceReview.commercial_space == space,
             )
-            .first()
-        )
+            # trava o parecer: os deltas dos contadores partem deste estado
+            .with_for_update()
+        )).scalars().first()
         if not pr:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Piece review not found for this campaign/channel/piece",
             )
-        human = HumanVerdict.PENDING.value
-        event_type = PieceReviewEventType.APPROVED.value
-        if action == "approve":
-            human = HumanVerdict.APPROVED.value
-            event_type = PieceReviewEventType.APPROVED.value
-        elif action == "reject":
-            human = HumanVerdict.REJECTED.value
-            event_type = PieceReviewEventType.REJECTED.value
-        else:
-            human = HumanVerdict.MANUALLY_REJECTED.value
-            event_type = PieceReviewEventType.MANUALLY_REJECTED.value
+        human, event_type = _REVIEW_ACTIONS[action]
         
         REVIEW_VERDICTS.labels(channel=ch, verdict=action).inc()
 
         actor_id = current_user.get("id") or ""
-        rejection_reason = None
-        if action in ("reject", "manually_reject") and body.rejection_reason is not None:
-            reason = (body.rejection_reason or "").strip()
-            rejection_reason = reason if reason else None
+        rejection_reason = _rejection_reason(action, body.rejection_reason)
         
         # Update current state
+        await adjust_review_counters(db, campaign_id, _review_count_deltas(
+            [(pr.ia_verdict, pr.human_verdict)], [(pr.ia_verdict, human)]
+        ))
         pr.human_verdict = human
         pr.reviewed_at = datetime.now(timezone.utc)
         pr.reviewed_by = actor_id
@@ -800,13 +1021,146 @@ class CampaignService:
             actor_id=actor_id,
         )
         db.add(event)
-        db.commit()
-        db.refresh(campaign)
+        record_review_change(db, campaign, [review_piece_ref(ch, body.piece_id, space, event_type)], actor_id)
+        await db.commit()
+        await db.refresh(campaign)
         return await campaign_to_response(campaign, auth_token, db)
 
+    @staticmethod
+    async def bulk_review_pieces(
+        db: AsyncSession,
+        campaign_id: str,
+        body: BulkReviewPiecesRequest,
+        current_user: Dict,
+    ) -> BulkReviewPiecesResponse:
+        """Apply many review decisions in one transaction; nothing is written if any is invalid."""
+        CAMPAIGN_OPERATIONS.labels(operation="bulk_review_pieces").inc()
+        if current_user.get("role") != UserRole.MARKETING_MANAGER.value:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only marketing managers can review pieces",
+            )
+        campaign = await db.get(Campaign, campaign_id)
+        if not campaign:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+        if campaign.status != CampaignStatus.CONTENT_REVIEW.value:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Review only allowed when campaign is CONTENT_REVIEW",
+            )
+
+        # Validação completa antes de qualquer escrita
+        decisions = {}
+        for item in body.reviews:
+            ch, space = _review_key(item.channel, item.commercial_space)
+            action = (item.action or "").lower()
+            if action not in _REVIEW_ACTIONS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"action must be approve, reject, or manually_reject (piece {item.piece_id})",
+                )
+            key = (ch, item.piece_id, space)
+            if key in decisions:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Duplicate review for piece {item.piece_id} ({ch} {space})".rstrip(),
+                )
+            decisions[key] = (action, _rejection_reason(action, item.rejection_reason))
+
+        # Só as linhas decididas são lidas (e travadas); o resumo vem dos contadores da campanha
+        rows = (await db.execute(
+            select(
+                PieceReview.id,
+                PieceReview.channel,
+                PieceReview.piece_id,
+                PieceReview.commercial_space,
+                PieceReview.ia_verdict,
+                PieceReview.human_verdict,
+            )
+            .where(
+                PieceReview.campaign_id == campaign_id,
+                tuple_(PieceReview.channel, PieceReview.piece_id, PieceReview.commercial_space).in_(list(decisions)),
+            )
+            .with_for_update()
+        )).all()
+        by_key = {(r.channel, r.piece_id, r.commercial_space): r for r in rows}
+        missing = [key for key in decisions if key not in by_key]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Piece review not found for this campaign/channel/piece: "
+                + ", ".join(f"{ch}/{piece_id}" + (f"/{space}" if space else "") for ch, piece_id, space in missing),
+            )
+
+        actor_id = current_user.get("id") or ""
+        now = datetime.now(timezone.utc)
+        review_updates = []
+        review_events = []
+        for (ch, piece_id, space), (action, rejection_reason) in decisions.items():
+            human, event_type = _REVIEW_ACTIONS[action]
+            review_updates.append({
+                "id": by_key[(ch, piece_id, space)].id,
+                "human_verdict": human,
+                "reviewed_at": now,
+                "reviewed_by": actor_id,
+                "rejection_reason": rejection_reason,
+            })
+            review_events.append({
+                "campaign_id": campaign_id,
+                "channel": ch,
+                "piece_id": piece_id,
+                "commercial_space": space,
+                "event_type": event_type,
+                "rejection_reason": rejection_reason,
+                "actor_id": actor_id,
+            })
+        verdicts = {key: _REVIEW_ACTIONS[action][0] for key, (action, _) in decisions.items()}
+        await db.execute(update(PieceReview), review_updates)
+        await db.execute(insert(PieceReviewEvent), review_events)
+        record_review_change(db, campaign, [
+            review_piece_ref(e["channel"], e["piece_id"], e["commercial_space"], e["event_type"]) for e in review_events
+        ], actor_id)
+        await adjust_review_counters(db, campaign_id, _review_count_deltas(
+            [(by_key[key].ia_verdict, by_key[key].human_verdict) for key in decisions],
+            [(by_key[key].ia_verdict, verdicts[key]) for key in decisions],
+        ))
+        await db.commit()
+        await db.refresh(campaign)
+
+        for (ch, _, _), (action, _) in decisions.items():
+            REVIEW_VERDICTS.labels(channel=ch, verdict=action).inc()
+
+        approved, rejected, pending = campaign.review_approved, campaign.review_rejected, campaign.review_pending
+        next_status = None
+        if campaign.review_total and approved == campaign.review_total:
+            next_status = CampaignStatus.CAMPAIGN_BUILDING.value
+        elif rejected and not pending:
+            next_status = CampaignStatus.CONTENT_ADJUSTMENT.value
+
+        return BulkReviewPiecesResponse(
+            campaign_id=campaign_id,
+            status=_status_value(campaign),
+            next_status=next_status,
+            approved=approved,
+            rejected=rejected,
+            pending=pending,
+            results=[
+                {
+                    "piece_id": piece_id,
+                    "channel": ch,
+                    "commercial_space": space,
+                    "human_verdict": verdicts[(ch, piece_id, space)],
+                    "effective_status": _compute_effective_status(
+                        by_key[(ch, piece_id, space)].ia_verdict, verdicts[(ch, piece_id, space)]
+                    ),
+                }
+                for ch, piece_id, space in decisions
+            ],
+        )
+
     @staticmethod
     async def update_ia_verdict(
-        db: Session,
+        db: AsyncSession,
         campaign_id: str,
         body: "UpdateIaVerdictRequest",
         current_user: Dict,
@@ -820,7 +1174,7 @@ class CampaignService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only marketing managers can update IA verdict post-submission",
             )
-        campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
+        campaign = await db.get(Campaign, campaign_id)
         if not campaign:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
         if campaign.status != CampaignStatus.CONTENT_REVIEW.value:
@@ -838,16 +1192,16 @@ class CampaignService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="ia_verdict must be 'approved' or 'rejected'",
             )
-        pr = (
-            db.query(PieceReview)
-            .filter(
+        pr = (await db.execute(
+            select(PieceReview).where(
                 PieceReview.campaign_id == campaign_id,
                 PieceReview.channel == ch,
                 PieceReview.piece_id == body.piece_id,
                 PieceReview.commercial_space == space,
             )
-            .first()
-        )
+            # trava o parecer: os deltas dos contadores partem deste estado
+            .with_for_update()
+        )).scalars().first()
         if not pr:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -855,6 +1209,9 @@ class CampaignService:
             )
         actor_id = current_user.get("id") or ""
 
+        await adjust_review_counters(db, campaign_id, _review_count_deltas(
+            [(pr.ia_verdict, pr.human_verdict)], [(ia, pr.human_verdict)]
+        ))
         pr.ia_verdict = ia
         if body.ia_analysis_text is not None:
             pr.ia_analysis_text = body.ia_analysis_text
@@ -869,30 +1226,33 @@ class CampaignService:
             actor_id=actor_id,
         )
         db.add(event)
-        db.commit()
-        db.refresh(campaign)
+        record_review_change(
+            db, campaign, [review_piece_ref(ch, body.piece_id, space, PieceReviewEventType.IA_VALIDATED.value)], actor_id
+        )
+        await db.commit()
+        await db.refresh(campaign)
         return await campaign_to_response(campaign, auth_token, db)
 
     @staticmethod
     async def get_piece_review_history(
-        db: Session,
+        db: AsyncSession,
         campaign_id: str,
         auth_token: Optional[str] = None,
     ) -> List[dict]:
         """Get the full history of piece review events for a campaign."""
         from app.schemas.campaign import PieceReviewEventResponse
         
-        campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
+        campaign = await db.get(Campaign, campaign_id)
         if not campaign:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
         
-        events = (
-            db.query(PieceReviewEvent)
-            .filter(PieceReviewEvent.campaign_id == campaign_id)
+        events = (await db.execute(
+            select(PieceReviewEvent)
+            .where(PieceReviewEvent.campaign_id == campaign_id)
             .order_by(PieceReviewEvent.created_at.asc())
-            .all()
-        )
+        )).scalars().all()
         
+        actors = await auth_client.get_users([ev.actor_id for ev in events], auth_token) if auth_token else {}
         result = []
         for ev in events:
             ev_dict = {
@@ -908,38 +1268,32 @@ class CampaignService:
                 "actorName": None,
                 "createdAt": ev.created_at,
             }
-            # Fetch actor name from auth service
-            if auth_token and ev.actor_id:
-                try:
-                    user = await auth_client.get_user_by_id(ev.actor_id, auth_token)
-                    if user:
-                        ev_dict["actorName"] = user.get("full_name") or user.get("email") or ev.actor_id
-                except Exception:
-                    pass
+            if ev.actor_id in actors:
+                ev_dict["actorName"] = display_name(actors[ev.actor_id], ev.actor_id)
             result.append(PieceReviewEventResponse.model_validate(ev_dict))
         
         return result
 
     @staticmethod
     async def get_status_history(
-        db: Session,
+        db: AsyncSession,
         campaign_id: str,
         auth_token: Optional[str] = None,
     ) -> List[dict]:
         """Get the full history of status transitions for a campaign."""
         from app.schemas.campaign import CampaignStatusEventResponse
         
-        campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
+        campaign = await db.get(Campaign, campaign_id)
         if not campaign:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
         
-        events = (
-            db.query(CampaignStatusEvent)
-            .filter(CampaignStatusEvent.campaign_id == campaign_id)
+        events = (await db.execute(
+            select(CampaignStatusEvent)
+            .where(CampaignStatusEvent.campaign_id == campaign_id)
             .order_by(CampaignStatusEvent.created_at.asc())
-            .all()
-        )
+        )).scalars().all()
         
+        actors = await auth_client.get_users([ev.actor_id for ev in events], auth_token) if auth_token else {}
         result = []
         for i, ev in enumerate(events):
             # Calculate duration: time until next event, or None if current
@@ -958,157 +1312,86 @@ class CampaignService:
                 "createdAt": ev.created_at,
                 "durationSeconds": duration_seconds,
             }
-            # Fetch actor name from auth service
-            if auth_token and ev.actor_id:
-                try:
-                    user = await auth_client.get_user_by_id(ev.actor_id, auth_token)
-                    if user:
-                        ev_dict["actorName"] = user.get("full_name") or user.get("email") or ev.actor_id
-                except Exception:
-                    pass
+            if ev.actor_id in actors:
+                ev_dict["actorName"] = display_name(actors[ev.actor_id], ev.actor_id)
             result.append(CampaignStatusEventResponse.model_validate(ev_dict))
         
         return result
 
     @staticmethod
     async def get_my_tasks(
-        db: Session,
+        db: AsyncSession,
         current_user: Dict,
+        limit: int = 50,
     ) -> Dict:
-        """Get personalized task list based on user role."""
+        """Get personalized task list based on user role.
+
+        One query per inbox: a CASE over status names each row's task, window
+        functions give the full count per task and keep only the newest
+        ``limit`` rows of each group. Only the columns a task item needs are
+        read, so the cost tracks the inbox size, not the campaign table.
+        """
         from app.schemas.campaign import TaskItem, TaskGroup
         
         user_id = current_user.get("id") or ""
         role = current_user.get("role") or ""
-        
-        task_groups = []
-        
-        if role == UserRole.BUSINESS_ANALYST.value:
-            # Drafts created by this user that need to be sent to creative
-            drafts = (
-                db.query(Campaign)
-                .filter(
-                    Campaign.status == CampaignStatus.DRAFT.value,
-                    Campaign.created_by == user_id
-                )
-                .order_by(Campaign.created_date.desc())
-                .all()
-            )
-            if drafts:
-                task_groups.append(TaskGroup(
-                    taskType="send_to_creative",
-                    title="Enviar para Criação",
-                    description="Campanhas em rascunho prontas para enviar à equipe de criação",
-                    count=len(drafts),
-                    tasks=[TaskItem(
-                        id=f"send_{c.id}",
-                        campaignId=c.id,
-                        campaignName=c.name,
-                        taskType="send_to_creative",
-                        description="Enviar para etapa criativa",
-                        priority=c.priority or "Normal",
-                        createdAt=c.created_date,
-                    ) for c in drafts]
-                ))
-
-        elif role == UserRole.MARKETING_MANAGER.value:
-            # Campaigns in content review that need piece approval
-            in_review = (
-                db.query(Campaign)
-                .filter(Campaign.status == CampaignStatus.CONTENT_REVIEW.value)
-                .order_by(Campaign.created_date.desc())
-                .all()
-            )
-            if in_review:
-                task_groups.append(TaskGroup(
-                    taskType="review_content",
-                    title="Aprovar Conteúdo",
-                    description="Campanhas com peças criativas aguardando sua aprovação",
-                    count=len(in_review),
-                    tasks=[TaskItem(
-                        id=f"review_{c.id}",
-                        campaignId=c.id,
-                        campaignName=c.name,
-                        taskType="review_content",
-                        description="Revisar e aprovar peças criativas",
-                        priority=c.priority or "Normal",
-                        createdAt=c.created_date,
-                    ) for c in in_review]
-                ))
-        
-        elif role == UserRole.CREATIVE_ANALYST.value:
-            # 1. Campaigns in creative stage that need pieces
-            creative_stage = (
-                db.query(Campaign)
-                .filter(Campaign.status == CampaignStatus.CREATIVE_STAGE.value)
-                .order_by(Campaign.created_date.desc())
-                .all()
-            )
-            if creative_stage:
-                task_groups.append(TaskGroup(
-                    taskType="create_pieces",
-                    title="Criar Peças",
-                    description="Campanhas aguardando criação de peças criativas",
-                    count=len(creative_stage),
-                    tasks=[TaskItem(
-                        id=f"create_{c.id}",
-                        campaignId=c.id,
-                        campaignName=c.name,
-                        taskType="create_pieces",
-                        description=f"Criar peças para {', '.join(c.communication_channels or [])}",
-                        priority=c.priority or "Normal",
-                        createdAt=c.created_date,
-                    ) for c in creative_stage]
-                ))
-            
-            # 2. Campaigns in content adjustment that need fixes
-            adjustments = (
-                db.query(Campaign)
-                .filter(Campaign.status == CampaignStatus.CONTENT_ADJUSTMENT.value)
-                .order_by(Campaign.created_date.desc())
-                .all()
-            )
-            if adjustments:
-                task_groups.append(TaskGroup(
-                    taskType="adjust_pieces",
-                    title="Ajustar Peças",
-                    description="Campanhas com peças rejeitadas que precisam de ajustes",
-                    count=len(adjustments),
-                    tasks=[TaskItem(
-                        id=f"adjust_{c.id}",
-                        campaignId=c.id,
-                        campaignName=c.name,
-                        taskType="adjust_pieces",
-                        description="Corrigir peças rejeitadas",
-                        priority=c.priority or "Normal",
-                        createdAt=c.created_date,
-                    ) for c in adjustments]
-                ))
-        
-        elif role == UserRole.CAMPAIGN_ANALYST.value:
-            # Campaigns ready to publish
-            ready_to_publish = (
-                db.query(Campaign)
-                .filter(Campaign.status == CampaignStatus.CAMPAIGN_BUILDING.value)
-                .order_by(Campaign.created_date.desc())
-                .all()
+        inbox = _INBOX_TASKS.get(role, [])
+        if not inbox:
+            return {"totalTasks": 0, "taskGroups": []}
+
+        task_type = case({t.status: t.task_type for t in inbox}, value=Campaign.status).label("task_type")
+        matches = [
+            and_(Campaign.status == t.status, Campaign.created_by == user_id) if t.own_only
+            else Campaign.status == t.status
+            for t in inbox
+        ]
+        ranked = (
+            select(
+                Campaign.id,
+                Campaign.name,
+                Campaign.priority,
+                Campaign.created_date,
+                Campaign.communication_channels,
+                task_type,
+                func.count().over(partition_by=Campaign.status).label("total"),
+                func.row_number().over(
+                    partition_by=Campaign.status,
+                    order_by=(Campaign.created_date.desc(), Campaign.id.desc()),
+                ).label("rn"),
             )
-            if ready_to_publish:
-                task_groups.append(TaskGroup(
-                    taskType="publish_campaign",
-                    title="Publicar Campanha",
-                    description="Campanhas aprovadas prontas para publicação",
-                    count=len(ready_to_publish),
-                    tasks=[TaskItem(
-                        id=f"publish_{c.id}",
-                        campaignId=c.id,
-                        campaignName=c.name,
-                        taskType="publish_campaign",
-                        description="Publicar campanha",
-                        priority=c.priority or "Normal",
-                        createdAt=c.created_date,
-                    ) for c in ready_to_publish]
-                ))
+            .where(or_(*matches))
+            .subquery()
+        )
+        rows = (await db.execute(
+            select(ranked)
+            .where(ranked.c.rn <= limit)
+            .order_by(ranked.c.created_date.desc(), ranked.c.id.desc())
+        )).all()
+
+        by_type: Dict[str, list] = {}
+        for row in rows:
+            by_type.setdefault(row.task_type, []).append(row)
+
+        task_groups = []
+        for t in inbox:
+            group_rows = by_type.get(t.task_type)
+            if not group_rows:
+                continue
+            task_groups.append(TaskGroup(
+                taskType=t.task_type,
+                title=t.title,
+                description=t.description,
+                count=group_rows[0].total,
+                tasks=[TaskItem(
+                    id=f"{t.id_prefix}_{r.id}",
+                    campaignId=r.id,
+                    campaignName=r.name,
+                    taskType=t.task_type,
+                    description=t.item_description(r),
+                    priority=r.priority or "Normal",
+                    createdAt=r.created_date,
+                ) for r in group_rows]
+            ))
         
         total_tasks = sum(g.count for g in task_groups)
         
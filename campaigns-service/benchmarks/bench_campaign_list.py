@@ -0,0 +1,114 @@
+"""Query count and latency of campaign list serialization, per page size.
+
+Runs against a real Postgres (uses ``DATABASE_URL``, schema migrated). Seeds
+the largest page size worth of campaigns in CONTENT_REVIEW, each with two
+creative pieces, a comment and a piece review, inside a transaction that is
+rolled back at the end:
+
+    DATABASE_URL=postgresql://... python benchmarks/bench_campaign_list.py --sizes 10 100 1000
+
+For each size it compares:
+
+- ``per-campaign``: ``campaign_to_response`` in a loop (comments, pieces and
+  reviews queried once per campaign);
+- ``batch``: ``campaigns_to_responses`` (one query per collection, constant).
+
+User names are not resolved (no auth token), so only SQL is measured.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, select
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models.campaign import Campaign, CampaignStatus
+from app.models.comment import Comment
+from app.models.creative_piece import CreativePiece
+from app.models.piece_review import PieceReview
+from app.services.services import campaign_to_response, campaigns_to_responses
+
+_statements = 0
+
+
+def _count(*_args):
+    global _statements
+    _statements += 1
+
+
+async def _seed(db, count: int, tag: str) -> None:
+    for i in range(count):
+        campaign_id = str(uuid4())
+        db.add(Campaign(
+            id=campaign_id,
+            name=f"{tag} {i}",
+            category="Aquisição",
+            business_objective="bench",
+            expected_result="bench",
+            requesting_area="Produtos PF",
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 2, 1),
+            priority="Normal",
+            communication_channels=["SMS", "Push"],
+            target_audience_description="bench",
+            exclusion_criteria="bench",
+            estimated_impact_volume=1,
+            communication_tone="Formal",
+            execution_model="Batch (agendada)",
+            recency_rule_days=7,
+            status=CampaignStatus.CONTENT_REVIEW,
+            created_by="bench-user",
+        ))
+        await db.flush()
+        for channel in ("SMS", "Push"):
+            db.add(CreativePiece(id=str(uuid4()), campaign_id=campaign_id, piece_type=channel, text="bench"))
+        db.add(Comment(id=str(uuid4()), campaign_id=campaign_id, author="bench-user", role="bench", text="bench"))
+        db.add(PieceReview(campaign_id=campaign_id, channel="SMS", piece_id="p", commercial_space=""))
+    await db.flush()
+
+
+async def _run(db, size: int, tag: str, batch: bool):
+    global _statements
+    db.expunge_all()
+    query = select(Campaign).where(Campaign.name.like(f"{tag} %")).order_by(Campaign.name).limit(size)
+    _statements = 0
+    start = time.perf_counter()
+    campaigns = (await db.execute(query)).scalars().all()
+    if batch:
+        await campaigns_to_responses(campaigns, None, db)
+    else:
+        for campaign in campaigns:
+            await campaign_to_response(campaign, None, db)
+    return _statements, time.perf_counter() - start
+
+
+async def main(args) -> None:
+    tag = f"bench-{uuid4().hex[:8]}"
+    db = AsyncSessionLocal()
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        await _seed(db, max(args.sizes), tag)
+        print(f"{'tamanho':>8} {'modo':>13} {'queries':>8} {'tempo':>10}")
+        for size in args.sizes:
+            for batch in (False, True):
+                statements, elapsed = await _run(db, size, tag, batch)
+                mode = "batch" if batch else "per-campaign"
+                print(f"{size:>8} {mode:>13} {statements:>8} {elapsed * 1000:>8.1f}ms")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _count)
+        await db.rollback()
+        await db.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    asyncio.run(main(parser.parse_args()))
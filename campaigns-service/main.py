@@ -5,6 +5,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.routes import router
 from app.core.config import settings
 from app.core.s3_client import ensure_bucket_exists
+from app.core.auth_client import auth_client
+from app.core.database import engine
+from app.core.event_broker import event_broker
+from app.services.channel_spec_cache import channel_spec_cache
+from app.services.event_stream import event_hub
+from app.services.file_blobs import blob_collector
+from app.services.outbox import outbox_relay
 from app.mcp.server import mcp
 from prometheus_fastapi_instrumentator import Instrumentator
 
@@ -22,11 +29,24 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("could not initialize s3 bucket: %s", e)
 
+    await blob_collector.start()
+    await channel_spec_cache.start()
+    await event_broker.connect()
+    await event_hub.start()
+    await outbox_relay.start()
+
     logger.info("Starting MCP session manager...")
     async with mcp.session_manager.run():
         yield
 
     logger.info("Shutting down campaigns-service...")
+    await blob_collector.stop()
+    await channel_spec_cache.stop()
+    await outbox_relay.stop()
+    await event_hub.stop()
+    await event_broker.close()
+    await auth_client.close()
+    await engine.dispose()
 
 
 app = FastAPI(
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import httpx
+
+from app.core.auth_client import USER_BATCH_MAX_IDS, AuthServiceClient, UserCache
+
+
+def _client_with(handler, cache=None):
+    client = AuthServiceClient(base_url="http://auth", cache=cache or UserCache())
+    client._client = httpx.AsyncClient(base_url="http://auth", transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_get_users_batches_and_deduplicates():
+    calls = []
+
+    def handler(request):
+        ids = json.loads(request.content)["ids"]
+        calls.append(ids)
+        return httpx.Response(200, json=[{"id": i, "full_name": f"User {i}"} for i in ids if i != "ghost"])
+
+    async def run():
+        client = _client_with(handler)
+        first = await client.get_users(["a", "b", "a", None, "ghost"], "tok")
+        second = await client.get_users(["b", "a", "c"], "tok")
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert set(first) == {"a", "b"}
+    assert set(second) == {"a", "b", "c"}
+    # a segunda chamada só pede o que não estava em cache
+    assert calls == [["a", "b", "ghost"], ["c"]]
+
+
+def test_get_users_splits_misses_into_chunks_the_auth_service_accepts():
+    calls = []
+
+    def handler(request):
+        ids = json.loads(request.content)["ids"]
+        calls.append(len(ids))
+        if len(ids) > USER_BATCH_MAX_IDS:
+            return httpx.Response(422)
+        return httpx.Response(200, json=[{"id": i} for i in ids])
+
+    async def run():
+        client = _client_with(handler)
+        users = await client.get_users([f"u{i}" for i in range(USER_BATCH_MAX_IDS + 1)], "tok")
+        await client.close()
+        return users
+
+    assert len(asyncio.run(run())) == USER_BATCH_MAX_IDS + 1
+    assert sorted(calls) == [1, USER_BATCH_MAX_IDS]
+
+
+def test_user_cache_expires_and_evicts_lru():
+    now = [0.0]
+    cache = UserCache(max_size=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("a", {"id": "a"})
+    cache.set("b", {"id": "b"})
+    assert cache.get("a")  # "a" passa a ser o mais recente
+    cache.set("c", {"id": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    now[0] = 11
+    assert cache.get("a") is None
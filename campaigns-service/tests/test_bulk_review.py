@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.campaign import Campaign, CampaignStatus
+from app.schemas.campaign import BulkReviewPiecesRequest
+from app.services import services
+from app.services.services import CampaignService
+
+MANAGER = {"id": "u1", "role": "Gestor de marketing"}
+
+
+def _review_rows(count):
+    return [
+        SimpleNamespace(id=f"r{i}", channel="SMS", piece_id=f"p{i}", commercial_space="",
+                        ia_verdict="approved", human_verdict="pending")
+        for i in range(count)
+    ]
+
+
+def _fake_db(rows):
+    """AsyncSession stand-in; ``refresh`` applies the counter deltas as the UPDATE would."""
+    campaign = Campaign(id="c1", status=CampaignStatus.CONTENT_REVIEW.value, review_total=len(rows),
+                        review_approved=len(rows), review_rejected=0, review_pending=0,
+                        review_ia_passed=len(rows), review_ia_failed=0)
+    db = MagicMock()
+    db.get = AsyncMock(return_value=campaign)
+    db.commit = AsyncMock()
+    writes, deltas = [], {}
+
+    async def execute(statement, params=None):
+        writes.append((statement, params))
+        result = MagicMock()
+        result.all.return_value = rows
+        return result
+
+    async def adjust(_db, _campaign_id, changes):
+        deltas.update(changes)
+
+    async def refresh(obj):
+        for col, delta in deltas.items():
+            setattr(obj, col, getattr(obj, col) + delta)
+
+    db.execute = AsyncMock(side_effect=execute)
+    db.refresh = AsyncMock(side_effect=refresh)
+    return db, writes, adjust
+
+
+def _request(*reviews):
+    return BulkReviewPiecesRequest(reviews=[
+        {"channel": "sms", "pieceId": piece_id, "action": action} for piece_id, action in reviews
+    ])
+
+
+def test_decisions_are_written_with_one_update_and_one_insert():
+    db, writes, adjust = _fake_db(_review_rows(3))
+    body = _request(("p0", "approve"), ("p1", "manually_reject"))
+
+    with patch.object(services, "adjust_review_counters", side_effect=adjust):
+        resp = asyncio.run(CampaignService.bulk_review_pieces(db, "c1", body, MANAGER))
+
+    _select, (update_stmt, update_params), (insert_stmt, insert_params) = writes
+    assert update_stmt.table.name == "piece_review" and len(update_params) == 2
+    assert insert_stmt.table.name == "piece_review_event"
+    assert [e["event_type"] for e in insert_params] == ["APPROVED", "MANUALLY_REJECTED"]
+    db.commit.assert_awaited_once()
+    # p2 segue aprovada pela IA, p1 foi reprovada manualmente: nada pendente
+    assert (resp.approved, resp.rejected, resp.pending) == (2, 1, 0)
+    assert resp.next_status == CampaignStatus.CONTENT_ADJUSTMENT.value
+    assert [r.effective_status for r in resp.results] == ["approved", "rejected"]
+
+
+@pytest.mark.parametrize("reviews, status_code", [
+    ((("p0", "approve"), ("p9", "approve")), 404),   # peça sem parecer
+    ((("p0", "approve"), ("p1", "maybe")), 400),     # ação inválida
+    ((("p0", "approve"), ("p0", "reject")), 400),    # mesma peça duas vezes
+])
+def test_invalid_batch_writes_nothing(reviews, status_code):
+    db, writes, _ = _fake_db(_review_rows(3))
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(CampaignService.bulk_review_pieces(db, "c1", _request(*reviews), MANAGER))
+
+    assert exc.value.status_code == status_code
+    assert all(params is None for _, params in writes)  # no máximo o SELECT
+    db.commit.assert_not_awaited()
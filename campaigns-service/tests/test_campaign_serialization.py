@@ -0,0 +1,141 @@
+import asyncio
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.campaign import Campaign, CampaignStatus
+from app.models.comment import Comment
+from app.models.creative_piece import CreativePiece
+from app.models.piece_review import PieceReview
+from app.services import services
+
+
+def _campaign(i: int) -> Campaign:
+    return Campaign(
+        id=f"c{i}",
+        name=f"Campanha {i}",
+        category="Aquisição",
+        business_objective="obj",
+        expected_result="res",
+        requesting_area="Produtos PF",
+        start_date=date(2026, 1, 1),
+        end_date=date(2026, 2, 1),
+        priority="Normal",
+        communication_channels=["SMS"],
+        target_audience_description="todos",
+        exclusion_criteria="nenhum",
+        estimated_impact_volume=100,
+        communication_tone="Formal",
+        execution_model="Batch (agendada)",
+        recency_rule_days=7,
+        status=CampaignStatus.CONTENT_REVIEW,
+        created_by=f"creator-{i % 3}",
+        created_date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        review_total=1,
+        review_approved=1,
+        review_rejected=0,
+    )
+
+
+def _fake_db(rows_by_model):
+    """AsyncSession stand-in: ``execute(select(Model)...)`` returns that model's rows."""
+    async def execute(statement):
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = rows_by_model.get(
+            statement.column_descriptions[0]["entity"], []
+        )
+        return result
+
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=execute)
+    return db
+
+
+def _serialize_page(size: int):
+    campaigns = [_campaign(i) for i in range(size)]
+    reviews = [
+        PieceReview(id=f"r{i}", campaign_id=c.id, channel="SMS", piece_id="p", commercial_space="",
+                    human_verdict="approved", reviewed_by=f"reviewer-{i % 5}")
+        for i, c in enumerate(campaigns)
+    ]
+    comments = [Comment(id=f"m{i}", campaign_id=c.id, author="a", role="r", text="t",
+                        timestamp=c.created_date) for i, c in enumerate(campaigns)]
+    pieces = [CreativePiece(id=f"p{i}", campaign_id=c.id, piece_type="SMS", text="t",
+                            created_at=c.created_date, updated_at=c.created_date)
+              for i, c in enumerate(campaigns)]
+    db = _fake_db({PieceReview: reviews, Comment: comments, CreativePiece: pieces})
+    users = {f"creator-{i}": {"full_name": f"Criador {i}"} for i in range(3)}
+    get_users = AsyncMock(return_value=users)
+    with patch.object(services.auth_client, "get_users", get_users):
+        responses = asyncio.run(services.campaigns_to_responses(campaigns, "tok", db))
+    return responses, db.execute.await_count, get_users.await_count
+
+
+def test_campaign_page_serialization_uses_constant_queries():
+    small, small_queries, small_calls = _serialize_page(3)
+    large, large_queries, large_calls = _serialize_page(60)
+
+    assert len(large) == 60
+    # uma query por coleção (comments, creative_pieces, piece_reviews), independente do tamanho
+    assert small_queries == large_queries == 3
+    assert small_calls == large_calls == 1
+    assert large[4].created_by_name == "Criador 1"
+    assert large[4].all_pieces_approved is True
+    assert large[4].comments[0].id == "m4"
+    assert large[4].creative_pieces[0].id == "p4"
+
+
+def test_fields_skips_nested_sections_and_their_queries():
+    campaigns = [_campaign(i) for i in range(3)]
+    db = _fake_db({})
+    with patch.object(services.auth_client, "get_users", AsyncMock(return_value={})):
+        responses = asyncio.run(
+            services.campaigns_to_responses(campaigns, "tok", db, services.parse_fields("comments"))
+        )
+    assert db.execute.await_count == 1
+    assert db.execute.await_args[0][0].column_descriptions[0]["entity"] is Comment
+    assert responses[0].piece_reviews is None
+
+
+def test_unknown_field_is_rejected():
+    import pytest
+    from fastapi import HTTPException
+
+    assert services.parse_fields("creativePieces, pieceReviews") == {"creative_pieces", "piece_reviews"}
+    with pytest.raises(HTTPException) as exc:
+        services.parse_fields("password")
+    assert exc.value.status_code == 400
+
+
+def test_cursor_round_trip():
+    campaign = _campaign(7)
+    created_date, campaign_id = services._decode_cursor(services._encode_cursor(campaign))
+    assert (created_date, campaign_id) == (campaign.created_date, "c7")
+
+
+def test_my_tasks_is_one_query_grouped_by_task():
+    from types import SimpleNamespace
+    from sqlalchemy.dialects import postgresql
+    from app.models.user_role import UserRole
+
+    when = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        SimpleNamespace(id="c1", name="A", priority="Alta", created_date=when,
+                        communication_channels=["SMS", "Push"], task_type="create_pieces", total=7),
+        SimpleNamespace(id="c2", name="B", priority=None, created_date=when,
+                        communication_channels=[], task_type="adjust_pieces", total=1),
+    ]
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=rows)))
+
+    result = asyncio.run(services.CampaignService.get_my_tasks(
+        db, {"id": "u1", "role": UserRole.CREATIVE_ANALYST.value}, limit=1
+    ))
+
+    assert db.execute.await_count == 1
+    sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert "CASE" in sql and "row_number()" in sql
+    assert result["totalTasks"] == 8
+    create, adjust = result["taskGroups"]
+    assert (create.task_type, create.count) == ("create_pieces", 7)
+    assert create.tasks[0].description == "Criar peças para SMS, Push"
+    assert adjust.tasks[0].id == "adjust_c2" and adjust.tasks[0].priority == "Normal"
@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services.channel_spec_cache import ChannelSpecCache
+
+
+def _row(channel, field_name, commercial_space=None, **specs):
+    attrs = dict.fromkeys((
+        "min_chars", "max_chars", "warn_chars", "max_weight_kb",
+        "min_width", "min_height", "max_width", "max_height",
+        "expected_width", "expected_height", "tolerance_pct",
+    ))
+    attrs.update(specs)
+    return SimpleNamespace(channel=channel, commercial_space=commercial_space, field_name=field_name, **attrs)
+
+
+class _FakeDb:
+    def __init__(self):
+        self.version = 1
+        self.rows = [
+            _row("SMS", "body", max_chars=160),
+            _row("APP", "image", max_weight_kb=1024),
+            _row("APP", "image", "Banner superior da Home", max_weight_kb=300),
+        ]
+        self.loads = 0
+
+    async def load(self):
+        self.loads += 1
+        return self.version, list(self.rows)
+
+    async def read_version(self):
+        return self.version
+
+
+def test_lookups_are_served_from_memory():
+    db = _FakeDb()
+    cache = ChannelSpecCache(load=db.load, read_version=db.read_version, poll_interval_seconds=0)
+
+    async def scenario():
+        for _ in range(3):
+            snapshot = await cache.get()
+        return snapshot
+
+    snapshot = asyncio.run(scenario())
+    assert db.loads == 1
+    generic, space = snapshot.lookup("APP", "Banner superior da Home")
+    assert generic == {"image": {"max_weight_kb": 1024}}
+    assert space == {"image": {"max_weight_kb": 300}}
+    assert snapshot.lookup("SMS") == ({"body": {"max_chars": 160}}, {})
+
+
+def test_notifications_are_coalesced_and_change_the_etag():
+    db = _FakeDb()
+    cache = ChannelSpecCache(load=db.load, read_version=db.read_version, poll_interval_seconds=0)
+
+    async def scenario():
+        before = await cache.get()
+        db.version = 2
+        db.rows[0] = _row("SMS", "body", max_chars=140)
+        for _ in range(5):
+            cache._on_notify(None, 123, "channel_specs_changed", "2")
+        await cache._reload_task
+        return before, await cache.get()
+
+    before, after = asyncio.run(scenario())
+    assert db.loads <= 3  # 1 inicial + no máximo 2 pelo burst de NOTIFY
+    assert after.version == 2
+    assert after.etag != before.etag
+    assert after.lookup("SMS")[0] == {"body": {"max_chars": 140}}
+
+
+def test_poll_reloads_only_when_the_version_moves():
+    db = _FakeDb()
+    cache = ChannelSpecCache(load=db.load, read_version=db.read_version, poll_interval_seconds=0.01)
+
+    async def scenario():
+        await cache.reload("startup")
+        cache._poll_task = asyncio.create_task(cache._poll_loop())
+        await asyncio.sleep(0.05)
+        unchanged_loads = db.loads
+        db.version = 2
+        await asyncio.sleep(0.05)
+        await cache.stop()
+        return unchanged_loads
+
+    unchanged_loads = asyncio.run(scenario())
+    assert unchanged_loads == 1
+    assert db.loads == 2
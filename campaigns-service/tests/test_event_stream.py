@@ -0,0 +1,104 @@
+import asyncio
+
+from app.core.event_broker import InMemoryStream
+from app.services import event_stream
+from app.services.event_stream import EventHub, parse_last_event_id, stream_events
+
+_CREATIVE = {"id": "u2", "role": "Analista de criação"}
+
+
+def _event(status, created_by="u1", from_status=None):
+    data = {"campaignId": "c1", "campaignStatus": status, "createdBy": created_by}
+    if from_status:
+        data["fromStatus"] = from_status
+    return {"type": "campaign.status_changed", "campaignId": "c1", "data": data}
+
+
+class _Broker:
+    def __init__(self):
+        self.stream = InMemoryStream()
+
+    async def last_seq(self):
+        return await self.stream.last_seq()
+
+    async def read(self, after, timeout):
+        return await self.stream.read(after, timeout)
+
+
+def test_in_memory_stream_ignores_republished_seq():
+    async def scenario():
+        stream = InMemoryStream()
+        await stream.publish(1, {"n": 1})
+        await stream.publish(2, {"n": 2})
+        await stream.publish(2, {"n": "dup"})
+        assert await stream.read(0, 0.1) == [(1, {"n": 1}), (2, {"n": 2})]
+        assert await stream.read(2, 0.05) == []
+        assert await stream.last_seq() == 2
+
+    asyncio.run(scenario())
+
+
+def test_hub_drops_subscriber_with_full_queue():
+    hub = EventHub(_Broker(), queue_size=1)
+    slow = hub.subscribe()
+    hub.dispatch([(1, _event("DRAFT")), (2, _event("DRAFT"))])
+    assert slow.dropped
+    assert slow.queue.qsize() == 1
+    fresh = hub.subscribe()
+    hub.dispatch([(3, _event("DRAFT"))])
+    assert not fresh.dropped and fresh.queue.qsize() == 1
+
+
+def test_parse_last_event_id():
+    assert parse_last_event_id(" 42 ") == 42
+    assert parse_last_event_id("abc") is None
+    assert parse_last_event_id(None) is None
+
+
+def test_stream_replays_after_last_event_id_and_filters_by_visibility(monkeypatch):
+    async def replay(after_seq, limit):
+        assert after_seq == 10
+        return [
+            (11, _event("CREATIVE_STAGE")),
+            (12, _event("DRAFT")),
+            # saiu de um status visível: ainda interessa a quem via a campanha
+            (13, _event("CAMPAIGN_BUILDING", from_status="CONTENT_ADJUSTMENT")),
+        ]
+
+    monkeypatch.setattr(event_stream, "replay_events", replay)
+
+    async def scenario():
+        broker = _Broker()
+        hub = EventHub(broker)
+        body = stream_events(hub, _CREATIVE, 10, heartbeat_seconds=0.05, replay_limit=100)
+        chunks = [await body.__anext__() for _ in range(3)]
+        # 13 já veio no replay; 14 é novo
+        hub.dispatch([(13, _event("CONTENT_REVIEW")), (14, _event("CONTENT_REVIEW"))])
+        chunks.append(await body.__anext__())
+        chunks.append(await body.__anext__())
+        await body.aclose()
+        assert not hub._subscribers
+        return chunks
+
+    retry, first, transition, live, ping = asyncio.run(scenario())
+    assert retry == b"retry: 3000\n\n"
+    assert first.startswith(b"id: 11\nevent: campaign.status_changed\n")
+    assert transition.startswith(b"id: 13\n")
+    assert live.startswith(b"id: 14\n")
+    assert ping == b": ping\n\n"
+
+
+def test_stream_sends_reset_when_gap_exceeds_replay_limit(monkeypatch):
+    async def replay(after_seq, limit):
+        return [(seq, _event("CREATIVE_STAGE")) for seq in range(after_seq + 1, after_seq + limit + 2)]
+
+    monkeypatch.setattr(event_stream, "replay_events", replay)
+
+    async def scenario():
+        body = stream_events(EventHub(_Broker()), _CREATIVE, 5, heartbeat_seconds=0.05, replay_limit=2)
+        chunks = [await body.__anext__() for _ in range(2)]
+        await body.aclose()
+        return chunks
+
+    _retry, reset = asyncio.run(scenario())
+    assert reset == b"id: 8\nevent: reset\ndata: {}\n\n"
@@ -0,0 +1,67 @@
+import asyncio
+import hashlib
+from tempfile import SpooledTemporaryFile
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import settings
+from app.models.campaign import Campaign
+from app.services import file_upload
+
+
+def _upload(content: bytes, filename: str) -> UploadFile:
+    spool = SpooledTemporaryFile(max_size=1024)
+    spool.write(content)
+    spool.seek(0)
+    return UploadFile(file=spool, filename=filename)
+
+
+def _streamed(upload: UploadFile, campaign: Campaign, already_stored: bool = False):
+    received = {}
+
+    def fake_upload_fileobj(fileobj, file_key, content_type):
+        # o S3 recebe o próprio spool, rebobinado, e não uma cópia em memória
+        received.update(fileobj=fileobj, body=fileobj.read(), key=file_key, content_type=content_type)
+        return f"http://s3/{file_key}"
+
+    db = MagicMock()
+    db.execute = AsyncMock()
+    with patch.object(file_upload, "upload_fileobj", fake_upload_fileobj), \
+            patch.object(file_upload, "object_exists", lambda key: already_stored):
+        url, digest = asyncio.run(file_upload.upload_app_file(campaign, "Banner", upload, db))
+    received.update(url=url, digest=digest, db=db)
+    return received
+
+
+def test_app_upload_streams_the_spool_to_s3():
+    body = b"\x89PNG\r\n\x1a\n" + b"x" * 5000
+    upload = _upload(body, "banner.png")
+    received = _streamed(upload, Campaign(id="c1", commercial_spaces=["Banner"]))
+    assert received["fileobj"] is upload.file
+    assert received["body"] == body
+    assert received["content_type"] == "image/png"
+    assert received["digest"] == hashlib.sha256(body).hexdigest()
+    assert received["key"] == f"sha256/{received['digest']}.png"
+    assert received["db"].execute.await_count == 1  # upsert em file_blobs
+
+
+def test_same_content_skips_the_put():
+    body = b"\x89PNG\r\n\x1a\n" + b"same bytes"
+    received = _streamed(_upload(body, "copy.png"), Campaign(id="c2", commercial_spaces=["Banner"]),
+                         already_stored=True)
+    assert "body" not in received  # nenhum PUT
+    assert received["url"].endswith(f"/sha256/{hashlib.sha256(body).hexdigest()}.png")
+
+
+def test_app_upload_checks_signature_and_size_before_uploading():
+    campaign = Campaign(id="c1", commercial_spaces=["Banner"])
+    with pytest.raises(HTTPException) as exc:
+        _streamed(_upload(b"GIF89a....", "banner.png"), campaign)
+    assert exc.value.status_code == 400
+
+    too_big = b"\x89PNG\r\n\x1a\n" + b"x" * (settings.UPLOAD_MAX_MB * 1024 * 1024)
+    with pytest.raises(HTTPException) as exc:
+        _streamed(_upload(too_big, "banner.png"), campaign)
+    assert exc.value.status_code == 413
@@ -0,0 +1,94 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.campaign import Campaign, CampaignStatus
+from app.schemas.campaign import CampaignUpdate, ReviewPieceRequest, UpdateIaVerdictRequest
+from app.services.services import CampaignService, _compute_effective_status, _review_count_deltas, _review_counts
+
+MANAGER = {"id": "u1", "role": "Gestor de marketing"}
+
+
+def test_counts_follow_the_status_gate_rules():
+    counts = _review_counts([
+        ("approved", "pending"),            # aprovada pela IA
+        ("approved", "manually_rejected"),  # reprovada manualmente
+        ("rejected", "approved"),           # humano aprovou apesar da IA
+        ("rejected", "pending"),
+        (None, "pending"),                  # não validada
+    ])
+    assert counts == {
+        "review_total": 5,
+        "review_approved": 2,
+        "review_rejected": 1,
+        "review_pending": 2,
+        "review_ia_passed": 2,
+        "review_ia_failed": 2,
+    }
+
+
+def test_human_rejection_stays_rejected_after_a_late_ia_approval():
+    # humano reprova peça sem parecer da IA; depois a IA aprova (update_ia_verdict)
+    assert _compute_effective_status("approved", "rejected") == "rejected"
+    counts = _review_counts([("approved", "rejected")])
+    assert (counts["review_approved"], counts["review_rejected"], counts["review_pending"]) == (0, 1, 0)
+    deltas = _review_count_deltas([(None, "rejected")], [("approved", "rejected")])
+    assert {col: d for col, d in deltas.items() if d} == {"review_ia_passed": 1}
+
+
+def test_counts_agree_with_effective_status():
+    for ia in ("approved", "rejected", None):
+        for human in ("pending", "approved", "rejected", "manually_rejected"):
+            effective = _compute_effective_status(ia, human)
+            counts = _review_counts([(ia, human)])
+            assert counts["review_approved"] == (effective == "approved"), (ia, human)
+            assert counts["review_rejected"] == (effective == "rejected"), (ia, human)
+
+
+def test_deltas_only_touch_the_buckets_that_moved():
+    deltas = _review_count_deltas([(None, "pending")], [("rejected", "pending")])
+    assert {col: d for col, d in deltas.items() if d} == {"review_ia_failed": 1}
+
+    deltas = _review_count_deltas([("rejected", "pending")], [("rejected", "rejected")])
+    assert {col: d for col, d in deltas.items() if d} == {"review_pending": -1, "review_rejected": 1}
+
+
+def _locking_db(campaign):
+    """AsyncSession stand-in that records statements and finds no piece review."""
+    db = MagicMock()
+    db.get = AsyncMock(return_value=campaign)
+    statements = []
+
+    async def execute(statement, params=None):
+        statements.append(statement)
+        result = MagicMock()
+        result.scalars.return_value.first.return_value = None
+        return result
+
+    db.execute = AsyncMock(side_effect=execute)
+    return db, statements
+
+
+@pytest.mark.parametrize("call", [
+    lambda db: CampaignService.review_piece(
+        db, "c1", ReviewPieceRequest(channel="SMS", pieceId="p1", action="approve"), MANAGER),
+    lambda db: CampaignService.update_ia_verdict(
+        db, "c1", UpdateIaVerdictRequest(channel="SMS", pieceId="p1", iaVerdict="approved"), MANAGER),
+])
+def test_single_piece_writes_lock_the_review_row(call):
+    db, statements = _locking_db(Campaign(id="c1", status=CampaignStatus.CONTENT_REVIEW.value))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(call(db))
+    assert exc.value.status_code == 404
+    (select_review,) = statements
+    assert select_review._for_update_arg is not None
+
+
+def test_status_transition_locks_the_campaign_row():
+    db, _ = _locking_db(None)
+    with pytest.raises(HTTPException):
+        asyncio.run(CampaignService.update_campaign(
+            db, "c1", CampaignUpdate(status=CampaignStatus.CAMPAIGN_BUILDING), MANAGER))
+    db.get.assert_awaited_once_with(Campaign, "c1", with_for_update=True, populate_existing=True)
@@ -0,0 +1,32 @@
+from urllib.parse import parse_qs, urlparse
+
+from botocore.stub import Stubber
+
+from app.core import s3_client
+from app.core.config import settings
+
+
+def test_presign_file_signs_public_host_and_returns_metadata():
+    with Stubber(s3_client.s3_client) as stub:
+        stub.add_response(
+            "head_object",
+            {"ContentType": "image/png", "ContentLength": 2048, "ETag": '"abc123"'},
+            {"Bucket": settings.S3_BUCKET_NAME, "Key": "campaigns/c1/App/banner/x.png"},
+        )
+        meta = s3_client.presign_file("campaigns/c1/App/banner/x.png", expires_in=60)
+
+    url = urlparse(meta["url"])
+    assert f"{url.scheme}://{url.netloc}" == settings.S3_PUBLIC_URL
+    assert url.path == f"/{settings.S3_BUCKET_NAME}/campaigns/c1/App/banner/x.png"
+    assert parse_qs(url.query)["X-Amz-Expires"] == ["60"]
+    assert meta["content_type"] == "image/png"
+    assert (meta["content_length"], meta["etag"]) == (2048, '"abc123"')
+
+
+def test_bucket_is_checked_once(monkeypatch):
+    monkeypatch.setattr(s3_client, "_bucket_ready", False)
+    with Stubber(s3_client.s3_client) as stub:
+        stub.add_response("head_bucket", {}, {"Bucket": settings.S3_BUCKET_NAME})
+        s3_client._require_bucket()
+        s3_client._require_bucket()  # sem head_bucket: o Stubber falharia numa segunda chamada
+        stub.assert_no_pending_responses()
@@ -215,12 +215,12 @@ export default function Dashboard() {
                           </Link>
                         );
                       })}
-                      {group.tasks.length > 3 && (
+                      {group.count > 3 && (
                         <Link
                           to="/campaigns"
                           className="block text-center text-xs text-primary hover:underline py-1"
                         >
-                          Ver mais {group.tasks.length - 3} tarefas
+                          Ver mais {group.count - 3} tarefas
                         </Link>
                       )}
                     </div>